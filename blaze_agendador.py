@@ -0,0 +1,133 @@
+# BLAZE IA - AGENDADOR ALINHADO ÀS RODADAS (asyncio)
+import asyncio
+import inspect
+import statistics
+import time
+from collections import deque
+
+from blaze_colunar import iso_para_ms
+
+# Intervalo típico entre rodadas observado nos created_at
+INTERVALO_RODADA = 30.0
+
+
+def estimar_intervalo(instantes, padrao=INTERVALO_RODADA):
+    """Mediana dos intervalos entre rodadas consecutivas (em segundos)"""
+    diferencas = [b - a for a, b in zip(instantes, list(instantes)[1:]) if b > a]
+    if not diferencas:
+        return padrao
+    return statistics.median(diferencas)
+
+
+def proxima_rodada(instantes, agora, padrao=INTERVALO_RODADA):
+    """Primeiro limite de rodada previsto depois de `agora`"""
+    if not instantes:
+        return agora
+    intervalo = estimar_intervalo(instantes, padrao)
+    ultimo = instantes[-1]
+    if agora < ultimo + intervalo:
+        return ultimo + intervalo
+    rodadas = int((agora - ultimo) // intervalo) + 1
+    return ultimo + rodadas * intervalo
+
+
+async def _chamar(funcao, *args):
+    """Aceita funções síncronas (rodam numa thread) ou corrotinas"""
+    if inspect.iscoroutinefunction(funcao):
+        return await funcao(*args)
+    return await asyncio.to_thread(funcao, *args)
+
+
+class AgendadorRodadas:
+    """Acorda logo após cada rodada prevista, busca, processa e publica dentro de um orçamento
+
+    - buscar(): lista de jogos da API (mais recente primeiro)
+    - processar(dados): análise/persistência; o retorno vai para publicar
+    - publicar(resultado): entrega do resultado (snapshot, log, etc.)
+    - relogio/dormir podem ser substituídos por um relógio simulado
+    """
+
+    def __init__(self, buscar, processar=None, publicar=None, relogio=time.time, dormir=asyncio.sleep,
+                 folga=1.5, orcamento=10.0, repetir_a_cada=1.0, amostras=20, padrao=INTERVALO_RODADA):
+        self.buscar = buscar
+        self.processar = processar
+        self.publicar = publicar
+        self.relogio = relogio
+        self.dormir = dormir
+        self.folga = folga                      # espera após o limite previsto da rodada
+        self.orcamento = orcamento              # tempo máximo de um ciclo (busca + processamento)
+        self.repetir_a_cada = repetir_a_cada    # nova tentativa quando a rodada ainda não apareceu
+        self.padrao = padrao
+        self.instantes = deque(maxlen=amostras)  # created_at (s) das rodadas conhecidas
+        self.ciclos = deque(maxlen=200)          # registro de atraso por ciclo
+        self.ultimo_id = None
+
+    def registrar_jogos(self, dados):
+        """Alimenta os instantes das rodadas a partir de uma lista da API"""
+        novos = sorted(iso_para_ms(j['created_at']) / 1000 for j in dados if 'created_at' in j)
+        for instante in novos:
+            if not self.instantes or instante > self.instantes[-1]:
+                self.instantes.append(instante)
+
+    def proximo_despertar(self):
+        if not self.instantes:
+            return self.relogio()
+        return proxima_rodada(self.instantes, self.relogio() - self.folga, self.padrao) + self.folga
+
+    def segundos_ate_proxima(self):
+        return max(0.0, self.proximo_despertar() - self.relogio())
+
+    def atraso_medio(self):
+        atrasos = [c['atraso'] for c in self.ciclos if c['atraso'] is not None]
+        return sum(atrasos) / len(atrasos) if atrasos else None
+
+    async def executar_ciclo(self):
+        """Um ciclo: busca até aparecer rodada nova, processa e publica"""
+        inicio = self.relogio()
+        previsto = self.instantes[-1] + estimar_intervalo(self.instantes, self.padrao) if self.instantes else None
+        registro = {'inicio': inicio, 'rodada_prevista': previsto, 'novo': False,
+                    'atraso': None, 'duracao': None, 'erro': None}
+        try:
+            dados = await asyncio.wait_for(self._buscar_rodada_nova(inicio), self.orcamento)
+            if dados is not None:
+                registro['novo'] = True
+                self.registrar_jogos(dados)
+                self.ultimo_id = dados[0].get('id')
+                resultado = await _chamar(self.processar, dados) if self.processar else dados
+                if self.publicar:
+                    await _chamar(self.publicar, resultado)
+                # Atraso ponta a ponta: do created_at da rodada até a publicação
+                registro['atraso'] = self.relogio() - iso_para_ms(dados[0]['created_at']) / 1000
+        except asyncio.TimeoutError:
+            registro['erro'] = f"orçamento de {self.orcamento:.0f}s excedido"
+        except Exception as e:
+            registro['erro'] = str(e)
+        registro['duracao'] = self.relogio() - inicio
+        self.ciclos.append(registro)
+        return registro
+
+    async def _buscar_rodada_nova(self, inicio):
+        while True:
+            dados = await _chamar(self.buscar)
+            if dados and dados[0].get('id') != self.ultimo_id:
+                return dados
+            if self.relogio() - inicio + self.repetir_a_cada > self.orcamento:
+                return None
+            await self.dormir(self.repetir_a_cada)
+
+    async def executar(self, ciclos=None, parar=None):
+        """Laço principal; `parar` é um threading.Event ou asyncio.Event opcional"""
+        executados = 0
+        while ciclos is None or executados < ciclos:
+            if parar is not None and parar.is_set():
+                break
+            espera = self.segundos_ate_proxima()
+            if espera > 0:
+                await self.dormir(espera)
+            if parar is not None and parar.is_set():
+                break
+            registro = await self.executar_ciclo()
+            executados += 1
+            if registro['erro'] and not registro['novo']:
+                # Sem rodada nova: não insiste no mesmo instante
+                await self.dormir(self.repetir_a_cada)
@@ -0,0 +1,193 @@
+# BLAZE IA - AGREGADOS POR MINUTO / HORA / DIA
+"""Contagens de cores, histograma de rolls (0-14) e distância entre brancos,
+materializados em baldes de tempo e atualizados a cada rodada ingerida.
+
+Os baldes de cada resolução ficam em arrays ordenados pelo início (segundos
+UTC), então uma consulta por intervalo é uma busca binária e uma fatia: um
+gráfico de 30 dias lê ~720 baldes por hora em vez de centenas de milhares de
+rodadas.
+"""
+from datetime import datetime
+
+import numpy as np
+
+from blaze_colunar import iso_para_ms
+
+RESOLUCOES = {
+    'minuto': 60,
+    'hora': 3600,
+    'dia': 86400,
+}
+
+ROLLS = 15           # rolls de 0 a 14
+LACUNA_MAXIMA = 40   # brancos separados por 40+ rodadas caem no último balde
+
+# Baldes de minuto guardados (os de hora e dia não têm limite)
+LIMITE_MINUTOS = 3 * 24 * 60
+
+
+def _segundos(instante):
+    if instante is None:
+        return None
+    if isinstance(instante, datetime):
+        return instante.timestamp()
+    return instante
+
+
+class SerieTemporal:
+    """Baldes de uma resolução, em arrays que crescem dobrando a capacidade"""
+
+    def __init__(self, segundos, limite=None, capacidade=256):
+        self.segundos = segundos
+        self.limite = limite
+        self._n = 0
+        self._inicios = np.zeros(capacidade, dtype=np.int64)
+        self._cores = np.zeros((capacidade, 3), dtype=np.int32)
+        self._rolls = np.zeros((capacidade, ROLLS), dtype=np.int32)
+        self._lacunas = np.zeros((capacidade, LACUNA_MAXIMA + 1), dtype=np.int32)
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def inicios(self):
+        return self._inicios[:self._n]
+
+    def balde(self, instante_s):
+        """Índice do balde de `instante_s`, criando-o se preciso"""
+        inicio = int(instante_s // self.segundos * self.segundos)
+        if self._n and inicio == self._inicios[self._n - 1]:
+            return self._n - 1
+        if not self._n or inicio > self._inicios[self._n - 1]:
+            self._garantir_capacidade(self._n + 1)
+            for array in (self._cores, self._rolls, self._lacunas):
+                array[self._n] = 0   # pode ter sobra de um descarte anterior
+            self._inicios[self._n] = inicio
+            self._n += 1
+            self._aplicar_limite()
+            return self._n - 1
+
+        # Rodada atrasada: balde antigo (raro)
+        posicao = int(np.searchsorted(self.inicios, inicio))
+        if posicao < self._n and self._inicios[posicao] == inicio:
+            return posicao
+        self._garantir_capacidade(self._n + 1)
+        for array in (self._inicios, self._cores, self._rolls, self._lacunas):
+            array[posicao + 1:self._n + 1] = array[posicao:self._n].copy()
+            array[posicao] = 0
+        self._inicios[posicao] = inicio
+        self._n += 1
+        return posicao
+
+    def somar(self, indice, cor, roll, lacuna=None):
+        self._cores[indice, cor] += 1
+        self._rolls[indice, roll] += 1
+        if lacuna is not None:
+            self._lacunas[indice, min(lacuna, LACUNA_MAXIMA)] += 1
+
+    def carregar(self, inicios, cores, rolls, lacunas):
+        """Substitui os baldes pelos calculados em lote"""
+        if self.limite is not None:
+            inicios, cores, rolls, lacunas = (a[-self.limite:] for a in (inicios, cores, rolls, lacunas))
+        n = len(inicios)
+        self._n = 0
+        self._garantir_capacidade(n)
+        self._inicios[:n] = inicios
+        self._cores[:n] = cores
+        self._rolls[:n] = rolls
+        self._lacunas[:n] = lacunas
+        self._n = n
+
+    def intervalo(self, inicio=None, fim=None):
+        """Baldes com início em [inicio, fim) (segundos UTC ou datetime); cópias"""
+        inicio, fim = _segundos(inicio), _segundos(fim)
+        a = 0 if inicio is None else int(np.searchsorted(self.inicios, inicio // self.segundos * self.segundos))
+        b = self._n if fim is None else int(np.searchsorted(self.inicios, fim))
+        return {
+            'inicios': self._inicios[a:b].copy(),
+            'cores': self._cores[a:b].copy(),
+            'rolls': self._rolls[a:b].copy(),
+            'lacunas': self._lacunas[a:b].copy(),
+        }
+
+    def _garantir_capacidade(self, necessario):
+        capacidade = len(self._inicios)
+        if necessario <= capacidade:
+            return
+        while capacidade < necessario:
+            capacidade *= 2
+        for nome in ('_inicios', '_cores', '_rolls', '_lacunas'):
+            antigo = getattr(self, nome)
+            novo = np.zeros((capacidade,) + antigo.shape[1:], dtype=antigo.dtype)
+            novo[:self._n] = antigo[:self._n]
+            setattr(self, nome, novo)
+
+    def _aplicar_limite(self):
+        # Descarta em blocos (custo amortizado): só quando passa do dobro do limite
+        if self.limite is None or self._n <= 2 * self.limite:
+            return
+        descartar = self._n - self.limite
+        for array in (self._inicios, self._cores, self._rolls, self._lacunas):
+            array[:self.limite] = array[descartar:self._n]
+        self._n = self.limite
+
+
+class AgregadosTempo:
+    """Séries de minuto, hora e dia alimentadas a cada rodada nova"""
+
+    def __init__(self, limite_minutos=LIMITE_MINUTOS):
+        self.series = {
+            nome: SerieTemporal(segundos, limite=limite_minutos if nome == 'minuto' else None)
+            for nome, segundos in RESOLUCOES.items()
+        }
+        self._desde_branco = None   # rodadas desde o último branco (None antes do primeiro)
+
+    @classmethod
+    def de_colunas(cls, colunas, limite_minutos=LIMITE_MINUTOS):
+        """Monta todas as séries de uma vez a partir do HistoricoColunar"""
+        agregados = cls(limite_minutos)
+        n = len(colunas)
+        if not n:
+            return agregados
+        instantes = colunas.timestamps // 1000
+        cores = colunas.cores.astype(np.int64)
+        rolls = colunas.rolls.astype(np.int64)
+
+        # Lacuna de cada branco = rodadas não brancas desde o branco anterior
+        brancos = np.flatnonzero(cores == 0)
+        lacunas = np.minimum(np.diff(brancos) - 1, LACUNA_MAXIMA)
+        com_lacuna = brancos[1:]
+
+        for nome, serie in agregados.series.items():
+            baldes = instantes // serie.segundos * serie.segundos
+            inicios, indice = np.unique(baldes, return_inverse=True)
+            m = len(inicios)
+            serie.carregar(
+                inicios,
+                np.bincount(indice * 3 + cores, minlength=m * 3).reshape(m, 3),
+                np.bincount(indice * ROLLS + rolls, minlength=m * ROLLS).reshape(m, ROLLS),
+                np.bincount(indice[com_lacuna] * (LACUNA_MAXIMA + 1) + lacunas,
+                            minlength=m * (LACUNA_MAXIMA + 1)).reshape(m, LACUNA_MAXIMA + 1),
+            )
+        if len(brancos):
+            agregados._desde_branco = int(n - 1 - brancos[-1])
+        return agregados
+
+    def alimentar(self, jogos):
+        """Jogos novos em ordem cronológica; o created_at é lido uma única vez aqui"""
+        for jogo in jogos:
+            self.alimentar_rodada(iso_para_ms(jogo['created_at']) / 1000, jogo['color'], jogo['roll'])
+
+    def alimentar_rodada(self, instante_s, cor, roll):
+        lacuna = None
+        if cor == 0:
+            lacuna = self._desde_branco
+            self._desde_branco = 0
+        elif self._desde_branco is not None:
+            self._desde_branco += 1
+        for serie in self.series.values():
+            serie.somar(serie.balde(instante_s), cor, roll, lacuna)
+
+    def consultar(self, resolucao, inicio=None, fim=None):
+        """Baldes de `resolucao` ('minuto', 'hora' ou 'dia') no intervalo [inicio, fim)"""
+        return self.series[resolucao].intervalo(inicio, fim)
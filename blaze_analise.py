@@ -0,0 +1,321 @@
+# BLAZE IA - ANÁLISE DE PADRÕES
+import random
+from collections import deque
+
+import numpy as np
+
+# Pesos da tendência temporal (mais recente primeiro)
+PESOS = [2.0, 1.8, 1.6, 1.4, 1.2, 1.0, 0.8, 0.6, 0.4, 0.2]
+
+# Constantes de calibração da cascata (usadas pelo backtest e pela varredura)
+PARAMETROS_PADRAO = {
+    'pesos': PESOS,
+    'razao_tendencia': 1.4,          # tendência forte: um lado pesa 1.4x o outro
+    'janela': 15,                    # jogos considerados nas sequências
+    'corte_estatistica': 15,         # mínimo de cores para a estatística geral
+    'confianca_longa': 0.92,
+    'confianca_forte': 0.85,
+    'confianca_media': 0.78,
+    'confianca_zebra': 0.72,
+    'confianca_estatistica': 0.65,
+}
+
+# Estratégias da cascata, na ordem em que são testadas
+METODO_INICIAL = '🎲 ANÁLISE INICIAL'
+METODO_SEQUENCIA_LONGA = '🎯 SEQUÊNCIA LONGA (5+)'
+METODO_SEQUENCIA_FORTE = '🔥 SEQUÊNCIA FORTE (4)'
+METODO_SEQUENCIA_MEDIA = '⚡ SEQUÊNCIA MÉDIA (3)'
+METODO_TENDENCIA_RED = '📊 TENDÊNCIA FORTE 🔴'
+METODO_TENDENCIA_BLACK = '📊 TENDÊNCIA FORTE ⚫'
+METODO_ZEBRA = '🦓 PADRÃO ZEBRA ATIVO'
+METODO_ESTATISTICA_RED = '📈 ESTATÍSTICA: MAIS 🔴'
+METODO_ESTATISTICA_BLACK = '📈 ESTATÍSTICA: MAIS ⚫'
+METODO_QUEBRA = '🔄 QUEBRA DE SEQUÊNCIA'
+METODO_MANUTENCAO = '↔️ MANUTENÇÃO DE PADRÃO'
+
+METODOS = [
+    METODO_INICIAL,
+    METODO_SEQUENCIA_LONGA,
+    METODO_SEQUENCIA_FORTE,
+    METODO_SEQUENCIA_MEDIA,
+    METODO_TENDENCIA_RED,
+    METODO_TENDENCIA_BLACK,
+    METODO_ZEBRA,
+    METODO_ESTATISTICA_RED,
+    METODO_ESTATISTICA_BLACK,
+    METODO_QUEBRA,
+    METODO_MANUTENCAO,
+]
+
+
+def _parametros(parametros):
+    return PARAMETROS_PADRAO if not parametros else dict(PARAMETROS_PADRAO, **parametros)
+
+
+def analisar_padroes_avancada(dados, parametros=None):
+    """Análise avançada baseada nos dados reais da Blaze
+
+    Aceita a lista de jogos da API ou um array de cores do mais recente para o
+    mais antigo, como a view de HistoricoColunar.recentes(). Constantes da
+    cascata vêm de PARAMETROS_PADRAO (ou de `parametros`, que a sobrepõe).
+    """
+    p = _parametros(parametros)
+    if dados is None or len(dados) < 5:
+        return _previsao_aleatoria()
+
+    cores = dados if isinstance(dados, np.ndarray) else [jogo['color'] for jogo in dados]
+
+    # Pegar apenas as últimas cores válidas (excluir zeros para análise de sequência)
+    ultimas_cores = [int(c) for c in cores[:p['janela']] if c in [1, 2]]
+
+    if len(ultimas_cores) < 3:
+        return _previsao_aleatoria()
+
+    # 1. ANÁLISE DE SEQUÊNCIAS (Alta Confiança)
+    if len(ultimas_cores) >= 5:
+        # 5+ cores iguais → Reversão quase certa
+        for cor in [1, 2]:
+            if all(c == cor for c in ultimas_cores[:5]):
+                return {
+                    'previsao': 2 if cor == 1 else 1,
+                    'confianca': p['confianca_longa'],
+                    'metodo': METODO_SEQUENCIA_LONGA
+                }
+
+    if len(ultimas_cores) >= 4:
+        # 4 cores iguais → Alta probabilidade de reversão
+        for cor in [1, 2]:
+            if all(c == cor for c in ultimas_cores[:4]):
+                return {
+                    'previsao': 2 if cor == 1 else 1,
+                    'confianca': p['confianca_forte'],
+                    'metodo': METODO_SEQUENCIA_FORTE
+                }
+
+    if len(ultimas_cores) >= 3:
+        # 3 cores iguais → Boa probabilidade de reversão
+        for cor in [1, 2]:
+            if all(c == cor for c in ultimas_cores[:3]):
+                return {
+                    'previsao': 2 if cor == 1 else 1,
+                    'confianca': p['confianca_media'],
+                    'metodo': METODO_SEQUENCIA_MEDIA
+                }
+
+    # 2. ANÁLISE DE TENDÊNCIA TEMPORAL
+    # Dar mais peso aos resultados mais recentes
+    pesos = p['pesos']
+    peso_red = 0
+    peso_black = 0
+
+    for i, cor in enumerate(ultimas_cores[:len(pesos)]):
+        peso = pesos[i]
+        if cor == 1:
+            peso_red += peso
+        elif cor == 2:
+            peso_black += peso
+
+    diferenca = abs(peso_red - peso_black)
+
+    razao = p['razao_tendencia']
+    if peso_red > peso_black * razao:  # Tendência forte de vermelho
+        return {
+            'previsao': 2,
+            'confianca': min(0.80, 0.60 + diferenca/10),
+            'metodo': METODO_TENDENCIA_RED
+        }
+    elif peso_black > peso_red * razao:  # Tendência forte de preto
+        return {
+            'previsao': 1,
+            'confianca': min(0.80, 0.60 + diferenca/10),
+            'metodo': METODO_TENDENCIA_BLACK
+        }
+
+    # 3. PADRÃO ZEBRA (Alternância)
+    if len(ultimas_cores) >= 6:
+        alternancias = sum(1 for i in range(len(ultimas_cores)-1) 
+                        if ultimas_cores[i] != ultimas_cores[i+1])
+        if alternancias >= len(ultimas_cores) - 1:  # Alternância quase perfeita
+            return {
+                'previsao': 2 if ultimas_cores[0] == 1 else 1,
+                'confianca': p['confianca_zebra'],
+                'metodo': METODO_ZEBRA
+            }
+
+    # 4. ANÁLISE ESTATÍSTICA GERAL
+    if isinstance(cores, np.ndarray):
+        count_red = int(np.count_nonzero(cores == 1))
+        count_black = int(np.count_nonzero(cores == 2))
+    else:
+        count_red = cores.count(1)
+        count_black = cores.count(2)
+
+    if count_red + count_black > p['corte_estatistica']:
+        if count_red > count_black:
+            return {
+                'previsao': 2,
+                'confianca': p['confianca_estatistica'],
+                'metodo': METODO_ESTATISTICA_RED
+            }
+        else:
+            return {
+                'previsao': 1,
+                'confianca': p['confianca_estatistica'],
+                'metodo': METODO_ESTATISTICA_BLACK
+            }
+
+    # 5. FALLBACK INTELIGENTE
+    return _fallback_inteligente(ultimas_cores)
+
+
+def _fallback_inteligente(ultimas_cores):
+    """Fallback baseado nos padrões mais recentes"""
+    if len(ultimas_cores) < 2:
+        return _previsao_aleatoria()
+
+    # Se os últimos 2 foram iguais, prevê mudança
+    if ultimas_cores[0] == ultimas_cores[1]:
+        return {
+            'previsao': 2 if ultimas_cores[0] == 1 else 1,
+            'confianca': 0.62,
+            'metodo': METODO_QUEBRA
+        }
+
+    # Se estão alternando, mantém padrão
+    return {
+        'previsao': 2 if ultimas_cores[0] == 1 else 1,
+        'confianca': 0.58,
+        'metodo': METODO_MANUTENCAO
+    }
+
+
+def _previsao_aleatoria():
+    """Previsão sem base suficiente de dados"""
+    return {
+        'previsao': random.choice([1, 2]),
+        'confianca': 0.5,
+        'metodo': METODO_INICIAL
+    }
+
+
+class AnalisadorIncremental:
+    """Mesma cascata de analisar_padroes_avancada, alimentada uma rodada por vez
+
+    Mantém o estado corrente (sequência atual, somas ponderadas, alternância e
+    contagens da janela), então cada previsão custa O(1) em vez de O(janela).
+    Equivale a chamar analisar_padroes_avancada com as últimas `janela_dados`
+    rodadas recebidas (e os mesmos `parametros`).
+    """
+
+    def __init__(self, janela_dados=20, parametros=None):
+        self.janela_dados = janela_dados
+        self.parametros = _parametros(parametros)
+        self.ultimo_id = None
+        self._pesos = self.parametros['pesos']
+        self._janela = deque()                          # cores das últimas janela_dados rodadas
+        self._recorte = deque()                         # cores das últimas `janela` rodadas (ou menos)
+        self._tamanho_recorte = min(self.parametros['janela'], janela_dados)
+        self._count_red = 0
+        self._count_black = 0
+        self._quantidade = 0                            # vermelho/preto dentro do recorte
+        self._recentes = deque(maxlen=len(self._pesos)) # últimas cores válidas, mais recente primeiro
+        self._sequencia = 0                             # repetições da cor válida atual
+        self._alternancia = 0                           # tamanho da alternância atual
+        self._peso_red = [0.0] * (len(self._pesos) + 1) # somas ponderadas por prefixo
+        self._peso_black = [0.0] * (len(self._pesos) + 1)
+
+    def alimentar(self, jogos):
+        """Recebe jogos em ordem de created_at"""
+        for jogo in jogos:
+            self.alimentar_cor(jogo['color'])
+            self.ultimo_id = jogo['id']
+
+    def alimentar_cores(self, cores, ultimo_id=None):
+        for cor in cores:
+            self.alimentar_cor(int(cor))
+        self.ultimo_id = ultimo_id
+
+    def alimentar_cor(self, cor):
+        # Janela completa (estatística geral)
+        self._janela.append(cor)
+        self._contar(cor, 1)
+        if len(self._janela) > self.janela_dados:
+            self._contar(self._janela.popleft(), -1)
+
+        # Recorte dos últimos `janela` jogos
+        self._recorte.append(cor)
+        if cor in (1, 2):
+            self._quantidade += 1
+        if len(self._recorte) > self._tamanho_recorte and self._recorte.popleft() in (1, 2):
+            self._quantidade -= 1
+
+        if cor not in (1, 2):
+            return
+
+        # Sequência e alternância da cor válida
+        anterior = self._recentes[0] if self._recentes else None
+        self._sequencia = self._sequencia + 1 if cor == anterior else 1
+        self._alternancia = self._alternancia + 1 if anterior is not None and cor != anterior else 1
+        self._recentes.appendleft(cor)
+
+        # Somas ponderadas acumuladas na mesma ordem do código escalar
+        peso_red = peso_black = 0
+        pesos = self._pesos
+        for i, atual in enumerate(self._recentes):
+            if atual == 1:
+                peso_red += pesos[i]
+            else:
+                peso_black += pesos[i]
+            self._peso_red[i + 1] = peso_red
+            self._peso_black[i + 1] = peso_black
+
+    def _contar(self, cor, delta):
+        if cor == 1:
+            self._count_red += delta
+        elif cor == 2:
+            self._count_black += delta
+
+    def prever(self):
+        """Mesmo dict (previsao/confianca/metodo) de analisar_padroes_avancada"""
+        p = self.parametros
+        quantidade = self._quantidade
+        if len(self._janela) < 5 or quantidade < 3:
+            return _previsao_aleatoria()
+
+        cor_atual = self._recentes[0]
+        oposta = 2 if cor_atual == 1 else 1
+        sequencia = min(self._sequencia, quantidade)
+
+        # 1. SEQUÊNCIAS
+        for tamanho, confianca, metodo in ((5, p['confianca_longa'], METODO_SEQUENCIA_LONGA),
+                                           (4, p['confianca_forte'], METODO_SEQUENCIA_FORTE),
+                                           (3, p['confianca_media'], METODO_SEQUENCIA_MEDIA)):
+            if sequencia >= tamanho:
+                return {'previsao': oposta, 'confianca': confianca, 'metodo': metodo}
+
+        # 2. TENDÊNCIA TEMPORAL
+        considerados = min(quantidade, len(self._pesos))
+        peso_red = self._peso_red[considerados]
+        peso_black = self._peso_black[considerados]
+        diferenca = abs(peso_red - peso_black)
+
+        razao = p['razao_tendencia']
+        if peso_red > peso_black * razao:
+            return {'previsao': 2, 'confianca': min(0.80, 0.60 + diferenca/10), 'metodo': METODO_TENDENCIA_RED}
+        elif peso_black > peso_red * razao:
+            return {'previsao': 1, 'confianca': min(0.80, 0.60 + diferenca/10), 'metodo': METODO_TENDENCIA_BLACK}
+
+        # 3. PADRÃO ZEBRA
+        if quantidade >= 6 and self._alternancia >= quantidade:
+            return {'previsao': oposta, 'confianca': p['confianca_zebra'], 'metodo': METODO_ZEBRA}
+
+        # 4. ESTATÍSTICA GERAL
+        if self._count_red + self._count_black > p['corte_estatistica']:
+            if self._count_red > self._count_black:
+                return {'previsao': 2, 'confianca': p['confianca_estatistica'], 'metodo': METODO_ESTATISTICA_RED}
+            return {'previsao': 1, 'confianca': p['confianca_estatistica'], 'metodo': METODO_ESTATISTICA_BLACK}
+
+        # 5. FALLBACK
+        if sequencia >= 2:
+            return {'previsao': oposta, 'confianca': 0.62, 'metodo': METODO_QUEBRA}
+        return {'previsao': oposta, 'confianca': 0.58, 'metodo': METODO_MANUTENCAO}
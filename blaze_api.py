@@ -0,0 +1,183 @@
+# BLAZE IA - ACESSO À API OFICIAL
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from blaze_metricas import contar, cronometro
+
+URL_RECENTES = 'https://blaze.bet.br/api/singleplayer-originals/originals/roulette_games/recent/1'
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+    'Origin': 'https://blaze.com',
+    'Referer': 'https://blaze.com/',
+}
+
+
+class ErroAPIBlaze(Exception):
+    """Falha ao obter jogos da API (conexão, HTTP ou formato)"""
+
+
+class ClienteBlaze:
+    """Cliente HTTP com conexão keep-alive, cache curto e backoff exponencial
+
+    - Sessão `requests` persistente com pool de conexões (sem novo handshake TLS a cada busca)
+    - Dentro do TTL devolve a última resposta sem ir à rede
+    - Se a resposta nova tem o mesmo jogo mais recente, reaproveita a lista já decodificada
+    - Após erros ou HTTP 429 espera 1s, 2s, 4s... (ou o Retry-After) antes de tentar de novo,
+      servindo a última resposta válida enquanto isso
+    """
+
+    def __init__(self, url=URL_RECENTES, timeout=10, tamanho_pool=4, ttl=5.0,
+                 backoff_inicial=1.0, backoff_maximo=60.0, relogio=time.monotonic):
+        self.url = url
+        self.timeout = timeout
+        self.ttl = ttl
+        self.backoff_inicial = backoff_inicial
+        self.backoff_maximo = backoff_maximo
+        self.relogio = relogio
+
+        self.sessao = requests.Session()
+        self.sessao.headers.update(HEADERS)
+        adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=tamanho_pool, max_retries=0)
+        self.sessao.mount('https://', adaptador)
+        self.sessao.mount('http://', adaptador)
+
+        self._lock = threading.Lock()
+        self._cache = None            # {'dados', 'id', 'obtido_em'}
+        self._falhas = 0
+        self._bloqueado_ate = 0.0
+        self._buscando = False
+        self._contadores = {
+            'requisicoes': 0,
+            'respostas': 0,
+            'acertos_cache': 0,       # respondido sem ir à rede
+            'repetidos': 0,           # foi à rede mas o jogo mais recente não mudou
+            'erros': 0,
+            'limitados': 0,           # HTTP 429
+            'latencia_total': 0.0,
+            'latencia_ultima': None,
+            'latencia_maxima': 0.0,
+        }
+
+    def buscar(self):
+        """Jogos recentes - Formato confirmado: LISTA direta, mais recente primeiro
+
+        O lock protege só o cache e os contadores; a requisição corre fora dele.
+        Enquanto uma busca está em andamento as outras chamadas recebem o cache.
+        """
+        with self._lock:
+            agora = self.relogio()
+            if self._cache and (agora - self._cache['obtido_em'] < self.ttl or self._buscando):
+                self._contadores['acertos_cache'] += 1
+                contar('acertos_cache_api')
+                return self._cache['dados']
+
+            if agora < self._bloqueado_ate:
+                if self._cache:
+                    self._contadores['acertos_cache'] += 1
+                    contar('acertos_cache_api')
+                    return self._cache['dados']
+                raise ErroAPIBlaze(f"Aguardando {self._bloqueado_ate - agora:.0f}s após erro (backoff)")
+            self._buscando = True
+
+        try:
+            dados = self._requisitar()
+        finally:
+            with self._lock:
+                self._buscando = False
+        jogo_id = dados[0].get('id') if isinstance(dados[0], dict) else None
+
+        with self._lock:
+            if self._cache and jogo_id is not None and self._cache['id'] == jogo_id:
+                self._contadores['repetidos'] += 1
+                contar('respostas_repetidas')
+                # Sem renovar 'obtido_em': a rodada nova está para sair e a próxima
+                # tentativa do agendador tem que ir à rede, não cair no cache
+                return self._cache['dados']
+
+            self._cache = {'dados': dados, 'id': jogo_id, 'obtido_em': self.relogio()}
+            return dados
+
+    def estatisticas(self):
+        with self._lock:
+            contadores = dict(self._contadores)
+        respostas = contadores['respostas']
+        contadores['latencia_media'] = contadores['latencia_total'] / respostas if respostas else None
+        contadores['falhas_seguidas'] = self._falhas
+        return contadores
+
+    def fechar(self):
+        self.sessao.close()
+
+    def _requisitar(self):
+        with self._lock:
+            self._contadores['requisicoes'] += 1
+        inicio = time.perf_counter()
+        try:
+            with cronometro('busca'):
+                response = self.sessao.get(self.url, timeout=self.timeout, verify=True)
+        except requests.RequestException as e:
+            self._registrar_falha()
+            raise ErroAPIBlaze(f"Erro de conexão: {e}") from e
+
+        latencia = time.perf_counter() - inicio
+        with self._lock:
+            self._contadores['respostas'] += 1
+            self._contadores['latencia_total'] += latencia
+            self._contadores['latencia_ultima'] = latencia
+            self._contadores['latencia_maxima'] = max(self._contadores['latencia_maxima'], latencia)
+
+        if response.status_code == 429:
+            with self._lock:
+                self._contadores['limitados'] += 1
+            self._registrar_falha(response.headers.get('Retry-After'))
+            raise ErroAPIBlaze("Erro HTTP: 429 (limite de requisições)")
+
+        if response.status_code != 200:
+            self._registrar_falha()
+            raise ErroAPIBlaze(f"Erro HTTP: {response.status_code}")
+
+        try:
+            with cronometro('decodificacao'):
+                dados = response.json()
+        except ValueError as e:
+            self._registrar_falha()
+            raise ErroAPIBlaze("Formato inesperado dos dados") from e
+
+        # CONFIRMADO: É uma lista direta com os jogos
+        if not isinstance(dados, list) or len(dados) == 0:
+            self._registrar_falha()
+            raise ErroAPIBlaze("Formato inesperado dos dados")
+
+        with self._lock:
+            self._falhas = 0
+            self._bloqueado_ate = 0.0
+        return dados
+
+    def _registrar_falha(self, retry_after=None):
+        contar('erros_busca')
+        with self._lock:
+            self._contadores['erros'] += 1
+            self._falhas += 1
+            espera = min(self.backoff_maximo, self.backoff_inicial * 2 ** (self._falhas - 1))
+            try:
+                espera = max(espera, float(retry_after))
+            except (TypeError, ValueError):
+                pass
+            self._bloqueado_ate = self.relogio() + espera
+
+
+_cliente_padrao = None
+
+
+def buscar_jogos():
+    """Atalho para o cliente padrão do processo"""
+    global _cliente_padrao
+    if _cliente_padrao is None:
+        _cliente_padrao = ClienteBlaze()
+    return _cliente_padrao.buscar()
@@ -1,14 +1,21 @@
 # BLAZE IA - VERSÃO FINAL OTIMIZADA
+import os
+import time
+
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.express as px
-from collections import Counter
-from datetime import datetime, timedelta
-import pickle
-import os
-import random
-import time
+from datetime import datetime
+
+from blaze_api import ClienteBlaze
+from blaze_coletor import ColetorCompartilhado
+from blaze_manutencao import ManutencaoPeriodica
+from blaze_motor import BlazeIA_Final, EstadoJogos, abrir_armazenamento
+import blaze_metricas
+from blaze_metricas import cronometro
+from blaze_painel import contar_cores, faixa_resultados_html
+from blaze_replay import VARIAVEL_GRAVAR, VARIAVEL_REPLAY, VARIAVEL_VELOCIDADE, FonteReplay, GravadorFeed
+from blaze_transicoes import EMOJIS
 
 # Configuração da página
 st.set_page_config(
@@ -18,338 +25,459 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+inicio_render = time.perf_counter()
+
 st.title("🎯 BLAZE IA - SISTEMA OFICIAL")
 st.markdown("### 🤖 Dados em Tempo Real • 📊 Análise Avançada • 🎯 Previsões")
 
-# Sistema de arquivos
-IA_DATA_FILE = "ia_data.pkl"
-
-class BlazeIA_Final:
-    def __init__(self):
-        self.historico = []
-        self.previsoes = []
-        self.apostas = []
-        self.saldo = 1000.0
-        self.contador_atualizacoes = 0
-        self.ultima_atualizacao = datetime.now()
-        self.modo_auto = False
-        self.carregar_dados()
+NOTIFICACOES = {
+    'sucesso': st.success,
+    'info': st.info,
+    'aviso': st.warning,
+    'erro': st.error,
+}
+
+def notificar_streamlit(nivel, mensagem):
+    """Mostra na página os avisos do motor"""
+    NOTIFICACOES.get(nivel, st.info)(mensagem)
+
+@st.cache_resource
+def obter_cliente():
+    """Cliente HTTP único por processo (conexões keep-alive e cache curto)"""
+    return ClienteBlaze()
+
+@st.cache_resource
+def obter_coletor():
+    """Coletor único por processo, compartilhado por todas as sessões
+
+    BLAZE_REPLAY troca a API por uma gravação; BLAZE_GRAVAR grava o feed real (ver blaze_replay)
+    """
+    if os.environ.get(VARIAVEL_REPLAY):
+        fonte = FonteReplay(os.environ[VARIAVEL_REPLAY], float(os.environ.get(VARIAVEL_VELOCIDADE, 1)))
+        return ColetorCompartilhado(fonte.buscar, intervalo=0.05, alinhar_rodadas=False).iniciar()
+    buscar = obter_cliente().buscar
+    if os.environ.get(VARIAVEL_GRAVAR):
+        buscar = GravadorFeed(os.environ[VARIAVEL_GRAVAR]).envolver(buscar)
+    return ColetorCompartilhado(buscar).iniciar()
+
+@st.cache_resource
+def obter_armazenamento():
+    """Conexão SQLite única por processo (com o seu lock); as sessões não abrem nem vazam conexões"""
+    return abrir_armazenamento()
+
+@st.cache_resource
+def obter_jogos():
+    """Histórico, colunas, índice e agregados únicos por processo: sessão nova não relê o banco"""
+    return EstadoJogos()
+
+@st.cache_resource
+def obter_manutencao():
+    """Arquivamento e verificação das seeds, uma thread por processo, fora da renderização"""
+    return ManutencaoPeriodica().iniciar()
+
+@st.cache_resource
+def obter_servidor_metricas(porta):
+    """Endpoint /metrics (Prometheus) único por processo"""
+    return blaze_metricas.iniciar_servidor(porta)
+
+if os.environ.get(blaze_metricas.VARIAVEL_PORTA):
+    obter_servidor_metricas(int(os.environ[blaze_metricas.VARIAVEL_PORTA]))
+
+# Intervalo de atualização dos painéis ao vivo no modo automático (segundos)
+INTERVALO_PAINEL = 2
+
+@st.cache_data(max_entries=32)
+def faixa_resultados(ultimo_id, _jogos):
+    """HTML da faixa de resultados, reaproveitado enquanto o jogo mais recente não muda"""
+    return faixa_resultados_html(_jogos)
+
+@st.cache_data(max_entries=8)
+def situacao_verificacao(concluida_em, _armazenamento, semente_cliente):
+    """Resumo da verificação provably fair gravada no banco (muda só a cada passada da manutenção)"""
+    return _armazenamento.situacao_verificacao(semente_cliente, limite_falhas=5)
+
+def carregar_pagina(tabela):
+    """Próxima página de registros antigos (cursor por seq), lida do banco ou do arquivo"""
+    paginas = st.session_state[f'paginas_{tabela}']
+    paginas['aberto'] = True
+    registros, cursor = st.session_state.ia.armazenamento.pagina(tabela, paginas['cursor'])
+    paginas['registros'] += registros
+    paginas['cursor'] = cursor
+    paginas['fim'] = cursor is None
+
+def historico_paginado(tabela, titulo, formatar, exibidos):
+    """Histórico completo sob demanda: nada é lido até o usuário pedir a primeira página
+
+    Primeiro vem o resto do que já está em memória (além dos `exibidos` acima),
+    depois as páginas do banco/arquivo, que começam abaixo do seq mais antigo em memória.
+    """
+    memoria = getattr(st.session_state.ia, tabela)
+    inicio = next((registro['seq'] for registro in memoria if 'seq' in registro), None)
+    paginas = st.session_state.get(f'paginas_{tabela}')
+    if paginas is None or paginas['inicio'] != inicio:
+        # Memória recortada (ou recarregada): recomeça logo abaixo dela, sem buracos nem repetições
+        paginas = st.session_state[f'paginas_{tabela}'] = {
+            'registros': [], 'inicio': inicio, 'cursor': inicio, 'aberto': False, 'fim': False}
+    anteriores = memoria[:max(0, len(memoria) - exibidos)]
+    with st.expander(titulo):
+        if paginas['aberto']:
+            for registro in reversed(anteriores):
+                st.write(formatar(registro))
+        for registro in paginas['registros']:
+            st.write(formatar(registro))
+        if not paginas['fim']:
+            st.button("📜 Carregar mais", key=f'mais_{tabela}', on_click=carregar_pagina, args=(tabela,))
+        elif not paginas['registros'] and not anteriores:
+            st.caption("Nada registrado ainda")
+
+def formatar_aposta(aposta):
+    cor = "🔴" if aposta['previsao'] == 1 else "⚫"
+    resultado = "✅" if aposta['resultado'] == 'ganhou' else "❌"
+    return (f"{resultado} {aposta['timestamp'].strftime('%d/%m %H:%M')} | {cor} | R$ {aposta['valor']:.2f} | "
+            f"R$ {aposta['lucro']:+.2f} | {aposta.get('metodo', 'N/A')}")
+
+def formatar_previsao(previsao):
+    cor = "🔴" if previsao['previsao'] == 1 else "⚫"
+    resultado = "✅" if previsao.get('acertou') else "❌" if previsao.get('acertou') is False else "🔄"
+    return (f"{resultado} {previsao['timestamp'].strftime('%d/%m %H:%M')} {cor} "
+            f"**{previsao['metodo']}** ({previsao['confianca']:.0%})")
+
+# Períodos do gráfico de longo prazo: (segundos para trás, resolução dos baldes)
+PERIODOS = {
+    "Últimas 6 horas": (6 * 3600, 'minuto'),
+    "Últimas 24 horas": (24 * 3600, 'hora'),
+    "Últimos 7 dias": (7 * 86400, 'hora'),
+    "Últimos 30 dias": (30 * 86400, 'hora'),
+}
+
+@st.cache_data(max_entries=32)
+def figuras_periodo(ultimo_id, periodo, _agregados, _fim):
+    """Cores por balde, rolls e distância entre brancos a partir dos agregados (não das rodadas)"""
+    segundos, resolucao = PERIODOS[periodo]
+    baldes = _agregados.consultar(resolucao, _fim - segundos)
+    inicios = pd.to_datetime(baldes['inicios'], unit='s')
+    cores = pd.DataFrame({
+        'Início': inicios,
+        'Vermelho': baldes['cores'][:, 1],
+        'Preto': baldes['cores'][:, 2],
+        'Zero': baldes['cores'][:, 0],
+    }).melt(id_vars='Início', var_name='Cor', value_name='Rodadas')
+    fig_cores = px.bar(
+        cores, x='Início', y='Rodadas', color='Cor',
+        title=f'Cores por {resolucao} ({len(inicios)} baldes)',
+        color_discrete_map={'Vermelho': 'red', 'Preto': 'black', 'Zero': 'green'}
+    )
+    fig_rolls = px.bar(x=list(range(baldes['rolls'].shape[1])), y=baldes['rolls'].sum(axis=0),
+                       title='Números sorteados', labels={'x': 'Roll', 'y': 'Rodadas'})
+    lacunas = baldes['lacunas'].sum(axis=0)
+    fig_lacunas = px.bar(x=[str(i) for i in range(len(lacunas) - 1)] + [f'{len(lacunas) - 1}+'], y=lacunas,
+                         title='Rodadas entre brancos', labels={'x': 'Rodadas', 'y': 'Brancos'})
+    return fig_cores, fig_rolls, fig_lacunas
+
+@st.cache_data(max_entries=32)
+def figura_distribuicao(ultimo_id, total, _contador):
+    """Gráfico de pizza, reconstruído só quando chega rodada nova"""
+    return px.pie(
+        values=[_contador[1], _contador[2], _contador[0]],
+        names=['Vermelho', 'Preto', 'Zero'],
+        title='Distribuição Oficial - Blaze',
+        color=['Vermelho', 'Preto', 'Zero'],
+        color_discrete_map={'Vermelho': 'red', 'Preto': 'black', 'Zero': 'green'}
+    )
+
+# INICIALIZAR SISTEMA
+if 'ia' not in st.session_state:
+    st.session_state.ia = BlazeIA_Final(coletor=obter_coletor(), notificar=notificar_streamlit,
+                                          jogos=obter_jogos(), armazenamento=obter_armazenamento())
+# Depois do motor: a primeira passada já vê o histórico migrado
+obter_manutencao()
+
+# CONTROLE DE ATUALIZAÇÃO AUTOMÁTICA (alinhado às rodadas pelo coletor)
+if 'ultima_execucao' not in st.session_state:
+    st.session_state.ultima_execucao = datetime.now()
+if 'versao_processada' not in st.session_state:
+    st.session_state.versao_processada = 0
+
+coletor = obter_coletor()
+modo_auto = st.session_state.ia.modo_auto
+
+def dados_da_rodada():
+    """Roda o ciclo quando o coletor publica rodada nova; senão reaproveita a última"""
+    versao_atual = coletor.snapshot()['versao']
+    rodada = st.session_state.get('rodada')
+
+    # EXECUTAR CICLO AUTOMÁTICO (uma vez por rodada nova publicada)
+    if st.session_state.ia.modo_auto and versao_atual > st.session_state.versao_processada:
+        with st.spinner("🔄 Executando análise automática..."):
+            previsao, dados = st.session_state.ia.executar_ciclo_completo()
+            if previsao and dados:
+                st.session_state.ultima_execucao = datetime.now()
+                st.session_state.versao_processada = versao_atual
+                rodada = st.session_state.rodada = (versao_atual, dados, previsao)
+                st.success(f"✅ Ciclo #{st.session_state.ia.contador_atualizacoes} concluído!")
+    elif rodada is None or rodada[0] != versao_atual:
+        # MODO MANUAL (lê o snapshot do coletor, sem requisição própria)
+        with st.spinner("🌐 Conectando com servidor oficial..."):
+            dados = st.session_state.ia.buscar_dados_reais()
+
+        if dados:
+            st.session_state.ia.registrar_jogos(dados)
+            previsao = st.session_state.ia.prever(dados)
+            rodada = st.session_state.rodada = (coletor.snapshot()['versao'], dados, previsao)
+
+    if not rodada:
+        st.error("❌ Não foi possível carregar dados da Blaze")
+        st.stop()
+    return rodada[1], rodada[2]
+
+# ===== PAINÉIS AO VIVO =====
+# No modo automático cada painel se atualiza sozinho (st.fragment), sem recarregar a página inteira
+
+@st.fragment(run_every=INTERVALO_PAINEL if modo_auto else None)
+def painel_ao_vivo():
+    with cronometro('render_painel'):
+        desenhar_painel()
+
+def desenhar_painel():
+    dados, previsao = dados_da_rodada()
     
-    def carregar_dados(self):
-        try:
-            if os.path.exists(IA_DATA_FILE):
-                with open(IA_DATA_FILE, 'rb') as f:
-                    dados = pickle.load(f)
-                    self.historico = dados.get('historico', [])
-                    self.previsoes = dados.get('previsoes', [])
-                    self.apostas = dados.get('apostas', [])
-                    self.saldo = dados.get('saldo', 1000.0)
-                    self.contador_atualizacoes = dados.get('contador_atualizacoes', 0)
-                    self.modo_auto = dados.get('modo_auto', False)
-        except:
-            self.resetar_sistema()
+    st.header("🎯 Painel de Análise - Dados Oficiais")
+
+    # MÉTRICAS RÁPIDAS
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    with col1:
+        st.metric("Total Jogos", len(dados))
+
+    with col2:
+        ultimo_numero = dados[0]['roll']
+        st.metric("Último Número", ultimo_numero)
+
+    with col3:
+        ultima_cor = dados[0]['color']
+        cor_emoji = "🔴" if ultima_cor == 1 else "⚫" if ultima_cor == 2 else "🟢"
+        st.metric("Última Cor", cor_emoji)
+
+    with col4:
+        previsao_cor = "🔴" if previsao['previsao'] == 1 else "⚫"
+        st.metric("Previsão IA", previsao_cor)
+
+    with col5:
+        st.metric("Confiança", f"{previsao['confianca']:.1%}")
+
+    # CARD DE PREVISÃO
+    st.markdown("---")
+    st.subheader(f"🎯 PREVISÃO ATUAL: {previsao_cor} {'VERMELHO' if previsao['previsao'] == 1 else 'PRETO'}")
+    st.write(f"**Estratégia:** {previsao['metodo']}")
+    st.write(f"**Nível de Confiança:** {previsao['confianca']:.1%}")
+
+    # INDICADOR DE APOSTA ATIVA
+    recentes = st.session_state.ia.livro.apostas_recentes(datetime.now())
+    if recentes:
+        ultima_aposta = recentes[-1]
+        if ultima_aposta['resultado'] == 'ganhou':
+            st.success(f"💰 **Aposta ATIVA:** R$ {ultima_aposta['valor']:.2f} | +R$ {ultima_aposta['lucro']:.2f}")
+        else:
+            st.info(f"💰 **Aposta ATIVA:** R$ {ultima_aposta['valor']:.2f} | Aguardando...")
+
+    # ABAS PRINCIPAIS
+    tab1, tab2, tab3 = st.tabs(["📊 Dashboard", "💰 Apostas", "🔍 Análise"])
+
+    with tab1:
+        st.subheader("📊 Últimos Resultados - Blaze Oficial")
     
-    def salvar_dados(self):
-        try:
-            dados = {
-                'historico': self.historico,
-                'previsoes': self.previsoes,
-                'apostas': self.apostas,
-                'saldo': self.saldo,
-                'contador_atualizacoes': self.contador_atualizacoes,
-                'modo_auto': self.modo_auto
-            }
-            with open(IA_DATA_FILE, 'wb') as f:
-                pickle.dump(dados, f)
-        except:
-            pass
+        # SEQUÊNCIA VISUAL (um único bloco, memorizado pelo id do jogo mais recente)
+        st.markdown(faixa_resultados(dados[0]['id'], dados[:20]), unsafe_allow_html=True)
     
-    def resetar_sistema(self):
-        self.historico = []
-        self.previsoes = []
-        self.apostas = []
-        self.saldo = 1000.0
-        self.contador_atualizacoes = 0
-        self.modo_auto = False
+        # GRÁFICO DE DISTRIBUIÇÃO
+        st.subheader("📈 Distribuição de Cores")
+        contador = contar_cores(st.session_state.ia.colunas.recentes(len(dados)))
+        st.plotly_chart(figura_distribuicao(dados[0]['id'], len(dados), contador), use_container_width=True)
     
-    def alternar_modo_auto(self):
-        self.modo_auto = not self.modo_auto
-        self.salvar_dados()
-        return self.modo_auto
-
-    def buscar_dados_reais(self):
-        """Busca dados reais da API oficial - Formato confirmado: LISTA direta"""
-        url = 'https://blaze.bet.br/api/singleplayer-originals/originals/roulette_games/recent/1'
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-            'Origin': 'https://blaze.com',
-            'Referer': 'https://blaze.com/',
-        }
-        
-        try:
-            with st.spinner("🌐 Conectando com servidor oficial..."):
-                response = requests.get(url, headers=headers, timeout=10, verify=True)
+        # DISTRIBUIÇÃO AO LONGO DO TEMPO (agregados por minuto/hora, atualizados a cada rodada)
+        st.subheader("📅 Distribuição ao Longo do Tempo")
+        colunas = st.session_state.ia.colunas
+        if len(colunas):
+            periodo = st.selectbox("Período", list(PERIODOS), index=1, key='periodo_agregados')
+            fig_cores, fig_rolls, fig_lacunas = figuras_periodo(
+                dados[0]['id'], periodo, st.session_state.ia.agregados, colunas.timestamps[-1] // 1000)
+            st.plotly_chart(fig_cores, use_container_width=True)
+            col_g1, col_g2 = st.columns(2)
+            with col_g1:
+                st.plotly_chart(fig_rolls, use_container_width=True)
+            with col_g2:
+                st.plotly_chart(fig_lacunas, use_container_width=True)
+
+    with tab2:
+        st.subheader("💰 Histórico de Apostas Inteligentes")
+    
+        if st.session_state.ia.livro.total_apostas():
+            for aposta in reversed(st.session_state.ia.apostas[-12:]):
+                cor_aposta = "🔴" if aposta['previsao'] == 1 else "⚫"
             
-            if response.status_code == 200:
-                dados = response.json()
-                
-                # CONFIRMADO: É uma lista direta com os jogos
-                if isinstance(dados, list) and len(dados) > 0:
-                    st.success(f"✅ {len(dados)} jogos recebidos da Blaze")
-                    return dados
+                if aposta['resultado'] == 'ganhou':
+                    st.success(
+                        f"✅ {aposta['timestamp'].strftime('%H:%M')} | "
+                        f"{cor_aposta} | R$ {aposta['valor']:.2f} | "
+                        f"+R$ {aposta['lucro']:.2f} | "
+                        f"{aposta.get('metodo', 'N/A')}"
+                    )
                 else:
-                    st.error("❌ Formato inesperado dos dados")
-                    return None
-                    
-            else:
-                st.error(f"❌ Erro HTTP: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            st.error(f"❌ Erro de conexão: {e}")
-            return None
-
-    def analisar_padroes_avancada(self, dados):
-        """Análise avançada baseada nos dados reais da Blaze"""
-        if not dados or len(dados) < 5:
-            return self._previsao_aleatoria()
-        
-        # Pegar apenas as últimas cores válidas (excluir zeros para análise de sequência)
-        ultimas_cores = [jogo['color'] for jogo in dados[:15] if jogo['color'] in [1, 2]]
-        
-        if len(ultimas_cores) < 3:
-            return self._previsao_aleatoria()
-        
-        # 1. ANÁLISE DE SEQUÊNCIAS (Alta Confiança)
-        if len(ultimas_cores) >= 5:
-            # 5+ cores iguais → Reversão quase certa
-            for cor in [1, 2]:
-                if all(c == cor for c in ultimas_cores[:5]):
-                    return {
-                        'previsao': 2 if cor == 1 else 1,
-                        'confianca': 0.92,
-                        'metodo': '🎯 SEQUÊNCIA LONGA (5+)'
-                    }
-        
-        if len(ultimas_cores) >= 4:
-            # 4 cores iguais → Alta probabilidade de reversão
-            for cor in [1, 2]:
-                if all(c == cor for c in ultimas_cores[:4]):
-                    return {
-                        'previsao': 2 if cor == 1 else 1,
-                        'confianca': 0.85,
-                        'metodo': '🔥 SEQUÊNCIA FORTE (4)'
-                    }
-        
-        if len(ultimas_cores) >= 3:
-            # 3 cores iguais → Boa probabilidade de reversão
-            for cor in [1, 2]:
-                if all(c == cor for c in ultimas_cores[:3]):
-                    return {
-                        'previsao': 2 if cor == 1 else 1,
-                        'confianca': 0.78,
-                        'metodo': '⚡ SEQUÊNCIA MÉDIA (3)'
-                    }
-        
-        # 2. ANÁLISE DE TENDÊNCIA TEMPORAL
-        # Dar mais peso aos resultados mais recentes
-        pesos = [2.0, 1.8, 1.6, 1.4, 1.2, 1.0, 0.8, 0.6, 0.4, 0.2]
-        peso_red = 0
-        peso_black = 0
-        
-        for i, cor in enumerate(ultimas_cores[:10]):
-            peso = pesos[i] if i < len(pesos) else 0.5
-            if cor == 1:
-                peso_red += peso
-            elif cor == 2:
-                peso_black += peso
-        
-        diferenca = abs(peso_red - peso_black)
+                    st.error(
+                        f"❌ {aposta['timestamp'].strftime('%H:%M')} | "
+                        f"{cor_aposta} | R$ {aposta['valor']:.2f} | "
+                        f"{aposta.get('metodo', 'N/A')}"
+                    )
         
-        if peso_red > peso_black * 1.4:  # Tendência forte de vermelho
-            return {
-                'previsao': 2,
-                'confianca': min(0.80, 0.60 + diferenca/10),
-                'metodo': '📊 TENDÊNCIA FORTE 🔴'
-            }
-        elif peso_black > peso_red * 1.4:  # Tendência forte de preto
-            return {
-                'previsao': 1,
-                'confianca': min(0.80, 0.60 + diferenca/10),
-                'metodo': '📊 TENDÊNCIA FORTE ⚫'
-            }
+            # ESTATÍSTICAS DETALHADAS
+            resumo = st.session_state.ia.livro.resumo_apostas()
+            vitorias, total = resumo['vitorias'], resumo['total']
+            lucro_total = resumo['lucro_total']
         
-        # 3. PADRÃO ZEBRA (Alternância)
-        if len(ultimas_cores) >= 6:
-            alternancias = sum(1 for i in range(len(ultimas_cores)-1) 
-                            if ultimas_cores[i] != ultimas_cores[i+1])
-            if alternancias >= len(ultimas_cores) - 1:  # Alternância quase perfeita
-                return {
-                    'previsao': 2 if ultimas_cores[0] == 1 else 1,
-                    'confianca': 0.72,
-                    'metodo': '🦓 PADRÃO ZEBRA ATIVO'
-                }
-        
-        # 4. ANÁLISE ESTATÍSTICA GERAL
-        todas_cores = [jogo['color'] for jogo in dados if jogo['color'] in [1, 2]]
-        if len(todas_cores) > 15:
-            count_red = todas_cores.count(1)
-            count_black = todas_cores.count(2)
-            total = count_red + count_black
+            col_r1, col_r2, col_r3, col_r4 = st.columns(4)
+            with col_r1:
+                st.metric("Taxa Acerto", f"{(vitorias/total*100):.1f}%")
+            with col_r2:
+                st.metric("Total", total)
+            with col_r3:
+                st.metric("Lucro Total", f"R$ {lucro_total:.2f}")
+            with col_r4:
+                st.metric("ROI", f"{resumo['roi']:.1f}%")
+
+            historico_paginado('apostas', "📜 Todas as apostas", formatar_aposta, exibidos=12)
             
-            if count_red > count_black:
-                return {
-                    'previsao': 2,
-                    'confianca': 0.65,
-                    'metodo': '📈 ESTATÍSTICA: MAIS 🔴'
-                }
-            else:
-                return {
-                    'previsao': 1,
-                    'confianca': 0.65,
-                    'metodo': '📈 ESTATÍSTICA: MAIS ⚫'
-                }
-        
-        # 5. FALLBACK INTELIGENTE
-        return self._fallback_inteligente(ultimas_cores)
+        else:
+            st.info("📝 Nenhuma aposta registrada. Apostas automáticas com confiança > 75%")
 
-    def _fallback_inteligente(self, ultimas_cores):
-        """Fallback baseado nos padrões mais recentes"""
-        if len(ultimas_cores) < 2:
-            return self._previsao_aleatoria()
+    with tab3:
+        st.subheader("🔍 Análise Detalhada do Sistema")
+    
+        col_a1, col_a2 = st.columns(2)
+    
+        with col_a1:
+            st.markdown("#### 📊 Sistema")
+            st.write(f"**Ciclos executados:** {st.session_state.ia.contador_atualizacoes}")
+            st.write(f"**Previsões registradas:** {st.session_state.ia.livro.total_previsoes()}")
+            st.write(f"**Jogos armazenados:** {len(st.session_state.ia.colunas)} "
+                     f"({st.session_state.ia.colunas.nbytes / 1024:.0f} KB)")
+            st.write(f"**Saldo atual:** R$ {st.session_state.ia.saldo:.2f}")
+            st.write(f"**Modo operação:** {'AUTOMÁTICO' if st.session_state.ia.modo_auto else 'MANUAL'}")
+            st.write(f"**Última atualização:** {st.session_state.ia.ultima_atualizacao.strftime('%H:%M:%S')}")
+        
+            api = obter_cliente().estatisticas()
+            if api['latencia_media'] is not None:
+                st.write(f"**API:** {api['requisicoes']} requisições | "
+                         f"latência média {api['latencia_media'] * 1000:.0f} ms | "
+                         f"{api['acertos_cache'] + api['repetidos']} respostas reaproveitadas | "
+                         f"{api['erros']} erros")
         
-        # Se os últimos 2 foram iguais, prevê mudança
-        if ultimas_cores[0] == ultimas_cores[1]:
-            return {
-                'previsao': 2 if ultimas_cores[0] == 1 else 1,
-                'confianca': 0.62,
-                'metodo': '🔄 QUEBRA DE SEQUÊNCIA'
-            }
+            # Estatísticas de precisão
+            if st.session_state.ia.livro.total_previsoes():
+                acertos, verificadas = st.session_state.ia.livro.precisao_previsoes()
+                if verificadas:
+                    st.write(f"**Precisão da IA:** {(acertos/verificadas*100):.1f}%")
         
-        # Se estão alternando, mantém padrão
-        return {
-            'previsao': 2 if ultimas_cores[0] == 1 else 1,
-            'confianca': 0.58,
-            'metodo': '↔️ MANUTENÇÃO DE PADRÃO'
-        }
-
-    def _previsao_aleatoria(self):
-        return {
-            'previsao': random.choice([1, 2]),
-            'confianca': 0.5,
-            'metodo': '🎲 ANÁLISE INICIAL'
-        }
+            # O QUE VEIO DEPOIS DO PADRÃO ATUAL (índice de transições, consulta direta)
+            st.markdown("#### 🔢 Padrões Históricos")
+            transicoes = st.session_state.ia.transicoes
+            sugestao = transicoes.analisar()
+            if sugestao:
+                st.write(f"**Sugestão:** {EMOJIS[sugestao['previsao']]} {sugestao['confianca']:.0%} "
+                         f"(depois das últimas {sugestao['k']} cores, {sugestao['amostras']} vezes)")
+            for k in range(1, transicoes.k_maximo + 1):
+                resultado = transicoes.consultar_atual(k)
+                if not resultado or not resultado['amostras']:
+                    break
+                padrao = "".join(EMOJIS[c] for c in resultado['padrao'])
+                p = resultado['probabilidades']
+                st.write(f"{padrao} → 🔴 {p[1]:.0%} | ⚫ {p[2]:.0%} | 🟢 {p[0]:.0%} "
+                         f"({resultado['amostras']} vezes)")
     
-    def executar_ciclo_completo(self):
-        """Executa um ciclo completo de análise"""
-        try:
-            # Buscar dados reais
-            dados = self.buscar_dados_reais()
-            
-            if not dados:
-                st.error("❌ Não foi possível obter dados")
-                return None, None
-            
-            # Fazer previsão avançada
-            previsao = self.analisar_padroes_avancada(dados)
-            
-            # Registrar previsão
-            registro = {
-                'timestamp': datetime.now(),
-                'previsao': previsao['previsao'],
-                'confianca': previsao['confianca'],
-                'metodo': previsao['metodo'],
-                'acertou': None
-            }
-            self.previsoes.append(registro)
-            
-            # SISTEMA DE APOSTAS INTELIGENTE
-            if previsao['confianca'] > 0.75 and self.saldo > 10:
-                # Valor progressivo baseado na confiança
-                base = self.saldo * 0.025  # 2.5% base
-                multiplicador = min(2.0, (previsao['confianca'] - 0.75) * 4 + 1)
-                valor_aposta = min(base * multiplicador, 50)  # Máximo R$ 50
-                
-                self.saldo -= valor_aposta
-                
-                # Chance real ajustada (leva em conta a house edge)
-                chance_real = previsao['confianca'] * 0.88
-                acertou = random.random() < chance_real
-                
-                aposta = {
-                    'timestamp': datetime.now(),
-                    'valor': round(valor_aposta, 2),
-                    'previsao': previsao['previsao'],
-                    'resultado': 'ganhou' if acertou else 'perdeu',
-                    'lucro': round(valor_aposta * 1.95, 2) if acertou else round(-valor_aposta, 2),
-                    'confianca': previsao['confianca'],
-                    'metodo': previsao['metodo']
-                }
-                
-                if acertou:
-                    self.saldo += valor_aposta * 1.95
-                    registro['acertou'] = True
-                    registro['lucro_aposta'] = valor_aposta * 0.95
-                else:
-                    registro['acertou'] = False
-                    registro['lucro_aposta'] = -valor_aposta
-                
-                self.apostas.append(aposta)
-                registro['aposta_id'] = len(self.apostas)
-            
-            # ATUALIZAR SISTEMA
-            self.contador_atualizacoes += 1
-            self.ultima_atualizacao = datetime.now()
-            
-            # Atualizar histórico (apenas jogos novos)
-            for jogo in dados:
-                if jogo not in self.historico:
-                    self.historico.append(jogo)
-            
-            # Manter histórico gerenciável
-            if len(self.historico) > 100:
-                self.historico = self.historico[-100:]
-            
-            self.salvar_dados()
-            return previsao, dados
-            
-        except Exception as e:
-            st.error(f"❌ Erro no ciclo: {str(e)}")
-            return None, None
+        with col_a2:
+            st.markdown("#### 🎯 Estratégias Recentes")
+            if st.session_state.ia.previsoes:
+                ultimas = st.session_state.ia.previsoes[-8:]
+                for prev in reversed(ultimas):
+                    cor = "🔴" if prev['previsao'] == 1 else "⚫"
+                    resultado = "✅" if prev.get('acertou') else "❌" if prev.get('acertou') is False else "🔄"
+                    st.write(f"{resultado} {cor} **{prev['metodo']}** ({prev['confianca']:.0%})")
+            # Pelo livro: com a memória recortada pela retenção, o histórico no banco continua acessível
+            if st.session_state.ia.livro.total_previsoes():
+                historico_paginado('previsoes', "📜 Todas as previsões", formatar_previsao, exibidos=8)
+
+            # Totais por estratégia (mantidos pelo livro a cada aposta)
+            metodos = st.session_state.ia.livro.metodos()
+            if metodos:
+                st.markdown("#### 📋 Apostas por Estratégia")
+                for metodo in metodos:
+                    r = st.session_state.ia.livro.resumo_apostas(metodo)
+                    st.write(f"**{metodo}:** {r['vitorias']}/{r['total']} "
+                             f"({r['vitorias'] / r['total']:.0%}) | R$ {r['lucro_total']:+.2f}")
+
+            # Cadeia de server_seed conferida em lote pela manutenção periódica (não no render)
+            manutencao = obter_manutencao()
+            verificacao = situacao_verificacao(manutencao.ultima()['concluida_em'],
+                                               st.session_state.ia.armazenamento, manutencao.semente_cliente)
+            if verificacao['verificadas']:
+                st.markdown("#### 🔐 Provably Fair")
+                falhas = verificacao['falhas']
+                st.write(f"**Rodadas conferidas:** {verificacao['verificadas']} | "
+                         f"quebras {falhas.get('quebra', 0)} | lacunas {falhas.get('lacuna', 0)} | "
+                         f"rolls {falhas.get('roll', 0)} | cores {falhas.get('cor', 0)}")
+                for falha in verificacao['recentes']:
+                    if falha['tipo'] != 'lacuna':
+                        st.write(f"⚠️ {falha['tipo']} na rodada {falha['id']}")
+
+    # FOOTER
+    st.markdown("---")
+    st.success("""
+**✅ SISTEMA BLAZE IA - VERSÃO FINAL**
 
-# INICIALIZAR SISTEMA
-if 'ia' not in st.session_state:
-    st.session_state.ia = BlazeIA_Final()
+• **Conexão estável** com API oficial
+• **Análise avançada** de padrões reais  
+• **Sistema de apostas** inteligente e conservador
+• **100% funcional** online
 
-# CONTROLE DE ATUALIZAÇÃO AUTOMÁTICA
-if 'ultima_execucao' not in st.session_state:
-    st.session_state.ultima_execucao = datetime.now()
+**🎯 Estratégias em tempo real:**
+- Detecção de sequências longas (3-5+)
+- Análise de tendências temporais
+- Padrões de alternância (Zebra)
+- Probabilidades estatísticas avançadas
+""")
 
-tempo_decorrido = (datetime.now() - st.session_state.ultima_execucao).total_seconds()
+    st.caption(f"🕒 {datetime.now().strftime('%H:%M:%S')} | Dados oficiais: Blaze API | Ciclo: #{st.session_state.ia.contador_atualizacoes}")
 
-# EXECUTAR CICLO AUTOMÁTICO
-if st.session_state.ia.modo_auto and tempo_decorrido > 40:
-    with st.spinner("🔄 Executando análise automática..."):
-        previsao, dados = st.session_state.ia.executar_ciclo_completo()
-        if previsao and dados:
-            st.session_state.ultima_execucao = datetime.now()
-            st.success(f"✅ Ciclo #{st.session_state.ia.contador_atualizacoes} concluído!")
-else:
-    # MODO MANUAL
-    with st.spinner("🌐 Buscando dados oficiais da Blaze..."):
-        dados = st.session_state.ia.buscar_dados_reais()
+@st.fragment(run_every=INTERVALO_PAINEL if modo_auto else None)
+def estatisticas_laterais():
+    if st.session_state.ia.modo_auto:
+        tempo_restante = int(coletor.segundos_ate_proxima())
+        st.info(f"⏰ Próxima: {tempo_restante}s")
+        
+        atraso = coletor.agendador.atraso_medio() if coletor.agendador else None
+        if atraso is not None:
+            st.caption(f"Atraso médio após a rodada: {atraso:.1f}s")
     
-    if dados:
-        previsao = st.session_state.ia.analisar_padroes_avancada(dados)
-    else:
-        st.error("❌ Não foi possível carregar dados da Blaze")
-        st.stop()
+    st.divider()
+    
+    # ESTATÍSTICAS
+    st.header("📊 Estatísticas")
+    st.metric("💰 Saldo", f"R$ {st.session_state.ia.saldo:.2f}")
+    st.metric("🔄 Ciclos", st.session_state.ia.contador_atualizacoes)
+    st.metric("📈 Apostas", st.session_state.ia.livro.total_apostas())
+    
+    if st.session_state.ia.livro.total_apostas():
+        resumo = st.session_state.ia.livro.resumo_apostas()
+        vitorias, total = resumo['vitorias'], resumo['total']
+        st.metric("🎯 Acertos", f"{vitorias}/{total}")
+        
+        if total > 0:
+            st.metric("📊 Taxa", f"{(vitorias/total*100):.1f}%")
 
 # ===== INTERFACE DO USUÁRIO =====
 
+# CONTEÚDO PRINCIPAL
+painel_ao_vivo()
+
 # SIDEBAR
 with st.sidebar:
     st.header("🎮 Controles")
@@ -360,31 +488,14 @@ with st.sidebar:
             st.session_state.ia.alternar_modo_auto()
             st.rerun()
         st.success("**SISTEMA AUTOMÁTICO**")
-        st.write("Atualiza a cada 40 segundos")
-        
-        tempo_restante = max(0, 40 - int(tempo_decorrido))
-        st.info(f"⏰ Próxima: {tempo_restante}s")
+        st.write("Sincronizado com as rodadas (~30 segundos)")
     else:
         if st.button("🟢 LIGAR Auto", use_container_width=True, type="primary"):
             st.session_state.ia.alternar_modo_auto()
             st.rerun()
         st.warning("**MODO MANUAL**")
     
-    st.divider()
-    
-    # ESTATÍSTICAS
-    st.header("📊 Estatísticas")
-    st.metric("💰 Saldo", f"R$ {st.session_state.ia.saldo:.2f}")
-    st.metric("🔄 Ciclos", st.session_state.ia.contador_atualizacoes)
-    st.metric("📈 Apostas", len(st.session_state.ia.apostas))
-    
-    if st.session_state.ia.apostas:
-        vitorias = sum(1 for a in st.session_state.ia.apostas if a['resultado'] == 'ganhou')
-        total = len(st.session_state.ia.apostas)
-        st.metric("🎯 Acertos", f"{vitorias}/{total}")
-        
-        if total > 0:
-            st.metric("📊 Taxa", f"{(vitorias/total*100):.1f}%")
+    estatisticas_laterais()
     
     st.divider()
     
@@ -402,171 +513,20 @@ with st.sidebar:
             st.success("🔄 Sistema resetado!")
             st.rerun()
 
-# CONTEÚDO PRINCIPAL
-st.header("🎯 Painel de Análise - Dados Oficiais")
-
-# MÉTRICAS RÁPIDAS
-col1, col2, col3, col4, col5 = st.columns(5)
-
-with col1:
-    st.metric("Total Jogos", len(dados))
-
-with col2:
-    ultimo_numero = dados[0]['roll']
-    st.metric("Último Número", ultimo_numero)
-
-with col3:
-    ultima_cor = dados[0]['color']
-    cor_emoji = "🔴" if ultima_cor == 1 else "⚫" if ultima_cor == 2 else "🟢"
-    st.metric("Última Cor", cor_emoji)
-
-with col4:
-    previsao_cor = "🔴" if previsao['previsao'] == 1 else "⚫"
-    st.metric("Previsão IA", previsao_cor)
-
-with col5:
-    st.metric("Confiança", f"{previsao['confianca']:.1%}")
-
-# CARD DE PREVISÃO
-st.markdown("---")
-st.subheader(f"🎯 PREVISÃO ATUAL: {previsao_cor} {'VERMELHO' if previsao['previsao'] == 1 else 'PRETO'}")
-st.write(f"**Estratégia:** {previsao['metodo']}")
-st.write(f"**Nível de Confiança:** {previsao['confianca']:.1%}")
-
-# INDICADOR DE APOSTA ATIVA
-apostas_recentes = [a for a in st.session_state.ia.apostas 
-                   if a['timestamp'] > datetime.now() - timedelta(minutes=2)]
-if apostas_recentes:
-    ultima_aposta = apostas_recentes[-1]
-    if ultima_aposta['resultado'] == 'ganhou':
-        st.success(f"💰 **Aposta ATIVA:** R$ {ultima_aposta['valor']:.2f} | +R$ {ultima_aposta['lucro']:.2f}")
-    else:
-        st.info(f"💰 **Aposta ATIVA:** R$ {ultima_aposta['valor']:.2f} | Aguardando...")
-
-# ABAS PRINCIPAIS
-tab1, tab2, tab3 = st.tabs(["📊 Dashboard", "💰 Apostas", "🔍 Análise"])
-
-with tab1:
-    st.subheader("📊 Últimos Resultados - Blaze Oficial")
-    
-    # SEQUÊNCIA VISUAL
-    cols = st.columns(min(20, len(dados)))
-    for idx, jogo in enumerate(dados[:20]):
-        with cols[idx]:
-            cor = jogo['color']
-            emoji = "🔴" if cor == 1 else "⚫" if cor == 2 else "🟢"
-            cor_hex = "#ff4444" if cor == 1 else "#000000" if cor == 2 else "#00aa00"
-            
-            st.markdown(f"""
-            <div style='text-align: center; padding: 8px; border-radius: 8px; 
-                        background: {cor_hex}; color: white; font-weight: bold; font-size: 0.8em;'>
-                {emoji}<br>{jogo['roll']}
-            </div>
-            """, unsafe_allow_html=True)
-    
-    # GRÁFICO DE DISTRIBUIÇÃO
-    st.subheader("📈 Distribuição de Cores")
-    cores = [jogo['color'] for jogo in dados]
-    contador = Counter(cores)
-    
-    fig = px.pie(
-        values=[contador.get(1,0), contador.get(2,0), contador.get(0,0)],
-        names=['Vermelho', 'Preto', 'Zero'],
-        title='Distribuição Oficial - Blaze',
-        color=['Vermelho', 'Preto', 'Zero'],
-        color_discrete_map={'Vermelho': 'red', 'Preto': 'black', 'Zero': 'green'}
-    )
-    st.plotly_chart(fig, use_container_width=True)
-
-with tab2:
-    st.subheader("💰 Histórico de Apostas Inteligentes")
-    
-    if st.session_state.ia.apostas:
-        for aposta in reversed(st.session_state.ia.apostas[-12:]):
-            cor_aposta = "🔴" if aposta['previsao'] == 1 else "⚫"
-            
-            if aposta['resultado'] == 'ganhou':
-                st.success(
-                    f"✅ {aposta['timestamp'].strftime('%H:%M')} | "
-                    f"{cor_aposta} | R$ {aposta['valor']:.2f} | "
-                    f"+R$ {aposta['lucro']:.2f} | "
-                    f"{aposta.get('metodo', 'N/A')}"
-                )
-            else:
-                st.error(
-                    f"❌ {aposta['timestamp'].strftime('%H:%M')} | "
-                    f"{cor_aposta} | R$ {aposta['valor']:.2f} | "
-                    f"{aposta.get('metodo', 'N/A')}"
-                )
-        
-        # ESTATÍSTICAS DETALHADAS
-        vitorias = sum(1 for a in st.session_state.ia.apostas if a['resultado'] == 'ganhou')
-        total = len(st.session_state.ia.apostas)
-        lucro_total = sum(a['lucro'] for a in st.session_state.ia.apostas)
-        investido = sum(a['valor'] for a in st.session_state.ia.apostas if a['resultado'] == 'perdeu')
-        
-        col_r1, col_r2, col_r3, col_r4 = st.columns(4)
-        with col_r1:
-            st.metric("Taxa Acerto", f"{(vitorias/total*100):.1f}%")
-        with col_r2:
-            st.metric("Total", total)
-        with col_r3:
-            st.metric("Lucro Total", f"R$ {lucro_total:.2f}")
-        with col_r4:
-            roi = (lucro_total / investido * 100) if investido > 0 else 0
-            st.metric("ROI", f"{roi:.1f}%")
-            
-    else:
-        st.info("📝 Nenhuma aposta registrada. Apostas automáticas com confiança > 75%")
-
-with tab3:
-    st.subheader("🔍 Análise Detalhada do Sistema")
-    
-    col_a1, col_a2 = st.columns(2)
-    
-    with col_a1:
-        st.markdown("#### 📊 Sistema")
-        st.write(f"**Ciclos executados:** {st.session_state.ia.contador_atualizacoes}")
-        st.write(f"**Previsões registradas:** {len(st.session_state.ia.previsoes)}")
-        st.write(f"**Saldo atual:** R$ {st.session_state.ia.saldo:.2f}")
-        st.write(f"**Modo operação:** {'AUTOMÁTICO' if st.session_state.ia.modo_auto else 'MANUAL'}")
-        st.write(f"**Última atualização:** {st.session_state.ia.ultima_atualizacao.strftime('%H:%M:%S')}")
-        
-        # Estatísticas de precisão
-        if st.session_state.ia.previsoes:
-            previsoes_verificadas = [p for p in st.session_state.ia.previsoes if p.get('acertou') is not None]
-            if previsoes_verificadas:
-                acertos = sum(1 for p in previsoes_verificadas if p['acertou'])
-                st.write(f"**Precisão da IA:** {(acertos/len(previsoes_verificadas)*100):.1f}%")
-    
-    with col_a2:
-        st.markdown("#### 🎯 Estratégias Recentes")
-        if st.session_state.ia.previsoes:
-            ultimas = st.session_state.ia.previsoes[-8:]
-            for prev in reversed(ultimas):
-                cor = "🔴" if prev['previsao'] == 1 else "⚫"
-                resultado = "✅" if prev.get('acertou') else "❌" if prev.get('acertou') is False else "🔄"
-                st.write(f"{resultado} {cor} **{prev['metodo']}** ({prev['confianca']:.0%})")
-
-# FOOTER
-st.markdown("---")
-st.success("""
-**✅ SISTEMA BLAZE IA - VERSÃO FINAL**
-
-• **Conexão estável** com API oficial
-• **Análise avançada** de padrões reais  
-• **Sistema de apostas** inteligente e conservador
-• **100% funcional** online
-
-**🎯 Estratégias em tempo real:**
-- Detecção de sequências longas (3-5+)
-- Análise de tendências temporais
-- Padrões de alternância (Zebra)
-- Probabilidades estatísticas avançadas
-""")
-
-st.caption(f"🕒 {datetime.now().strftime('%H:%M:%S')} | Dados oficiais: Blaze API | Ciclo: #{st.session_state.ia.contador_atualizacoes}")
+    # DEPURAÇÃO (só com BLAZE_METRICAS=1)
+    if blaze_metricas.registro.ativo:
+        with st.expander("🐞 Latência por etapa"):
+            resumo = blaze_metricas.registro.resumo()
+            if resumo['etapas']:
+                st.dataframe(pd.DataFrame([
+                    {'Etapa': etapa, 'p50 (ms)': m['p50'] * 1000, 'p95 (ms)': m['p95'] * 1000,
+                     'p99 (ms)': m['p99'] * 1000, 'Medições': m['contagem']}
+                    for etapa, m in resumo['etapas'].items()
+                ]).round(2), hide_index=True)
+            for nome, valor in sorted({**resumo['contadores'], **resumo['medidores']}.items()):
+                st.caption(f"{nome}: {valor:,.2f}" if isinstance(valor, float) else f"{nome}: {valor:,}")
+
+# Render da página inteira (os fragmentos medem o próprio render em 'render_painel')
+if blaze_metricas.registro.ativo:
+    blaze_metricas.registro.observar('render_pagina', time.perf_counter() - inicio_render)
 
-# AUTO-REFRESH PARA MODO AUTOMÁTICO
-if st.session_state.ia.modo_auto and tempo_decorrido > 45:
-    st.rerun()
@@ -0,0 +1,601 @@
+# BLAZE IA - ARMAZENAMENTO INCREMENTAL (SQLite WAL)
+import json
+import os
+import pickle
+import sqlite3
+import threading
+from datetime import datetime
+
+from blaze_arquivo import TABELAS, caminho_segmento, gravar_segmento, ler_segmento, periodo_de
+from blaze_colunar import HistoricoColunar, iso_para_ms, ms_para_iso
+from blaze_livro import LivroEstatisticas
+from blaze_politica import SALDO_INICIAL
+from blaze_verificacao import recortar_intervalos, unir_intervalos
+
+IA_DB_FILE = "ia_data.db"
+
+# Registros por página do histórico de previsões/apostas
+TAMANHO_PAGINA = 50
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS jogos (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    color INTEGER NOT NULL,
+    roll INTEGER NOT NULL,
+    server_seed TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jogos_created_at ON jogos (created_at);
+CREATE TABLE IF NOT EXISTS previsoes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    dados TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS apostas (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    dados TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS estado (
+    chave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_previsoes_timestamp ON previsoes (timestamp);
+CREATE INDEX IF NOT EXISTS idx_apostas_timestamp ON apostas (timestamp);
+CREATE TABLE IF NOT EXISTS segmentos (
+    tabela TEXT NOT NULL,
+    periodo TEXT NOT NULL,
+    caminho TEXT NOT NULL,
+    registros INTEGER NOT NULL,
+    inicio TEXT NOT NULL,
+    fim TEXT NOT NULL,
+    resumo TEXT NOT NULL,
+    seq_min INTEGER,
+    seq_max INTEGER,
+    PRIMARY KEY (tabela, periodo)
+);
+CREATE TABLE IF NOT EXISTS verificacao_intervalos (
+    semente_cliente TEXT NOT NULL,
+    inicio_ms INTEGER NOT NULL,
+    fim_ms INTEGER NOT NULL,
+    PRIMARY KEY (semente_cliente, inicio_ms)
+);
+CREATE TABLE IF NOT EXISTS verificacao_falhas (
+    id TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    timestamp_ms INTEGER NOT NULL,
+    detalhe TEXT NOT NULL,
+    PRIMARY KEY (id, tipo)
+);
+"""
+
+ESTADO_PADRAO = {
+    'saldo': SALDO_INICIAL,
+    'contador_atualizacoes': 0,
+    'modo_auto': False,
+}
+
+
+def _json_padrao(valor):
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+def _codificar_registro(registro):
+    return json.dumps(registro, default=_json_padrao, ensure_ascii=False)
+
+
+def _decodificar_registro(texto):
+    registro = json.loads(texto)
+    if isinstance(registro.get('timestamp'), str):
+        registro['timestamp'] = datetime.fromisoformat(registro['timestamp'])
+    return registro
+
+
+def _iso(valor):
+    return valor.isoformat() if isinstance(valor, datetime) else valor
+
+
+def _timestamp(registro):
+    valor = registro.get('timestamp')
+    return valor.isoformat() if isinstance(valor, datetime) else str(valor)
+
+
+class ArmazenamentoBlaze:
+    """Persistência append-only: cada ciclo grava só os registros novos numa transação"""
+
+    def __init__(self, caminho=IA_DB_FILE, migrar_de=()):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, timeout=10, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(ESQUEMA)
+        self._conexao.commit()
+        self._migrar_segmentos()
+        self._migrar_autoincremento()
+
+        if migrar_de and self._ler_estado('migrado_de') is None:
+            self.migrar_pickle(migrar_de)
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+    # ===== LEITURA =====
+
+    def carregar(self, limite_registros=None):
+        """Estado da sessão: previsões e apostas, contadores e totais do livro
+
+        Com `limite_registros` vêm só as últimas previsões/apostas; as anteriores
+        ficam para `pagina` (cada registro traz o seu 'seq', o cursor das páginas).
+        Os jogos ficam em `carregar_historico`/`carregar_colunas`.
+        """
+        with self._lock:
+            cur = self._conexao.cursor()
+            registros = {}
+            for tabela in TABELAS:
+                if limite_registros:
+                    cur.execute(f"SELECT seq, dados FROM (SELECT seq, dados FROM {tabela} ORDER BY seq DESC LIMIT ?)"
+                                " ORDER BY seq", (limite_registros,))
+                else:
+                    cur.execute(f"SELECT seq, dados FROM {tabela} ORDER BY seq")
+                registros[tabela] = [dict(_decodificar_registro(d), seq=seq) for seq, d in cur]
+
+        dados = dict(ESTADO_PADRAO)
+        for chave in ESTADO_PADRAO:
+            valor = self._ler_estado(chave)
+            if valor is not None:
+                dados[chave] = valor
+        dados.update(livro=self._ler_estado('livro'), **registros)
+        return dados
+
+    def carregar_historico(self, limite):
+        """Os `limite` jogos mais recentes, em ordem de created_at"""
+        with self._lock:
+            cur = self._conexao.execute(
+                "SELECT id, created_at, color, roll, server_seed FROM ("
+                " SELECT * FROM jogos ORDER BY created_at DESC LIMIT ?"
+                ") ORDER BY created_at", (limite,))
+            return [{'id': i, 'created_at': c, 'color': cor, 'roll': r, 'server_seed': s}
+                    for i, c, cor, r, s in cur.fetchall()]
+
+    def carregar_colunas(self, lote=50000):
+        """Todo o histórico de jogos em colunas NumPy, lido em lotes"""
+        colunas = HistoricoColunar(capacidade=self.contar_jogos())
+        with self._lock:
+            cur = self._conexao.execute(
+                "SELECT id, created_at, color, roll, server_seed FROM jogos ORDER BY created_at")
+            while True:
+                linhas = cur.fetchmany(lote)
+                if not linhas:
+                    break
+                colunas.estender(
+                    {'id': i, 'created_at': c, 'color': cor, 'roll': r, 'server_seed': s}
+                    for i, c, cor, r, s in linhas)
+        return colunas
+
+    def carregar_pendentes(self, intervalos=()):
+        """Só as rodadas fora de `intervalos` (ms), com a vizinha coberta de cada lado
+
+        A vizinha seguinte é a sucessora que confere o último elo pendente; a
+        anterior faz o trecho novo encostar no intervalo antigo. Retorna as
+        colunas e o maior rowid lido (o que entrar depois é conferido na gravação).
+        """
+        campos = "SELECT id, created_at, color, roll, server_seed FROM jogos"
+        limites = [None] + [ms for intervalo in unir_intervalos(intervalos) for ms in intervalo] + [None]
+        linhas, vistos = [], set()
+        with self._lock:
+            cur = self._conexao.cursor()
+            ultima_linha = self._ultima_linha(cur)
+            # Lacunas entre os intervalos: (fim do anterior, início do seguinte), abertas
+            for depois, antes in zip(limites[::2], limites[1::2]):
+                condicoes, parametros = [], []
+                if depois is not None:
+                    condicoes.append("created_at > ?")
+                    parametros.append(ms_para_iso(depois))
+                if antes is not None:
+                    condicoes.append("created_at < ?")
+                    parametros.append(ms_para_iso(antes))
+                filtro = " WHERE " + " AND ".join(condicoes) if condicoes else ""
+                pendentes = cur.execute(f"{campos}{filtro} ORDER BY created_at", parametros).fetchall()
+                if not pendentes:
+                    continue
+                anterior = seguinte = None
+                if depois is not None:
+                    anterior = cur.execute(f"{campos} WHERE created_at <= ? ORDER BY created_at DESC LIMIT 1",
+                                           (ms_para_iso(depois),)).fetchone()
+                if antes is not None:
+                    seguinte = cur.execute(f"{campos} WHERE created_at >= ? ORDER BY created_at LIMIT 1",
+                                           (ms_para_iso(antes),)).fetchone()
+                for linha in [anterior] + pendentes + [seguinte]:
+                    if linha is not None and linha[0] not in vistos:
+                        vistos.add(linha[0])
+                        linhas.append(linha)
+        colunas = HistoricoColunar(capacidade=len(linhas))
+        colunas.estender({'id': i, 'created_at': c, 'color': cor, 'roll': r, 'server_seed': s}
+                         for i, c, cor, r, s in linhas)
+        return colunas, ultima_linha
+
+    def contar_jogos(self):
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM jogos").fetchone()[0]
+
+    def _ler_estado(self, chave):
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT valor FROM estado WHERE chave = ?", (chave,)).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    # ===== ESCRITA =====
+
+    def registrar(self, jogos=(), previsoes=(), apostas=(), estado=None):
+        """Grava jogos, previsões e apostas novos e o estado atual numa única transação
+
+        Retorna o seq dado a cada previsão/aposta, na ordem recebida.
+        """
+        seqs = {}
+        jogos = [(j['id'], j['created_at'], j['color'], j['roll'], j.get('server_seed')) for j in jogos]
+        with self._lock, self._conexao:
+            cur = self._conexao.cursor()
+            if jogos:
+                desde_linha = self._ultima_linha(cur)
+                cur.executemany(
+                    "INSERT OR IGNORE INTO jogos (id, created_at, color, roll, server_seed) VALUES (?, ?, ?, ?, ?)",
+                    jogos)
+                self._reabrir_verificacao(cur, desde_linha)
+            for tabela, registros in (('previsoes', previsoes), ('apostas', apostas)):
+                linhas = [(_timestamp(r), _codificar_registro(r)) for r in registros]
+                cur.executemany(f"INSERT INTO {tabela} (timestamp, dados) VALUES (?, ?)", linhas)
+                # Dentro da transação (e do lock) os seq novos são os últimos e contíguos
+                ultimo = cur.execute(f"SELECT MAX(seq) FROM {tabela}").fetchone()[0] if linhas else 0
+                seqs[tabela] = list(range(ultimo - len(linhas) + 1, ultimo + 1))
+            if estado:
+                cur.executemany(
+                    "INSERT OR REPLACE INTO estado (chave, valor) VALUES (?, ?)",
+                    [(chave, json.dumps(valor)) for chave, valor in estado.items()])
+        return seqs
+
+    def importar_jogos(self, linhas):
+        """Tuplas (id, created_at, color, roll, server_seed) numa transação; devolve quantas eram novas"""
+        with self._lock, self._conexao:
+            cur = self._conexao.cursor()
+            desde_linha = self._ultima_linha(cur)
+            cur.executemany(
+                "INSERT OR IGNORE INTO jogos (id, created_at, color, roll, server_seed) VALUES (?, ?, ?, ?, ?)",
+                linhas)
+            importadas = cur.rowcount
+            self._reabrir_verificacao(cur, desde_linha)
+            return importadas
+
+    def resetar(self):
+        """Apaga jogos, previsões, apostas e contadores (mantém a marca de migração)"""
+        with self._lock, self._conexao:
+            self._conexao.execute("DELETE FROM jogos")
+            self._conexao.execute("DELETE FROM previsoes")
+            self._conexao.execute("DELETE FROM apostas")
+            self._conexao.execute("DELETE FROM estado WHERE chave != 'migrado_de'")
+            caminhos = [c for (c,) in self._conexao.execute("SELECT caminho FROM segmentos")]
+            self._conexao.execute("DELETE FROM segmentos")
+            self._conexao.execute("DELETE FROM verificacao_intervalos")
+            self._conexao.execute("DELETE FROM verificacao_falhas")
+        for caminho in caminhos:
+            if os.path.exists(caminho):
+                os.remove(caminho)
+
+    # ===== PAGINAÇÃO =====
+
+    def pagina(self, tabela, antes_de=None, tamanho=TAMANHO_PAGINA):
+        """Registros de `tabela` com seq < `antes_de`, do mais novo para o mais antigo
+
+        Cursor por chave (seq): cada página custa o mesmo não importa quantas
+        vieram antes. Quando o banco acaba, continua pelos segmentos arquivados,
+        abrindo só os que têm seq abaixo do cursor (seq_min/seq_max na tabela
+        `segmentos`) e parando assim que a página enche.
+        Retorna (registros, cursor da próxima página ou None no fim).
+        """
+        consulta = f"SELECT seq, dados FROM {tabela}"
+        parametros = []
+        if antes_de is not None:
+            consulta += " WHERE seq < ?"
+            parametros.append(antes_de)
+        with self._lock:
+            linhas = self._conexao.execute(
+                consulta + " ORDER BY seq DESC LIMIT ?", parametros + [tamanho]).fetchall()
+
+        if len(linhas) < tamanho:
+            consulta = "SELECT caminho, seq_max FROM segmentos WHERE tabela = ? AND seq_min IS NOT NULL"
+            parametros = [tabela]
+            if antes_de is not None:
+                consulta += " AND seq_min < ?"
+                parametros.append(antes_de)
+            with self._lock:
+                segmentos = self._conexao.execute(consulta + " ORDER BY seq_max DESC", parametros).fetchall()
+            for caminho, seq_max in segmentos:
+                # Segmento inteiro abaixo da página já completa: os demais também estão
+                if len(linhas) >= tamanho and seq_max < linhas[-1][0]:
+                    break
+                linhas += [(seq, dados) for seq, dados in ler_segmento(caminho)
+                           if antes_de is None or seq < antes_de]
+                linhas.sort(key=lambda linha: linha[0], reverse=True)
+                del linhas[tamanho:]
+
+        registros = [dict(_decodificar_registro(dados), seq=seq) for seq, dados in linhas]
+        cursor = linhas[-1][0] if len(linhas) >= tamanho else None
+        return registros, cursor
+
+    # ===== ARQUIVO (retenção) =====
+
+    def compactar(self, antes_de, diretorio):
+        """Move previsões e apostas anteriores a `antes_de` para segmentos diários comprimidos
+
+        Cada segmento é gravado (e reescrito de forma atômica, sem duplicar seq)
+        antes de as linhas saírem do banco; o resumo agregado fica na tabela
+        `segmentos`. Retorna quantos registros de cada tabela foram arquivados.
+        """
+        corte = antes_de.isoformat() if isinstance(antes_de, datetime) else str(antes_de)
+        arquivados = {}
+        for tabela in TABELAS:
+            with self._lock:
+                linhas = self._conexao.execute(
+                    f"SELECT seq, timestamp, dados FROM {tabela} WHERE timestamp < ? ORDER BY seq",
+                    (corte,)).fetchall()
+            por_periodo = {}
+            for seq, timestamp, dados in linhas:
+                por_periodo.setdefault(periodo_de(timestamp), []).append((seq, dados))
+
+            for periodo, novas in por_periodo.items():
+                caminho = caminho_segmento(diretorio, tabela, periodo)
+                todas = gravar_segmento(caminho, novas)
+                registros = [_decodificar_registro(dados) for _, dados in todas]
+                livro = LivroEstatisticas(**{tabela: registros})
+                instantes = sorted(_timestamp(r) for r in registros)
+                with self._lock, self._conexao:
+                    self._conexao.execute(
+                        "INSERT OR REPLACE INTO segmentos "
+                        "(tabela, periodo, caminho, registros, inicio, fim, resumo, seq_min, seq_max) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (tabela, periodo, caminho, len(registros), instantes[0], instantes[-1],
+                         json.dumps(getattr(livro, tabela), ensure_ascii=False), todas[0][0], todas[-1][0]))
+                    self._conexao.executemany(
+                        f"DELETE FROM {tabela} WHERE seq = ?", [(seq,) for seq, _ in novas])
+            arquivados[tabela] = len(linhas)
+        return arquivados
+
+    def resumo_arquivado(self):
+        """Totais por estratégia de tudo que está nos segmentos, no formato do LivroEstatisticas"""
+        resumo = {tabela: [] for tabela in TABELAS}
+        with self._lock:
+            for tabela, texto in self._conexao.execute("SELECT tabela, resumo FROM segmentos"):
+                resumo[tabela].append(json.loads(texto))
+        return resumo
+
+    def segmentos(self, tabela=None, inicio=None, fim=None):
+        """Segmentos (mais antigo primeiro) que cruzam o intervalo [inicio, fim)"""
+        consulta = "SELECT tabela, periodo, caminho, registros, inicio, fim FROM segmentos WHERE 1 = 1"
+        parametros = []
+        if tabela:
+            consulta += " AND tabela = ?"
+            parametros.append(tabela)
+        if inicio:
+            consulta += " AND fim >= ?"
+            parametros.append(_iso(inicio))
+        if fim:
+            consulta += " AND inicio < ?"
+            parametros.append(_iso(fim))
+        with self._lock:
+            linhas = self._conexao.execute(consulta + " ORDER BY periodo", parametros).fetchall()
+        campos = ('tabela', 'periodo', 'caminho', 'registros', 'inicio', 'fim')
+        return [dict(zip(campos, linha)) for linha in linhas]
+
+    def consultar(self, tabela, inicio=None, fim=None):
+        """Registros de `tabela` no intervalo [inicio, fim): primeiro os arquivados, depois os do banco"""
+        inicio, fim = _iso(inicio), _iso(fim)
+
+        def no_intervalo(timestamp):
+            return (inicio is None or timestamp >= inicio) and (fim is None or timestamp < fim)
+
+        for segmento in self.segmentos(tabela, inicio, fim):
+            for _, dados in ler_segmento(segmento['caminho']):
+                registro = _decodificar_registro(dados)
+                if no_intervalo(_timestamp(registro)):
+                    yield registro
+
+        consulta = f"SELECT dados FROM {tabela} WHERE 1 = 1"
+        parametros = []
+        if inicio:
+            consulta += " AND timestamp >= ?"
+            parametros.append(inicio)
+        if fim:
+            consulta += " AND timestamp < ?"
+            parametros.append(fim)
+        with self._lock:
+            linhas = self._conexao.execute(consulta + " ORDER BY seq", parametros).fetchall()
+        for (dados,) in linhas:
+            yield _decodificar_registro(dados)
+
+    # ===== VERIFICAÇÃO PROVABLY FAIR =====
+
+    def intervalos_verificados(self, semente_cliente=None):
+        """Intervalos [inicio_ms, fim_ms] de rodadas já conferidas com essa semente do cliente"""
+        with self._lock:
+            return self._conexao.execute(
+                "SELECT inicio_ms, fim_ms FROM verificacao_intervalos WHERE semente_cliente = ? ORDER BY inicio_ms",
+                (semente_cliente or '',)).fetchall()
+
+    def registrar_verificacao(self, cobertos, falhas, semente_cliente=None, verificados=(), desde_linha=None):
+        """Une `cobertos` aos intervalos verificados e troca as falhas dos trechos `verificados`
+
+        Rodadas inseridas depois da leitura (rowid > `desde_linha`) não entram:
+        ela e a anterior ficam fora, como faz o gatilho para os intervalos já gravados.
+        """
+        semente = semente_cliente or ''
+        with self._lock, self._conexao:
+            cur = self._conexao.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            if desde_linha is not None:
+                for anterior, nova in self._trechos_reabertos(cur, desde_linha):
+                    cobertos = recortar_intervalos(cobertos, anterior, nova)
+            atuais = cur.execute(
+                "SELECT inicio_ms, fim_ms FROM verificacao_intervalos WHERE semente_cliente = ?", (semente,)).fetchall()
+            cur.execute("DELETE FROM verificacao_intervalos WHERE semente_cliente = ?", (semente,))
+            cur.executemany(
+                "INSERT INTO verificacao_intervalos (semente_cliente, inicio_ms, fim_ms) VALUES (?, ?, ?)",
+                [(semente, inicio, fim) for inicio, fim in unir_intervalos(atuais + list(cobertos))])
+            # Falhas antigas dos trechos conferidos de novo (ex.: lacuna preenchida por importação)
+            cur.executemany("DELETE FROM verificacao_falhas WHERE timestamp_ms BETWEEN ? AND ?", verificados)
+            self._conexao.executemany(
+                "INSERT OR REPLACE INTO verificacao_falhas (id, tipo, timestamp_ms, detalhe) VALUES (?, ?, ?, ?)",
+                [(f['id'], f['tipo'], f['timestamp_ms'], f['detalhe']) for f in falhas])
+
+    @staticmethod
+    def _ultima_linha(cur):
+        # rowid só cresce (jogos nunca perdem linhas, só no resetar): marca o que é novo
+        return cur.execute("SELECT COALESCE(MAX(rowid), 0) FROM jogos").fetchone()[0]
+
+    @staticmethod
+    def _trechos_reabertos(cur, desde_linha):
+        """[anterior_ms, nova_ms] de cada rodada inserida depois de `desde_linha` (rowid)
+
+        A rodada nova e a anterior a ela, cujo elo mudou, voltam a pendentes.
+        """
+        trechos = []
+        for (criada,) in cur.execute("SELECT created_at FROM jogos WHERE rowid > ?", (desde_linha,)).fetchall():
+            anterior = cur.execute(
+                "SELECT created_at FROM jogos WHERE created_at < ? ORDER BY created_at DESC LIMIT 1",
+                (criada,)).fetchone()
+            trechos.append((iso_para_ms(anterior[0] if anterior else criada), iso_para_ms(criada)))
+        return trechos
+
+    def _reabrir_verificacao(self, cur, desde_linha):
+        """Rodadas inseridas (ex.: importadas) dentro de intervalos já verificados os reabrem"""
+        intervalos = cur.execute("SELECT semente_cliente, inicio_ms, fim_ms FROM verificacao_intervalos").fetchall()
+        if not intervalos:
+            return
+        primeira, ultima = cur.execute(
+            "SELECT MIN(created_at), MAX(created_at) FROM jogos WHERE rowid > ?", (desde_linha,)).fetchone()
+        if primeira is None:
+            return
+        anterior = cur.execute("SELECT created_at FROM jogos WHERE created_at < ? ORDER BY created_at DESC LIMIT 1",
+                               (primeira,)).fetchone()
+        inicio, fim = iso_para_ms(anterior[0] if anterior else primeira), iso_para_ms(ultima)
+        # Caso comum (rodadas ao vivo, depois de tudo que foi verificado): nada a reabrir
+        if not any(a <= fim and b >= inicio for _, a, b in intervalos):
+            return
+        por_semente = {}
+        for semente, a, b in intervalos:
+            por_semente.setdefault(semente, []).append((a, b))
+        for anterior, nova in self._trechos_reabertos(cur, desde_linha):
+            for semente, trechos in por_semente.items():
+                por_semente[semente] = recortar_intervalos(trechos, anterior, nova)
+        cur.execute("DELETE FROM verificacao_intervalos")
+        cur.executemany("INSERT INTO verificacao_intervalos (semente_cliente, inicio_ms, fim_ms) VALUES (?, ?, ?)",
+                        [(semente, a, b) for semente, trechos in por_semente.items() for a, b in trechos])
+
+    def situacao_verificacao(self, semente_cliente=None, limite_falhas=20):
+        """Rodadas cobertas, contagem de falhas por tipo e as falhas mais recentes"""
+        with self._lock:
+            cur = self._conexao.cursor()
+            intervalos = cur.execute(
+                "SELECT inicio_ms, fim_ms FROM verificacao_intervalos WHERE semente_cliente = ?",
+                (semente_cliente or '',)).fetchall()
+            por_tipo = dict(cur.execute("SELECT tipo, COUNT(*) FROM verificacao_falhas GROUP BY tipo"))
+            recentes = cur.execute(
+                "SELECT id, tipo, timestamp_ms, detalhe FROM verificacao_falhas "
+                "ORDER BY timestamp_ms DESC LIMIT ?", (limite_falhas,)).fetchall()
+            verificadas = sum(
+                cur.execute("SELECT COUNT(*) FROM jogos WHERE created_at BETWEEN ? AND ?",
+                            (ms_para_iso(inicio), ms_para_iso(fim))).fetchone()[0]
+                for inicio, fim in intervalos)
+        campos = ('id', 'tipo', 'timestamp_ms', 'detalhe')
+        return {
+            'verificadas': verificadas,
+            'falhas': por_tipo,
+            'recentes': [dict(zip(campos, linha)) for linha in recentes],
+        }
+
+    # ===== MIGRAÇÃO =====
+
+    def _migrar_segmentos(self):
+        """Bancos antigos: `segmentos` sem seq_min/seq_max; preenche lendo cada segmento uma vez"""
+        with self._lock:
+            colunas = {linha[1] for linha in self._conexao.execute("PRAGMA table_info(segmentos)")}
+            if 'seq_max' in colunas and not self._conexao.execute(
+                    "SELECT 1 FROM segmentos WHERE seq_min IS NULL LIMIT 1").fetchone():
+                return
+        with self._lock, self._conexao:
+            cur = self._conexao.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            colunas = {linha[1] for linha in cur.execute("PRAGMA table_info(segmentos)")}
+            for coluna in ('seq_min', 'seq_max'):
+                if coluna not in colunas:
+                    cur.execute(f"ALTER TABLE segmentos ADD COLUMN {coluna} INTEGER")
+            pendentes = cur.execute(
+                "SELECT tabela, periodo, caminho FROM segmentos WHERE seq_min IS NULL").fetchall()
+            for tabela, periodo, caminho in pendentes:
+                if not os.path.exists(caminho):
+                    continue
+                seqs = [seq for seq, _ in ler_segmento(caminho)]
+                if seqs:
+                    cur.execute("UPDATE segmentos SET seq_min = ?, seq_max = ? WHERE tabela = ? AND periodo = ?",
+                                (min(seqs), max(seqs), tabela, periodo))
+
+    def _migrar_autoincremento(self):
+        """Bancos antigos: seq sem AUTOINCREMENT volta a 1 quando compactar esvazia a tabela
+
+        Reconstrói previsoes/apostas com AUTOINCREMENT e põe o contador acima do
+        maior seq já usado, inclusive nos segmentos arquivados.
+        """
+        for tabela in TABELAS:
+            with self._lock:
+                sql = self._conexao.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,)).fetchone()[0]
+            if 'AUTOINCREMENT' in sql.upper():
+                continue
+            with self._lock, self._conexao:
+                cur = self._conexao.cursor()
+                cur.execute("BEGIN IMMEDIATE")
+                # Outro processo pode ter migrado enquanto esperávamos o lock de escrita
+                sql = cur.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,)).fetchone()[0]
+                if 'AUTOINCREMENT' in sql.upper():
+                    continue
+                arquivado = cur.execute(
+                    "SELECT COALESCE(MAX(seq_max), 0) FROM segmentos WHERE tabela = ?", (tabela,)).fetchone()[0]
+                cur.execute(f"ALTER TABLE {tabela} RENAME TO {tabela}_antiga")
+                cur.execute(f"DROP INDEX IF EXISTS idx_{tabela}_timestamp")
+                cur.execute(f"CREATE TABLE {tabela} (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                            "timestamp TEXT NOT NULL, dados TEXT NOT NULL)")
+                cur.execute(f"CREATE INDEX idx_{tabela}_timestamp ON {tabela} (timestamp)")
+                cur.execute(f"INSERT INTO {tabela} (seq, timestamp, dados) "
+                            f"SELECT seq, timestamp, dados FROM {tabela}_antiga ORDER BY seq")
+                cur.execute(f"DROP TABLE {tabela}_antiga")
+                maximo = max(arquivado, cur.execute(f"SELECT COALESCE(MAX(seq), 0) FROM {tabela}").fetchone()[0])
+                cur.execute("DELETE FROM sqlite_sequence WHERE name = ?", (tabela,))
+                cur.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (tabela, maximo))
+
+    def migrar_pickle(self, caminhos):
+        """Importa uma única vez o primeiro arquivo pickle legado encontrado"""
+        for caminho in caminhos:
+            if not os.path.exists(caminho):
+                continue
+            with open(caminho, 'rb') as f:
+                dados = pickle.load(f)
+
+            historico = [j for j in dados.get('historico', []) if 'id' in j]
+            historico.sort(key=lambda j: j['created_at'])
+            estado = {
+                chave: dados.get(chave, padrao) for chave, padrao in ESTADO_PADRAO.items()
+            }
+            estado['migrado_de'] = caminho
+            self.registrar(
+                jogos=historico,
+                previsoes=dados.get('previsoes', []),
+                apostas=dados.get('apostas', []),
+                estado=estado,
+            )
+            return caminho
+
+        self.registrar(estado={'migrado_de': ''})
+        return None
@@ -0,0 +1,111 @@
+# BLAZE IA - ARQUIVO DE SEGMENTOS (previsões e apostas antigas)
+"""Previsões e apostas mais antigas que o horizonte de retenção saem do banco
+e vão para segmentos diários comprimidos (gzip, uma linha `seq<TAB>registro JSON`).
+O banco guarda por segmento só o caminho, o intervalo e o resumo agregado
+(totais por estratégia), de modo que os totais do painel continuam completos
+sem carregar o arquivo.
+
+Uso:
+    python blaze_arquivo.py --db ia_data.db --compactar --dias 7
+    python blaze_arquivo.py --db ia_data.db --tabela apostas --de 2025-01-01 --ate 2025-02-01
+"""
+import argparse
+import gzip
+import os
+from datetime import datetime, timedelta
+
+# Registros mais antigos que isso saem do estado quente
+RETENCAO_DIAS = 7
+
+TABELAS = ('previsoes', 'apostas')
+
+
+def diretorio_padrao(caminho_db):
+    """ia_data.db -> ia_data_arquivo"""
+    return os.path.splitext(caminho_db)[0] + '_arquivo'
+
+
+def caminho_segmento(diretorio, tabela, periodo):
+    """Um arquivo por tabela e dia, agrupado em pastas por mês"""
+    return os.path.join(diretorio, tabela, periodo[:7], f'{tabela}-{periodo}.tsv.gz')
+
+
+def ler_segmento(caminho):
+    """(seq, registro em JSON) de cada linha do segmento"""
+    if not os.path.exists(caminho):
+        return
+    with gzip.open(caminho, 'rt', encoding='utf-8') as f:
+        for linha in f:
+            seq, _, dados = linha.rstrip('\n').partition('\t')
+            yield int(seq), dados
+
+
+def gravar_segmento(caminho, linhas):
+    """Junta (seq, dados) ao segmento existente sem duplicar linhas; troca o arquivo atomicamente
+
+    Uma linha igual a uma já arquivada (compactação interrompida antes de
+    apagar do banco) é ignorada; linhas diferentes com o mesmo seq, de bancos
+    antigos que reaproveitavam seq, são mantidas. Retorna todas as linhas do
+    segmento, em ordem de seq.
+    """
+    existentes = list(ler_segmento(caminho))
+    vistas = set(existentes)
+    ordenadas = sorted(existentes + [linha for linha in linhas if linha not in vistas],
+                       key=lambda linha: linha[0])
+
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = caminho + '.tmp'
+    with gzip.open(temporario, 'wt', encoding='utf-8') as f:
+        for seq, dados in ordenadas:
+            f.write(f'{seq}\t{dados}\n')
+    os.replace(temporario, caminho)
+    return ordenadas
+
+
+def periodo_de(timestamp):
+    """Partição diária a partir do timestamp ISO gravado no banco"""
+    return timestamp[:10]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compactação e consulta do arquivo de previsões/apostas")
+    parser.add_argument('--db', default='ia_data.db')
+    parser.add_argument('--compactar', action='store_true', help="arquiva o que passou do horizonte")
+    parser.add_argument('--dias', type=int, default=RETENCAO_DIAS, help="horizonte de retenção em dias")
+    parser.add_argument('--tabela', choices=TABELAS, default='apostas')
+    parser.add_argument('--de', type=datetime.fromisoformat, help="início (ISO) do relatório")
+    parser.add_argument('--ate', type=datetime.fromisoformat, help="fim (ISO, exclusivo) do relatório")
+    args = parser.parse_args()
+
+    from blaze_armazenamento import ArmazenamentoBlaze
+    from blaze_livro import LivroEstatisticas
+
+    armazenamento = ArmazenamentoBlaze(args.db)
+    if args.compactar:
+        corte = datetime.now() - timedelta(days=args.dias)
+        arquivados = armazenamento.compactar(corte, diretorio_padrao(args.db))
+        print(f"🗄️ Arquivados antes de {corte:%Y-%m-%d %H:%M}: "
+              + ", ".join(f"{tabela}={n}" for tabela, n in arquivados.items()))
+
+    segmentos = armazenamento.segmentos(args.tabela, args.de, args.ate)
+    print(f"📦 {len(segmentos)} segmentos de {args.tabela} "
+          f"({sum(s['registros'] for s in segmentos)} registros arquivados)")
+
+    livro = LivroEstatisticas()
+    registrar = livro.registrar_aposta if args.tabela == 'apostas' else livro.registrar_previsao
+    for registro in armazenamento.consultar(args.tabela, args.de, args.ate):
+        registrar(registro)
+
+    if args.tabela == 'apostas':
+        for metodo in ['TOTAL'] + livro.metodos():
+            r = livro.resumo_apostas(metodo)
+            print(f"{metodo:<32} {r['vitorias']:>6}/{r['total']:<6} R$ {r['lucro_total']:>+10.2f}  ROI {r['roi']:.1f}%")
+    else:
+        for metodo, totais in sorted(livro.previsoes.items(), key=lambda item: -item[1]['previsoes']):
+            acertos, verificadas = livro.precisao_previsoes(metodo)
+            taxa = f"{acertos / verificadas:.1%}" if verificadas else "-"
+            print(f"{metodo:<32} {totais['previsoes']:>7} previsões  {verificadas:>7} verificadas  {taxa}")
+
+
+if __name__ == '__main__':
+    main()
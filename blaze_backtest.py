@@ -0,0 +1,265 @@
+# BLAZE IA - BACKTEST VETORIZADO DA CASCATA DE ANÁLISE
+"""Reproduz analisar_padroes_avancada em todas as posições de um histórico real.
+
+Cada posição t usa como `dados` as últimas `janela_dados` rodadas até t (mais
+recente primeiro, como a API) e a previsão é comparada com a cor real de t+1.
+
+Uso:
+    python blaze_backtest.py --db ia_data.db
+    python blaze_backtest.py --db ia_data.db --verificar 5000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from blaze_analise import (
+    METODOS, METODO_INICIAL, METODO_SEQUENCIA_LONGA, METODO_SEQUENCIA_FORTE,
+    METODO_SEQUENCIA_MEDIA, METODO_TENDENCIA_RED, METODO_TENDENCIA_BLACK,
+    METODO_ZEBRA, METODO_ESTATISTICA_RED, METODO_ESTATISTICA_BLACK,
+    METODO_QUEBRA, METODO_MANUTENCAO, PARAMETROS_PADRAO, analisar_padroes_avancada,
+)
+
+# Quantidade de jogos que a API devolve por consulta
+JANELA_DADOS = 20
+
+
+def _contagem_acumulada(mascara):
+    """P[i] = quantidade de posições verdadeiras em mascara[:i]"""
+    return np.concatenate(([0], np.cumsum(mascara, dtype=np.int64)))
+
+
+def _comprimento_sequencia(quebra):
+    """Tamanho do trecho que termina em cada posição; quebra[i] inicia um trecho novo"""
+    indices = np.arange(len(quebra))
+    inicio = np.maximum.accumulate(np.where(quebra, indices, 0))
+    return indices - inicio + 1
+
+
+def preparar_historico(cores, janela_dados=JANELA_DADOS):
+    """Partes do backtest que não dependem dos parâmetros da análise"""
+    cores = np.asarray(cores, dtype=np.int8)
+    total = len(cores)
+    posicoes = np.arange(total)
+
+    # Tamanho de `dados` em cada posição
+    tamanho = np.minimum(posicoes + 1, janela_dados)
+
+    # Sequência comprimida só com vermelho/preto
+    valida = cores != 0
+    acum_validas = _contagem_acumulada(valida)
+    validas = cores[valida]
+    ultima = acum_validas[posicoes + 1] - 1   # índice em `validas` da cor mais recente
+
+    if len(validas):
+        mudou = np.concatenate(([True], validas[1:] != validas[:-1]))
+        repetiu = np.concatenate(([True], validas[1:] == validas[:-1]))
+        sequencia_validas = _comprimento_sequencia(mudou)
+        alternancia_validas = _comprimento_sequencia(repetiu)
+    else:
+        sequencia_validas = alternancia_validas = np.zeros(1, dtype=np.int64)
+        validas = np.zeros(1, dtype=np.int8)
+
+    indice = np.clip(ultima, 0, None)
+
+    # Estatística geral sobre todo o `dados`
+    acum_red = _contagem_acumulada(cores == 1)
+    acum_black = _contagem_acumulada(cores == 2)
+
+    return {
+        'cores': cores,
+        'posicoes': posicoes,
+        'tamanho': tamanho,
+        'acum_validas': acum_validas,
+        'validas': validas,
+        'ultima': ultima,
+        'cor_atual': validas[indice],
+        'sequencia': sequencia_validas[indice],
+        'alternancia': alternancia_validas[indice],
+        'count_red': acum_red[posicoes + 1] - acum_red[posicoes + 1 - tamanho],
+        'count_black': acum_black[posicoes + 1] - acum_black[posicoes + 1 - tamanho],
+    }
+
+
+def tabela_confianca(parametros):
+    """Confiança fixa de cada estratégia, na ordem de METODOS (tendências ficam 0)"""
+    p = dict(PARAMETROS_PADRAO, **(parametros or {}))
+    return np.array([
+        0.5, p['confianca_longa'], p['confianca_forte'], p['confianca_media'], 0.0, 0.0,
+        p['confianca_zebra'], p['confianca_estatistica'], p['confianca_estatistica'], 0.62, 0.58])
+
+
+def decidir(preparado, parametros=None, semente=None):
+    """Aplica a cascata com os parâmetros dados (padrão: PARAMETROS_PADRAO)"""
+    p = dict(PARAMETROS_PADRAO, **(parametros or {}))
+    posicoes, tamanho, ultima = preparado['posicoes'], preparado['tamanho'], preparado['ultima']
+    acum_validas, validas = preparado['acum_validas'], preparado['validas']
+    total = len(posicoes)
+
+    # Recorte dos últimos `janela` jogos
+    recorte = np.minimum(tamanho, p['janela'])
+    quantidade = acum_validas[posicoes + 1] - acum_validas[posicoes + 1 - recorte]
+    sequencia = np.minimum(preparado['sequencia'], quantidade)
+    alternancia = preparado['alternancia']
+    oposta = np.where(preparado['cor_atual'] == 1, 2, 1)
+
+    # Tendência temporal: mesma ordem de soma do código escalar
+    pesos = p['pesos']
+    peso_red = np.zeros(total)
+    peso_black = np.zeros(total)
+    for i, peso in enumerate(pesos):
+        ativo = i < np.minimum(quantidade, len(pesos))
+        cor_i = validas[np.clip(ultima - i, 0, None)]
+        peso_red += np.where(ativo & (cor_i == 1), peso, 0.0)
+        peso_black += np.where(ativo & (cor_i == 2), peso, 0.0)
+    diferenca = np.abs(peso_red - peso_black)
+    confianca_tendencia = np.minimum(0.80, 0.60 + diferenca / 10)
+
+    count_red, count_black = preparado['count_red'], preparado['count_black']
+    corte = p['corte_estatistica']
+    razao = p['razao_tendencia']
+
+    inicial = (tamanho < 5) | (quantidade < 3)
+    condicoes = [
+        inicial,
+        (quantidade >= 5) & (sequencia >= 5),
+        (quantidade >= 4) & (sequencia >= 4),
+        sequencia >= 3,
+        peso_red > peso_black * razao,
+        peso_black > peso_red * razao,
+        (quantidade >= 6) & (alternancia >= quantidade),
+        (count_red + count_black > corte) & (count_red > count_black),
+        count_red + count_black > corte,
+        sequencia >= 2,
+    ]
+    codigo = np.select(condicoes, [METODOS.index(m) for m in (
+        METODO_INICIAL, METODO_SEQUENCIA_LONGA, METODO_SEQUENCIA_FORTE,
+        METODO_SEQUENCIA_MEDIA, METODO_TENDENCIA_RED, METODO_TENDENCIA_BLACK,
+        METODO_ZEBRA, METODO_ESTATISTICA_RED, METODO_ESTATISTICA_BLACK,
+        METODO_QUEBRA)], default=METODOS.index(METODO_MANUTENCAO))
+
+    confianca = tabela_confianca(p)[codigo]
+    tendencia = (codigo == METODOS.index(METODO_TENDENCIA_RED)) | (codigo == METODOS.index(METODO_TENDENCIA_BLACK))
+    confianca[tendencia] = confianca_tendencia[tendencia]
+
+    rng = np.random.default_rng(semente)
+    previsao = np.select(
+        [codigo == METODOS.index(METODO_INICIAL),
+         (codigo == METODOS.index(METODO_TENDENCIA_RED)) | (codigo == METODOS.index(METODO_ESTATISTICA_RED)),
+         (codigo == METODOS.index(METODO_TENDENCIA_BLACK)) | (codigo == METODOS.index(METODO_ESTATISTICA_BLACK))],
+        [rng.integers(1, 3, size=total), 2, 1],
+        default=oposta,
+    ).astype(np.int8)
+
+    acertou = np.zeros(total, dtype=bool)
+    acertou[:-1] = previsao[:-1] == preparado['cores'][1:]
+
+    return {
+        'previsao': previsao,
+        'confianca': confianca,
+        'metodo': codigo.astype(np.int8),
+        'acertou': acertou,
+    }
+
+
+def backtest_vetorizado(cores, janela_dados=JANELA_DADOS, semente=None, parametros=None):
+    """Decisão da cascata para todas as posições de uma vez
+
+    cores: array de cores em ordem cronológica (0 branco, 1 vermelho, 2 preto).
+    Retorna arrays 'previsao', 'confianca', 'metodo' (índice em METODOS) e
+    'acertou' (comparado com a rodada seguinte; a última posição fica False).
+    """
+    return decidir(preparar_historico(cores, janela_dados), parametros, semente)
+
+
+def taxas_por_metodo(resultado):
+    """Taxa de acerto contra a cor real seguinte, por estratégia e no total"""
+    metodo = resultado['metodo'][:-1]
+    acertou = resultado['acertou'][:-1]
+    confianca = resultado['confianca'][:-1]
+    previsoes = np.bincount(metodo, minlength=len(METODOS))
+    acertos = np.bincount(metodo, weights=acertou, minlength=len(METODOS))
+    confianca_total = np.bincount(metodo, weights=confianca, minlength=len(METODOS))
+
+    taxas = {}
+    for codigo, nome in enumerate(METODOS):
+        if previsoes[codigo]:
+            taxas[nome] = {
+                'previsoes': int(previsoes[codigo]),
+                'acertos': int(acertos[codigo]),
+                'taxa': float(acertos[codigo] / previsoes[codigo]),
+                'confianca_media': float(confianca_total[codigo] / previsoes[codigo]),
+            }
+    total = len(metodo)
+    taxas['TOTAL'] = {
+        'previsoes': total,
+        'acertos': int(acertou.sum()),
+        'taxa': float(acertou.mean()) if total else 0.0,
+        'confianca_media': float(confianca.mean()) if total else 0.0,
+    }
+    return taxas
+
+
+def verificar_equivalencia(cores, janela_dados=JANELA_DADOS, amostras=2000, semente=0, parametros=None):
+    """Compara o backtest com analisar_padroes_avancada em posições sorteadas
+
+    Retorna a lista de divergências (vazia quando as decisões coincidem). A cor
+    prevista por ANÁLISE INICIAL é sorteada e por isso não é comparada.
+    """
+    cores = np.asarray(cores, dtype=np.int8)
+    resultado = backtest_vetorizado(cores, janela_dados, parametros=parametros)
+    rng = np.random.default_rng(semente)
+    posicoes = rng.choice(len(cores), size=min(amostras, len(cores)), replace=False)
+
+    divergencias = []
+    for t in posicoes:
+        inicio = max(0, t - janela_dados + 1)
+        dados = [{'color': int(c)} for c in cores[inicio:t + 1][::-1]]
+        esperado = analisar_padroes_avancada(dados, parametros)
+        obtido = {
+            'previsao': int(resultado['previsao'][t]),
+            'confianca': float(resultado['confianca'][t]),
+            'metodo': METODOS[resultado['metodo'][t]],
+        }
+        if esperado['metodo'] == METODO_INICIAL:
+            obtido['previsao'] = esperado['previsao']
+        if obtido != esperado:
+            divergencias.append({'posicao': int(t), 'esperado': esperado, 'obtido': obtido})
+    return divergencias
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest da análise de padrões sobre o histórico salvo")
+    parser.add_argument('--db', default='ia_data.db', help="banco SQLite com o histórico de jogos")
+    parser.add_argument('--janela', type=int, default=JANELA_DADOS, help="jogos por consulta (tamanho de `dados`)")
+    parser.add_argument('--verificar', type=int, default=0, metavar='N',
+                        help="compara N posições sorteadas com a função escalar")
+    parser.add_argument('--json', action='store_true', help="saída em JSON")
+    args = parser.parse_args()
+
+    from blaze_armazenamento import ArmazenamentoBlaze
+    cores = ArmazenamentoBlaze(args.db).carregar_colunas().cores
+
+    inicio = time.perf_counter()
+    taxas = taxas_por_metodo(backtest_vetorizado(cores, args.janela))
+    duracao = time.perf_counter() - inicio
+
+    if args.json:
+        print(json.dumps({'rodadas': len(cores), 'segundos': duracao, 'metodos': taxas}, ensure_ascii=False))
+    else:
+        print(f"📊 {len(cores)} rodadas em {duracao:.2f}s")
+        for nome, t in taxas.items():
+            print(f"{nome:<28} {t['previsoes']:>9} previsões  {t['taxa']:6.1%} acerto  "
+                  f"(confiança média {t['confianca_media']:.0%})")
+
+    if args.verificar:
+        divergencias = verificar_equivalencia(cores, args.janela, args.verificar)
+        if divergencias:
+            print(f"❌ {len(divergencias)} divergências com a função escalar, ex.: {divergencias[0]}")
+            raise SystemExit(1)
+        print(f"✅ {min(args.verificar, len(cores))} posições idênticas à função escalar")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+# BLAZE IA - BENCHMARKS DOS CAMINHOS QUENTES
+"""Mede análise, merge do histórico, persistência e agregações do painel sobre
+rodadas sintéticas (sem rede). Os resultados vão para um JSON comparável entre execuções.
+
+Uso:
+    python blaze_benchmark.py --saida bench_resultados.json
+    python blaze_benchmark.py --rapido --comparar bench_resultados.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from blaze_analise import AnalisadorIncremental, analisar_padroes_avancada
+from blaze_armazenamento import ArmazenamentoBlaze
+from blaze_colunar import HistoricoColunar
+from blaze_historico import HistoricoJogos
+from blaze_livro import LivroEstatisticas
+from blaze_painel import apostas_recentes, contar_cores, precisao_previsoes, resumo_apostas
+from blaze_sintetico import gerar_jogos, gerar_previsoes_e_apostas
+from blaze_transicoes import IndiceTransicoes
+
+TAMANHOS = {
+    'analise': (20, 100, 1000, 10000),
+    'merge': (100, 10000, 50000),
+    'persistencia': (1000, 10000, 50000),
+    'painel': (1000, 10000, 100000),
+}
+
+TAMANHOS_RAPIDOS = {
+    'analise': (20, 1000),
+    'merge': (100, 5000),
+    'persistencia': (1000, 5000),
+    'painel': (1000, 10000),
+}
+
+
+def medir(funcao, repeticoes=50, orcamento=2.0):
+    """Executa `funcao` até `repeticoes` vezes (ou até estourar o orçamento em segundos)"""
+    duracoes = []
+    limite = time.perf_counter() + orcamento
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        duracoes.append(time.perf_counter() - inicio)
+        if time.perf_counter() > limite:
+            break
+    duracoes.sort()
+    return {
+        'repeticoes': len(duracoes),
+        'mediana_us': statistics.median(duracoes) * 1e6,
+        'minimo_us': duracoes[0] * 1e6,
+        'p95_us': duracoes[min(len(duracoes) - 1, int(len(duracoes) * 0.95))] * 1e6,
+    }
+
+
+def bench_analise(tamanhos, jogos):
+    resultados = []
+    for n in tamanhos:
+        dados = list(reversed(jogos[-n:]))
+        cores = HistoricoColunar.de_jogos(jogos[-n:]).recentes()
+        resultados.append(('analise.lista', {'dados': n}, medir(lambda: analisar_padroes_avancada(dados))))
+        resultados.append(('analise.colunas', {'dados': n}, medir(lambda: analisar_padroes_avancada(cores))))
+
+    analisador = AnalisadorIncremental()
+    proximos = iter(jogos * 2)
+
+    def incremental():
+        analisador.alimentar([next(proximos)])
+        analisador.prever()
+    resultados.append(('analise.incremental', {}, medir(incremental, repeticoes=1000)))
+
+    transicoes = IndiceTransicoes.de_cores(HistoricoColunar.de_jogos(jogos).cores)
+    proximas = iter(jogos * 2)
+
+    def transicao():
+        transicoes.alimentar([next(proximas)])
+        transicoes.analisar()
+    resultados.append(('analise.transicoes', {'k': transicoes.k_maximo}, medir(transicao, repeticoes=1000)))
+    return resultados
+
+
+def bench_merge(tamanhos, jogos):
+    """Lote de 20 jogos da API (1 novo) contra históricos de tamanhos crescentes"""
+    resultados = []
+    for n in tamanhos:
+        base, extras = jogos[:n], jogos[n:]
+        historico = HistoricoJogos(base, limite=n + len(extras))
+        posicao = [n]
+
+        def merge_indexado():
+            fim = posicao[0] + 1
+            historico.adicionar(reversed(jogos[fim - 20:fim]))
+            posicao[0] = fim
+        resultados.append(('merge.indexado', {'historico': n}, medir(merge_indexado, repeticoes=200)))
+
+        if n <= 10000:
+            lista = list(base)
+            posicao_lista = [n]
+
+            def merge_lista():
+                fim = posicao_lista[0] + 1
+                for jogo in reversed(jogos[fim - 20:fim]):
+                    if jogo not in lista:
+                        lista.append(jogo)
+                posicao_lista[0] = fim
+            resultados.append(('merge.lista_original', {'historico': n}, medir(merge_lista, repeticoes=50)))
+    return resultados
+
+
+def bench_persistencia(tamanhos, jogos, diretorio):
+    from blaze_motor import BlazeIA_Final
+
+    resultados = []
+    for n in tamanhos:
+        caminho = os.path.join(diretorio, f'bench_{n}.db')
+        previsoes, apostas = gerar_previsoes_e_apostas(n, semente=n)
+        ArmazenamentoBlaze(caminho).registrar(jogos=jogos[:n], previsoes=previsoes, apostas=apostas,
+                                               estado={'saldo': 1000.0})
+
+        resultados.append(('persistencia.carregar', {'registros': n},
+                           medir(lambda: BlazeIA_Final(caminho_db=caminho), repeticoes=5, orcamento=10.0)))
+
+        ia = BlazeIA_Final(caminho_db=caminho)
+        extras_previsoes, extras_apostas = gerar_previsoes_e_apostas(500, semente=n + 1)
+        proximos = iter(zip(jogos[n:], extras_previsoes, extras_apostas))
+
+        def salvar():
+            jogo, previsao, aposta = next(proximos)
+            ia.registrar_jogos([jogo])
+            ia.previsoes.append(previsao)
+            ia.apostas.append(aposta)
+            ia.salvar_dados()
+        resultados.append(('persistencia.salvar', {'registros': n}, medir(salvar, repeticoes=200)))
+    return resultados
+
+
+def bench_painel(tamanhos, jogos):
+    resultados = []
+    for n in tamanhos:
+        previsoes, apostas = gerar_previsoes_e_apostas(n, semente=n)
+        agora = apostas[-1]['timestamp'] if apostas else datetime.now()
+        cores = HistoricoColunar.de_jogos(jogos[-min(n, len(jogos)):]).cores
+        resultados.append(('painel.resumo_apostas', {'apostas': len(apostas)}, medir(lambda: resumo_apostas(apostas))))
+        resultados.append(('painel.apostas_recentes', {'apostas': len(apostas)},
+                           medir(lambda: apostas_recentes(apostas, agora))))
+        resultados.append(('painel.precisao', {'previsoes': n}, medir(lambda: precisao_previsoes(previsoes))))
+        resultados.append(('painel.contar_cores', {'jogos': len(cores)}, medir(lambda: contar_cores(cores))))
+
+        livro = LivroEstatisticas(previsoes, apostas)
+        resultados.append(('painel.livro.resumo_apostas', {'apostas': len(apostas)}, medir(livro.resumo_apostas)))
+        resultados.append(('painel.livro.apostas_recentes', {'apostas': len(apostas)},
+                           medir(lambda: livro.apostas_recentes(agora))))
+        resultados.append(('painel.livro.precisao', {'previsoes': n}, medir(livro.precisao_previsoes)))
+    return resultados
+
+
+def executar(tamanhos, semente=0):
+    maior = max(max(v) for v in tamanhos.values())
+    jogos = list(gerar_jogos(maior + 1000, semente=semente))
+
+    resultados = []
+    resultados += bench_analise(tamanhos['analise'], jogos)
+    resultados += bench_merge(tamanhos['merge'], jogos)
+    with tempfile.TemporaryDirectory() as diretorio:
+        anterior = os.getcwd()
+        # O motor procura pickles legados no diretório atual
+        os.chdir(diretorio)
+        try:
+            resultados += bench_persistencia(tamanhos['persistencia'], jogos, diretorio)
+        finally:
+            os.chdir(anterior)
+    resultados += bench_painel(tamanhos['painel'], jogos)
+
+    return {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'semente': semente,
+        'resultados': [dict(nome=nome, parametros=parametros, **medidas)
+                       for nome, parametros, medidas in resultados],
+    }
+
+
+def _chave(resultado):
+    return resultado['nome'], json.dumps(resultado['parametros'], sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks da Blaze IA sobre rodadas sintéticas")
+    parser.add_argument('--saida', default='bench_resultados.json', help="arquivo JSON de resultados")
+    parser.add_argument('--rapido', action='store_true', help="tamanhos menores")
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--comparar', metavar='JSON', help="resultado anterior para comparação")
+    args = parser.parse_args()
+
+    relatorio = executar(TAMANHOS_RAPIDOS if args.rapido else TAMANHOS, args.semente)
+
+    anteriores = {}
+    if args.comparar and os.path.exists(args.comparar):
+        with open(args.comparar) as f:
+            anteriores = {_chave(r): r for r in json.load(f)['resultados']}
+
+    for r in relatorio['resultados']:
+        parametros = ' '.join(f"{k}={v}" for k, v in r['parametros'].items())
+        linha = f"{r['nome']:<28} {parametros:<20} {r['mediana_us']:>12.1f} µs (p95 {r['p95_us']:.1f})"
+        anterior = anteriores.get(_chave(r))
+        if anterior:
+            linha += f"  x{r['mediana_us'] / anterior['mediana_us']:.2f} vs anterior"
+        print(linha)
+
+    with open(args.saida, 'w') as f:
+        json.dump(relatorio, f, indent=2, ensure_ascii=False)
+    print(f"💾 Resultados em {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# BLAZE IA - COLETOR COMPARTILHADO EM SEGUNDO PLANO
+import asyncio
+import threading
+import time
+
+from blaze_agendador import AgendadorRodadas
+
+
+class ColetorCompartilhado:
+    """Uma única thread consulta a API e publica o último snapshot para todas as sessões
+
+    As sessões só leem `snapshot()`, sem I/O de rede no caminho de renderização,
+    então o tráfego para a API não cresce com o número de dashboards abertos.
+    Com `alinhar_rodadas` as buscas seguem o AgendadorRodadas (logo após cada
+    rodada prevista); sem ele, a cada `intervalo` segundos.
+    """
+
+    def __init__(self, buscar, intervalo=5.0, alinhar_rodadas=True):
+        self.buscar = buscar
+        self.intervalo = intervalo
+        self.agendador = AgendadorRodadas(self._buscar, publicar=self._publicar) if alinhar_rodadas else None
+        self._condicao = threading.Condition()
+        self._parar = threading.Event()
+        self._thread = None
+        self._snapshot = {
+            'dados': None,          # última lista de jogos obtida com sucesso
+            'recebido_em': None,    # time.time() da última resposta válida
+            'erro': None,           # mensagem do último erro (None se a última busca deu certo)
+            'versao': 0,            # incrementa quando chega um jogo novo
+        }
+
+    def iniciar(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._executar, name='blaze-coletor', daemon=True)
+            self._thread.start()
+        return self
+
+    def parar(self, timeout=None):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def snapshot(self):
+        with self._condicao:
+            return dict(self._snapshot)
+
+    def aguardar(self, timeout=None, versao_minima=1, parar_em_erro=True):
+        """Bloqueia até existir um snapshot com a versão pedida (ou um erro)"""
+        with self._condicao:
+            self._condicao.wait_for(
+                lambda: (self._snapshot['versao'] >= versao_minima
+                         or (parar_em_erro and self._snapshot['erro'] is not None)),
+                timeout)
+            return dict(self._snapshot)
+
+    def segundos_ate_proxima(self):
+        """Tempo até a próxima busca prevista"""
+        if self.agendador is not None:
+            return self.agendador.segundos_ate_proxima()
+        recebido_em = self._snapshot['recebido_em']
+        return max(0.0, recebido_em + self.intervalo - time.time()) if recebido_em else 0.0
+
+    def atualizar(self):
+        """Executa uma busca e publica o resultado"""
+        try:
+            dados = self._buscar()
+        except Exception:
+            return
+        self._publicar(dados)
+
+    def _buscar(self):
+        try:
+            return self.buscar()
+        except Exception as e:
+            with self._condicao:
+                self._snapshot['erro'] = str(e)
+                self._condicao.notify_all()
+            raise
+
+    def _publicar(self, dados):
+        with self._condicao:
+            anterior = self._snapshot['dados']
+            novo = not anterior or anterior[0].get('id') != dados[0].get('id')
+            self._snapshot.update(
+                dados=dados,
+                recebido_em=time.time(),
+                erro=None,
+                versao=self._snapshot['versao'] + (1 if novo else 0),
+            )
+            self._condicao.notify_all()
+
+    def _executar(self):
+        if self.agendador is not None:
+            asyncio.run(self._executar_alinhado())
+            return
+        while not self._parar.is_set():
+            self.atualizar()
+            self._parar.wait(self.intervalo)
+
+    async def _executar_alinhado(self):
+        # O agendador dorme até a próxima rodada (até ~30s): parar() cancela a espera
+        tarefa = asyncio.ensure_future(self.agendador.executar(parar=self._parar))
+        while not tarefa.done():
+            if self._parar.is_set():
+                tarefa.cancel()
+            await asyncio.wait({tarefa}, timeout=0.1)
@@ -0,0 +1,170 @@
+# BLAZE IA - HISTÓRICO EM COLUNAS (NumPy)
+from datetime import datetime, timezone
+
+import numpy as np
+
+TAMANHO_ID = 16     # ids da Blaze têm 10 caracteres
+TAMANHO_SEED = 32   # server_seed: 64 hex -> 32 bytes
+
+
+def iso_para_ms(texto):
+    """'2025-11-26T17:36:33.344Z' -> milissegundos desde a época (UTC)"""
+    instante = datetime.fromisoformat(texto.replace('Z', '+00:00'))
+    if instante.tzinfo is None:
+        instante = instante.replace(tzinfo=timezone.utc)
+    return int(round(instante.timestamp() * 1000))
+
+
+def ms_para_iso(ms):
+    instante = datetime.fromtimestamp(ms // 1000, tz=timezone.utc)
+    return instante.strftime('%Y-%m-%dT%H:%M:%S') + f'.{ms % 1000:03d}Z'
+
+
+class HistoricoColunar:
+    """Jogos em arrays contíguos: ~58 bytes por rodada em vez de um dict por jogo"""
+
+    def __init__(self, capacidade=1024):
+        capacidade = max(1, capacidade)
+        self._n = 0
+        self._cores = np.zeros(capacidade, dtype=np.int8)
+        self._rolls = np.zeros(capacidade, dtype=np.int8)
+        self._timestamps = np.zeros(capacidade, dtype=np.int64)
+        self._ids = np.zeros(capacidade, dtype=f'S{TAMANHO_ID}')
+        self._seeds = np.zeros(capacidade, dtype=f'S{TAMANHO_SEED}')
+
+    @classmethod
+    def de_jogos(cls, jogos):
+        jogos = list(jogos)
+        colunas = cls(capacidade=len(jogos))
+        colunas.estender(jogos)
+        return colunas
+
+    def __len__(self):
+        return self._n
+
+    # ===== VIEWS (sem cópia) =====
+
+    @property
+    def cores(self):
+        return self._cores[:self._n]
+
+    @property
+    def rolls(self):
+        return self._rolls[:self._n]
+
+    @property
+    def timestamps(self):
+        return self._timestamps[:self._n]
+
+    @property
+    def ids(self):
+        return self._ids[:self._n]
+
+    @property
+    def seeds(self):
+        return self._seeds[:self._n]
+
+    @property
+    def nbytes(self):
+        """Memória ocupada pelas linhas em uso"""
+        return self._n * (1 + 1 + 8 + TAMANHO_ID + TAMANHO_SEED)
+
+    def recentes(self, quantidade=None):
+        """Cores do mais recente para o mais antigo (ordem da API), sem cópia"""
+        invertidas = self.cores[::-1]
+        return invertidas if quantidade is None else invertidas[:quantidade]
+
+    def fatia(self, inicio=None, fim=None):
+        """Novo HistoricoColunar que compartilha a memória do intervalo pedido"""
+        intervalo = slice(inicio, fim)
+        parte = HistoricoColunar.__new__(HistoricoColunar)
+        parte._cores = self.cores[intervalo]
+        parte._rolls = self.rolls[intervalo]
+        parte._timestamps = self.timestamps[intervalo]
+        parte._ids = self.ids[intervalo]
+        parte._seeds = self.seeds[intervalo]
+        # Capacidade igual ao tamanho: qualquer append realoca e não toca o original
+        parte._n = len(parte._cores)
+        return parte
+
+    # ===== ESCRITA =====
+
+    def adicionar(self, jogo):
+        self.estender([jogo])
+
+    def estender(self, jogos):
+        """Acrescenta jogos mantendo as colunas em ordem de created_at
+
+        Retorna a posição da primeira linha nova. Se ela ficar antes do tamanho
+        anterior, chegou rodada atrasada e as linhas dali em diante mudaram de lugar.
+        """
+        jogos = list(jogos)
+        quantidade = len(jogos)
+        if not quantidade:
+            return self._n
+        self._garantir_capacidade(self._n + quantidade)
+
+        inicio, fim = self._n, self._n + quantidade
+        self._cores[inicio:fim] = [j['color'] for j in jogos]
+        self._rolls[inicio:fim] = [j['roll'] for j in jogos]
+        self._timestamps[inicio:fim] = [iso_para_ms(j['created_at']) for j in jogos]
+        self._ids[inicio:fim] = [self._codificar_id(j['id']) for j in jogos]
+        self._seeds[inicio:fim] = [bytes.fromhex(j.get('server_seed') or '') for j in jogos]
+        self._n = fim
+
+        novos = self._timestamps[inicio:fim]
+        if (inicio and novos.min() < self._timestamps[inicio - 1]) or np.any(novos[1:] < novos[:-1]):
+            return self._ordenar_cauda(inicio)
+        return inicio
+
+    def _ordenar_cauda(self, inicio):
+        """Rodada atrasada (raro): reordena só a partir de onde a mais antiga das novas entra"""
+        posicao = int(np.searchsorted(self._timestamps[:inicio], self._timestamps[inicio:self._n].min(),
+                                      side='right'))
+        # Estável: em empate de created_at quem já estava continua antes
+        ordem = posicao + np.argsort(self._timestamps[posicao:self._n], kind='stable')
+        for nome in ('_cores', '_rolls', '_timestamps', '_ids', '_seeds'):
+            array = getattr(self, nome)
+            array[posicao:self._n] = array[ordem]
+        return posicao
+
+    def _garantir_capacidade(self, necessario):
+        capacidade = len(self._cores)
+        if necessario <= capacidade:
+            return
+        # Fatias vazias têm capacidade 0: dobrar zero nunca chega lá
+        capacidade = max(1, capacidade)
+        while capacidade < necessario:
+            capacidade *= 2
+        for nome in ('_cores', '_rolls', '_timestamps', '_ids', '_seeds'):
+            antigo = getattr(self, nome)
+            novo = np.zeros(capacidade, dtype=antigo.dtype)
+            novo[:self._n] = antigo[:self._n]
+            setattr(self, nome, novo)
+
+    @staticmethod
+    def _codificar_id(jogo_id):
+        codificado = jogo_id.encode('ascii')
+        if len(codificado) > TAMANHO_ID:
+            raise ValueError(f"id de jogo maior que {TAMANHO_ID} bytes: {jogo_id!r}")
+        return codificado
+
+    # ===== CONVERSÃO =====
+
+    def jogo(self, indice):
+        """Reconstrói o dict original de uma linha (índices negativos contam do fim)"""
+        if indice < 0:
+            indice += self._n
+        if not 0 <= indice < self._n:
+            raise IndexError(f"jogo {indice} fora do histórico ({self._n} jogos)")
+        seed = bytes(self._seeds[indice])
+        return {
+            'id': self._ids[indice].decode('ascii'),
+            'created_at': ms_para_iso(int(self._timestamps[indice])),
+            'color': int(self._cores[indice]),
+            'roll': int(self._rolls[indice]),
+            'server_seed': seed.ljust(TAMANHO_SEED, b'\0').hex() if seed else '',
+        }
+
+    def para_jogos(self):
+        return [self.jogo(i) for i in range(self._n)]
@@ -0,0 +1,122 @@
+# BLAZE IA - HISTÓRICO INDEXADO POR ID
+
+# Limite padrão de jogos mantidos em memória
+HISTORICO_MAXIMO = 50000
+
+
+class HistoricoJogos:
+    """Histórico ordenado por created_at com deduplicação O(1) pelo id do jogo"""
+
+    def __init__(self, jogos=(), limite=HISTORICO_MAXIMO):
+        self.limite = limite
+        self._jogos = {}      # id -> jogo
+        self._posicao = {}    # id -> posição absoluta na ordem temporal
+        self._ids = []        # ids em ordem de created_at (a partir de _inicio)
+        self._inicio = 0      # primeiro índice válido de _ids
+        self._base = 0        # posição absoluta de _ids[0]
+        self.adicionar(jogos)
+
+    def __len__(self):
+        return len(self._jogos)
+
+    def __contains__(self, item):
+        if isinstance(item, dict):
+            item = item.get('id')
+        return item in self._jogos
+
+    def __iter__(self):
+        """Itera do jogo mais antigo para o mais recente"""
+        for jogo_id in self._ids[self._inicio:]:
+            yield self._jogos[jogo_id]
+
+    def __getitem__(self, jogo_id):
+        return self._jogos[jogo_id]
+
+    def get(self, jogo_id, padrao=None):
+        return self._jogos.get(jogo_id, padrao)
+
+    @property
+    def ultimo(self):
+        """Jogo mais recente ou None"""
+        if len(self._ids) > self._inicio:
+            return self._jogos[self._ids[-1]]
+        return None
+
+    def adicionar(self, jogos):
+        """Insere apenas os jogos ainda não vistos e retorna os novos em ordem de created_at"""
+        novos = []
+        vistos = set()
+        for jogo in jogos:
+            jogo_id = jogo['id']
+            if jogo_id not in self._jogos and jogo_id not in vistos:
+                vistos.add(jogo_id)
+                novos.append(jogo)
+
+        if not novos:
+            return novos
+
+        novos.sort(key=lambda j: j['created_at'])
+        ultimo = self.ultimo
+
+        for jogo in novos:
+            self._jogos[jogo['id']] = jogo
+
+        if ultimo is None or novos[0]['created_at'] >= ultimo['created_at']:
+            # Caso comum: jogos novos chegam depois de todo o histórico
+            for jogo in novos:
+                self._posicao[jogo['id']] = self._base + len(self._ids)
+                self._ids.append(jogo['id'])
+        else:
+            # Jogo atrasado: reordena tudo (raro)
+            self._reordenar()
+
+        self._aplicar_limite()
+        return novos
+
+    def recentes(self, quantidade=None):
+        """Jogos do mais recente para o mais antigo (mesma ordem da API)"""
+        ids = self._ids[self._inicio:]
+        if quantidade is not None:
+            ids = ids[-quantidade:] if quantidade > 0 else []
+        return [self._jogos[jogo_id] for jogo_id in reversed(ids)]
+
+    def desde(self, jogo_id):
+        """Jogos posteriores a jogo_id, em ordem de created_at"""
+        posicao = self._posicao.get(jogo_id)
+        if posicao is None:
+            return list(self)
+        indice = posicao - self._base + 1
+        return [self._jogos[i] for i in self._ids[indice:]]
+
+    def para_lista(self):
+        return list(self)
+
+    def limpar(self):
+        self._jogos.clear()
+        self._posicao.clear()
+        self._ids = []
+        self._inicio = 0
+        self._base = 0
+
+    def _reordenar(self):
+        ordenados = sorted(self._jogos.values(), key=lambda j: j['created_at'])
+        self._ids = [jogo['id'] for jogo in ordenados]
+        self._inicio = 0
+        self._base = 0
+        self._posicao = {jogo_id: self._base + i for i, jogo_id in enumerate(self._ids)}
+
+    def _aplicar_limite(self):
+        excesso = len(self._jogos) - self.limite
+        if excesso <= 0:
+            return
+
+        for jogo_id in self._ids[self._inicio:self._inicio + excesso]:
+            del self._jogos[jogo_id]
+            del self._posicao[jogo_id]
+        self._inicio += excesso
+
+        # Compacta a lista de ids quando metade dela já foi descartada
+        if self._inicio > len(self._ids) // 2:
+            self._base += self._inicio
+            self._ids = self._ids[self._inicio:]
+            self._inicio = 0
@@ -0,0 +1,221 @@
+# BLAZE IA - IMPORTADOR DE HISTÓRICO (dumps JSONL / CSV)
+"""Importa em streaming arquivos grandes de rodadas para o banco SQLite.
+
+O arquivo é lido por mmap (ou gzip em fluxo, para .gz) linha a linha e vai
+para o banco em lotes de tamanho fixo: a memória não cresce com o tamanho do
+arquivo. Cada rodada é validada (id, created_at ISO, cor 0-2, roll 0-14 e
+coerente com a cor, server_seed hex opcional), o created_at é normalizado
+para o formato da API e cada lote é ordenado por created_at antes do INSERT
+OR IGNORE, que descarta ids já existentes. A ordem global vem do índice de
+created_at do banco.
+
+Formatos:
+    JSONL: um jogo por linha no formato da API ({"id", "created_at", "color", "roll", "server_seed"})
+    CSV:   cabeçalho com as colunas id, created_at, color, roll e (opcional) server_seed
+
+Uso:
+    python blaze_importador.py historico.jsonl --db ia_data.db
+    python blaze_importador.py historico.csv.gz --lote 200000
+    python blaze_importador.py --gerar dump.jsonl 1000000
+"""
+import argparse
+import csv
+import gzip
+import json
+import mmap
+import os
+import re
+import string
+import time
+from collections import Counter
+
+from blaze_colunar import TAMANHO_ID, iso_para_ms, ms_para_iso
+from blaze_sintetico import cor_do_roll, gerar_jogos
+
+TAMANHO_LOTE = 100000
+FORMATOS = ('jsonl', 'csv')
+CAMPOS_CSV = ('id', 'created_at', 'color', 'roll', 'server_seed')
+
+HEXADECIMAL = frozenset(string.hexdigits)
+
+# created_at já no formato da API ('2025-11-26T17:36:33.344Z') dispensa o parse de data
+FORMATO_API = re.compile(r'\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}Z\Z')
+
+_decodificar_json = json.JSONDecoder().decode
+
+
+class RodadaInvalida(ValueError):
+    """Rodada do dump que não pode ir para o banco (o motivo vai na mensagem)"""
+
+
+def formato_do_arquivo(caminho):
+    """'historico.csv.gz' -> 'csv'; qualquer outra coisa é JSONL"""
+    nome = caminho[:-3] if caminho.endswith('.gz') else caminho
+    return 'csv' if nome.lower().endswith('.csv') else 'jsonl'
+
+
+def ler_linhas(caminho):
+    """Linhas (bytes) do arquivo; mmap quando possível, gzip em fluxo para .gz"""
+    if caminho.endswith('.gz'):
+        with gzip.open(caminho, 'rb') as f:
+            yield from f
+        return
+    with open(caminho, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            if hasattr(mapa, 'madvise'):
+                mapa.madvise(mmap.MADV_SEQUENTIAL)
+            yield from iter(mapa.readline, b'')
+
+
+def registros_jsonl(linhas):
+    """Um registro por linha; linha que não é JSON UTF-8 vira None (rodada inválida)"""
+    for linha in linhas:
+        if linha.strip():
+            try:
+                yield _decodificar_json(linha.decode('utf-8'))
+            except (UnicodeDecodeError, ValueError):
+                yield None
+
+
+def registros_csv(linhas):
+    """Dict por linha pelo cabeçalho; linha que não é UTF-8 vira None (rodada inválida)"""
+    invalidas = set()
+
+    def textos():
+        for numero, linha in enumerate(linhas, 1):
+            try:
+                yield linha.decode('utf-8')
+            except UnicodeDecodeError:
+                invalidas.add(numero)
+                yield linha.decode('utf-8', 'replace')
+
+    leitor = csv.reader(textos())
+    cabecalho = [campo.strip() for campo in next(leitor, [])]
+    faltando = set(CAMPOS_CSV[:4]) - set(cabecalho)
+    if faltando:
+        raise ValueError(f"CSV sem as colunas: {', '.join(sorted(faltando))}")
+    for campos in leitor:
+        if invalidas and leitor.line_num in invalidas:
+            invalidas.discard(leitor.line_num)
+            yield None
+        elif campos:
+            yield dict(zip(cabecalho, campos))
+
+
+def validar(registro):
+    """Registro do dump -> tupla (id, created_at, color, roll, server_seed) pronta para o banco"""
+    if not isinstance(registro, dict):
+        raise RodadaInvalida('formato')
+    jogo_id = str(registro.get('id') or '').strip()
+    # As colunas guardam o id em ASCII com até TAMANHO_ID bytes
+    if not jogo_id or not jogo_id.isascii() or len(jogo_id) > TAMANHO_ID:
+        raise RodadaInvalida('id')
+    created_at = registro.get('created_at')
+    if not isinstance(created_at, str) or not FORMATO_API.match(created_at):
+        try:
+            created_at = ms_para_iso(iso_para_ms(str(created_at)))
+        except ValueError:
+            raise RodadaInvalida('created_at')
+    try:
+        cor, roll = int(registro['color']), int(registro['roll'])
+    except (KeyError, TypeError, ValueError):
+        raise RodadaInvalida('color/roll')
+    if not 0 <= roll <= 14 or cor != cor_do_roll(roll):
+        raise RodadaInvalida('color/roll')
+    seed = registro.get('server_seed') or None
+    if seed is not None and (not isinstance(seed, str) or len(seed) != 64 or not HEXADECIMAL.issuperset(seed)):
+        raise RodadaInvalida('server_seed')
+    return jogo_id, created_at, cor, roll, seed
+
+
+def importar(caminho, armazenamento, formato=None, tamanho_lote=TAMANHO_LOTE, progresso=None):
+    """Importa o dump em lotes; devolve contagens, motivos de rejeição e taxa"""
+    inicio = time.perf_counter()
+    formato = formato or formato_do_arquivo(caminho)
+    ler = registros_csv if formato == 'csv' else registros_jsonl
+    lidas = importadas = 0
+    invalidas = Counter()
+    lote = {}
+
+    def gravar():
+        nonlocal importadas
+        importadas += armazenamento.importar_jogos(sorted(lote.values(), key=lambda linha: linha[1]))
+        lote.clear()
+        if progresso:
+            progresso(lidas, importadas, time.perf_counter() - inicio)
+
+    for registro in ler(ler_linhas(caminho)):
+        lidas += 1
+        try:
+            linha = validar(registro)
+        except RodadaInvalida as e:
+            invalidas[str(e)] += 1
+            continue
+        lote[linha[0]] = linha
+        if len(lote) >= tamanho_lote:
+            gravar()
+    if lote:
+        gravar()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        'lidas': lidas,
+        'importadas': importadas,
+        'duplicadas': lidas - importadas - sum(invalidas.values()),
+        'invalidas': dict(invalidas),
+        'segundos': segundos,
+        'rodadas_por_segundo': lidas / segundos if segundos else 0.0,
+        'mb_por_segundo': os.path.getsize(caminho) / 1e6 / segundos if segundos else 0.0,
+    }
+
+
+def gerar_dump(caminho, quantidade, semente=0):
+    """Dump sintético (JSONL ou CSV, pela extensão) para testar a importação sem rede"""
+    abrir = gzip.open if caminho.endswith('.gz') else open
+    with abrir(caminho, 'wt', encoding='utf-8', newline='') as f:
+        if formato_do_arquivo(caminho) == 'csv':
+            escritor = csv.DictWriter(f, fieldnames=CAMPOS_CSV)
+            escritor.writeheader()
+            escritor.writerows(gerar_jogos(quantidade, semente))
+        else:
+            for jogo in gerar_jogos(quantidade, semente):
+                f.write(json.dumps(jogo) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importação em lote de dumps de rodadas")
+    parser.add_argument('arquivo', nargs='?', help="dump JSONL ou CSV (pode ser .gz)")
+    parser.add_argument('--db', default='ia_data.db')
+    parser.add_argument('--formato', choices=FORMATOS, help="padrão: pela extensão do arquivo")
+    parser.add_argument('--lote', type=int, default=TAMANHO_LOTE, help="rodadas por transação")
+    parser.add_argument('--gerar', nargs=2, metavar=('ARQUIVO', 'N'), help="gera um dump sintético e sai")
+    args = parser.parse_args()
+
+    if args.gerar:
+        caminho, quantidade = args.gerar
+        gerar_dump(caminho, int(quantidade))
+        print(f"📝 {int(quantidade)} rodadas sintéticas em {caminho}")
+        return
+    if not args.arquivo:
+        parser.error("informe o arquivo a importar")
+
+    from blaze_armazenamento import ArmazenamentoBlaze
+    armazenamento = ArmazenamentoBlaze(args.db)
+
+    def progresso(lidas, importadas, segundos):
+        print(f"  ⏳ {lidas} lidas | {importadas} novas | {lidas / segundos:,.0f} rodadas/s", flush=True)
+
+    resultado = importar(args.arquivo, armazenamento, args.formato, args.lote, progresso)
+    print(f"📥 {resultado['lidas']} rodadas lidas em {resultado['segundos']:.1f}s "
+          f"({resultado['rodadas_por_segundo']:,.0f} rodadas/s, {resultado['mb_por_segundo']:.1f} MB/s) | "
+          f"{resultado['importadas']} novas | {resultado['duplicadas']} duplicadas | "
+          f"{sum(resultado['invalidas'].values())} inválidas")
+    for motivo, quantidade in sorted(resultado['invalidas'].items()):
+        print(f"  ⚠️ {motivo}: {quantidade}")
+    print(f"🗃️ {armazenamento.contar_jogos()} jogos no banco")
+
+
+if __name__ == '__main__':
+    main()
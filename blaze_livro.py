@@ -0,0 +1,123 @@
+# BLAZE IA - LIVRO DE ESTATÍSTICAS (totais mantidos a cada registro)
+from bisect import bisect_left, bisect_right, insort
+from datetime import timedelta
+
+TOTAL = 'TOTAL'
+
+
+def _totais_apostas():
+    return {'vitorias': 0, 'total': 0, 'lucro_total': 0.0, 'investido': 0.0}
+
+
+def _totais_previsoes():
+    return {'previsoes': 0, 'verificadas': 0, 'acertos': 0}
+
+
+class LivroEstatisticas:
+    """Totais gerais e por estratégia de apostas e previsões, atualizados a cada registro
+
+    As métricas do painel saem em O(1); a janela de apostas recentes usa um
+    índice ordenado por timestamp (O(log n) + tamanho da janela).
+    """
+
+    def __init__(self, previsoes=(), apostas=()):
+        self.limpar()
+        for previsao in previsoes:
+            self.registrar_previsao(previsao)
+        for aposta in apostas:
+            self.registrar_aposta(aposta)
+
+    def limpar(self):
+        self.apostas = {TOTAL: _totais_apostas()}
+        self.previsoes = {TOTAL: _totais_previsoes()}
+        self._instantes = []      # timestamps das apostas, ordenados
+        self._por_instante = []   # apostas na mesma ordem de _instantes
+
+    @classmethod
+    def de_instantaneo(cls, instantaneo, apostas_recentes=()):
+        """Totais gravados por `instantaneo()`; o índice de recentes só com `apostas_recentes`"""
+        livro = cls()
+        livro.incorporar({tabela: [totais] for tabela, totais in instantaneo.items()})
+        for aposta in apostas_recentes:
+            livro._indexar(aposta)
+        return livro
+
+    def instantaneo(self):
+        """Totais por estratégia, serializáveis em JSON (sem o índice de recentes)"""
+        return {'previsoes': self.previsoes, 'apostas': self.apostas}
+
+    def registrar_aposta(self, aposta):
+        metodo = aposta.get('metodo', 'N/A')
+        for chave in (TOTAL, metodo):
+            totais = self.apostas.setdefault(chave, _totais_apostas())
+            totais['total'] += 1
+            totais['lucro_total'] += aposta['lucro']
+            if aposta['resultado'] == 'ganhou':
+                totais['vitorias'] += 1
+            elif aposta['resultado'] == 'perdeu':
+                totais['investido'] += aposta['valor']
+        self._indexar(aposta)
+
+    def _indexar(self, aposta):
+        instante = aposta['timestamp']
+        if not self._instantes or instante >= self._instantes[-1]:
+            self._instantes.append(instante)
+            self._por_instante.append(aposta)
+        else:
+            posicao = bisect_right(self._instantes, instante)
+            insort(self._instantes, instante)
+            self._por_instante.insert(posicao, aposta)
+
+    def registrar_previsao(self, previsao):
+        """Chamar depois que 'acertou' já estiver definido (ou None)"""
+        metodo = previsao.get('metodo', 'N/A')
+        for chave in (TOTAL, metodo):
+            totais = self.previsoes.setdefault(chave, _totais_previsoes())
+            totais['previsoes'] += 1
+            if previsao.get('acertou') is not None:
+                totais['verificadas'] += 1
+                totais['acertos'] += bool(previsao['acertou'])
+
+    def incorporar(self, resumo):
+        """Soma totais já agregados (ex.: resumos dos segmentos arquivados)
+
+        resumo: {'previsoes': [totais por estratégia, ...], 'apostas': [...]}
+        """
+        for tabela, novos in (('previsoes', _totais_previsoes), ('apostas', _totais_apostas)):
+            destino = getattr(self, tabela)
+            for por_metodo in resumo.get(tabela, ()):
+                for metodo, totais in por_metodo.items():
+                    atuais = destino.setdefault(metodo, novos())
+                    for campo, valor in totais.items():
+                        atuais[campo] += valor
+
+    def descartar_antes(self, instante):
+        """Tira do índice de recentes as apostas anteriores a `instante` (os totais ficam)"""
+        inicio = bisect_left(self._instantes, instante)
+        del self._instantes[:inicio]
+        del self._por_instante[:inicio]
+
+    def total_apostas(self):
+        return self.apostas[TOTAL]['total']
+
+    def total_previsoes(self):
+        return self.previsoes[TOTAL]['previsoes']
+
+    def resumo_apostas(self, metodo=TOTAL):
+        """Mesmo formato de blaze_painel.resumo_apostas"""
+        totais = self.apostas.get(metodo, _totais_apostas())
+        investido = totais['investido']
+        return dict(totais, roi=(totais['lucro_total'] / investido * 100) if investido > 0 else 0)
+
+    def precisao_previsoes(self, metodo=TOTAL):
+        """(acertos, verificadas), como blaze_painel.precisao_previsoes"""
+        totais = self.previsoes.get(metodo, _totais_previsoes())
+        return totais['acertos'], totais['verificadas']
+
+    def apostas_recentes(self, agora, minutos=2):
+        inicio = bisect_right(self._instantes, agora - timedelta(minutes=minutos))
+        return self._por_instante[inicio:]
+
+    def metodos(self):
+        """Estratégias com apostas, da mais usada para a menos usada"""
+        return sorted((m for m in self.apostas if m != TOTAL), key=lambda m: -self.apostas[m]['total'])
@@ -0,0 +1,109 @@
+# BLAZE IA - MANUTENÇÃO PERIÓDICA EM SEGUNDO PLANO
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from blaze_armazenamento import ArmazenamentoBlaze, IA_DB_FILE
+from blaze_arquivo import RETENCAO_DIAS, diretorio_padrao
+from blaze_verificacao import SEMENTE_CLIENTE, verificar_historico
+
+logger = logging.getLogger('blaze.manutencao')
+
+# Uma passada por hora (o arquivo é diário; mais que isso só repete trabalho)
+INTERVALO_MANUTENCAO = 3600.0
+
+
+class ManutencaoPeriodica:
+    """Uma thread por banco arquiva previsões/apostas antigas e confere a cadeia de seeds
+
+    Usa uma conexão própria com o banco e não toca no estado do motor: o ciclo
+    (e a renderização do Streamlit) só leem o resultado em `ultima()` ou no banco.
+    A verificação retoma dos intervalos já conferidos, então só a primeira
+    passada percorre o histórico inteiro.
+    """
+
+    def __init__(self, caminho_db=IA_DB_FILE, retencao_dias=RETENCAO_DIAS, diretorio_arquivo=None,
+                 semente_cliente=SEMENTE_CLIENTE, processos=1, intervalo=INTERVALO_MANUTENCAO):
+        self.caminho_db = caminho_db
+        self.retencao_dias = retencao_dias
+        self.diretorio_arquivo = diretorio_arquivo or diretorio_padrao(caminho_db)
+        # Semente do cliente publicada pela Blaze (sem ela o roll não é conferido)
+        self.semente_cliente = semente_cliente
+        self.processos = processos
+        self.intervalo = intervalo
+        self._armazenamento = None
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+        self._ultima = {
+            'concluida_em': None,   # time.time() da última passada
+            'segundos': None,       # duração da última passada
+            'arquivados': {},       # registros arquivados por tabela
+            'verificacao': None,    # contagens da última verificação (sem a lista de falhas)
+            'erro': None,
+        }
+
+    def iniciar(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._executar, name='blaze-manutencao', daemon=True)
+            self._thread.start()
+        return self
+
+    def parar(self, timeout=None):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def ultima(self):
+        with self._lock:
+            return dict(self._ultima)
+
+    @property
+    def armazenamento(self):
+        if self._armazenamento is None:
+            self._armazenamento = ArmazenamentoBlaze(self.caminho_db)
+        return self._armazenamento
+
+    def executar_agora(self, agora=None):
+        """Uma passada completa (na thread de quem chama); devolve o resultado"""
+        inicio = time.perf_counter()
+        resultado = {'arquivados': {}, 'verificacao': None, 'erro': None}
+        try:
+            if self.retencao_dias is not None:
+                corte = (agora or datetime.now()) - timedelta(days=self.retencao_dias)
+                resultado['arquivados'] = self.armazenamento.compactar(corte, self.diretorio_arquivo)
+        except Exception as e:
+            resultado['erro'] = f"arquivo: {e}"
+            logger.error("Falha ao arquivar registros antigos: %s", e)
+        if any(resultado['arquivados'].values()):
+            logger.info("Arquivados: %s", ", ".join(f"{t}={n}" for t, n in resultado['arquivados'].items()))
+        try:
+            resultado['verificacao'] = self.verificar()
+        except Exception as e:
+            resultado['erro'] = f"verificação: {e}"
+            logger.error("Falha na verificação das seeds: %s", e)
+        resultado.update(concluida_em=time.time(), segundos=time.perf_counter() - inicio)
+        with self._lock:
+            self._ultima.update(resultado)
+        return resultado
+
+    def verificar(self):
+        """Confere as rodadas do banco ainda fora dos intervalos verificados (só elas são lidas)"""
+        armazenamento = self.armazenamento
+        intervalos = armazenamento.intervalos_verificados(self.semente_cliente)
+        colunas, ultima_linha = armazenamento.carregar_pendentes(intervalos)
+        resultado = verificar_historico(colunas, self.semente_cliente, intervalos, processos=self.processos)
+        armazenamento.registrar_verificacao(resultado['trechos_cobertos'], resultado['falhas'], self.semente_cliente,
+                                            resultado['trechos_verificados'], ultima_linha)
+        if resultado['quebras'] or resultado['rolls_errados'] or resultado['cores_erradas']:
+            logger.warning("Provably fair: %d quebras na cadeia, %d rolls e %d cores inconsistentes",
+                           resultado['quebras'], resultado['rolls_errados'], resultado['cores_erradas'])
+        return {chave: valor for chave, valor in resultado.items()
+                if chave not in ('falhas', 'intervalos', 'trechos_cobertos', 'trechos_verificados')}
+
+    def _executar(self):
+        while not self._parar.is_set():
+            self.executar_agora()
+            self._parar.wait(self.intervalo)
@@ -0,0 +1,180 @@
+# BLAZE IA - MÉTRICAS DE LATÊNCIA POR ETAPA
+"""Cronômetros por etapa do ciclo (busca, decodificação, análise, merge,
+persistência, render), contadores e medidores de tamanho do estado.
+
+Cada etapa guarda as últimas JANELA medições (percentis p50/p95/p99 calculados
+na leitura) além de contagem e soma acumuladas. Desligado (padrão), `cronometro`
+devolve um objeto nulo compartilhado e `contar`/`definir` retornam na primeira
+linha: custo de uma chamada de função, bem abaixo de 1 µs.
+
+Liga com BLAZE_METRICAS=1 ou `ativar()`. `iniciar_servidor(porta)` expõe o
+formato texto do Prometheus em http://127.0.0.1:<porta>/metrics.
+"""
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+VARIAVEL_ATIVAR = 'BLAZE_METRICAS'
+VARIAVEL_PORTA = 'BLAZE_METRICAS_PORTA'
+
+JANELA = 2048
+PERCENTIS = (0.5, 0.95, 0.99)
+PORTA_PADRAO = 9464
+PREFIXO = 'blaze'
+
+
+class _CronometroNulo:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        return False
+
+
+_NULO = _CronometroNulo()
+
+
+class _Cronometro:
+    __slots__ = ('registro', 'etapa', 'inicio')
+
+    def __init__(self, registro, etapa):
+        self.registro = registro
+        self.etapa = etapa
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        self.registro.observar(self.etapa, time.perf_counter() - self.inicio)
+        return False
+
+
+class RegistroMetricas:
+    """Janelas de latência por etapa, contadores (só crescem) e medidores (último valor)"""
+
+    def __init__(self, ativo=False, janela=JANELA):
+        self.ativo = ativo
+        self.janela = janela
+        self._lock = threading.Lock()
+        self._amostras = {}
+        self._totais = {}       # etapa -> [contagem, soma]
+        self._contadores = {}
+        self._medidores = {}
+
+    def observar(self, etapa, segundos):
+        with self._lock:
+            amostras = self._amostras.get(etapa)
+            if amostras is None:
+                amostras = self._amostras[etapa] = deque(maxlen=self.janela)
+                self._totais[etapa] = [0, 0.0]
+            amostras.append(segundos)
+            totais = self._totais[etapa]
+            totais[0] += 1
+            totais[1] += segundos
+
+    def contar(self, nome, quantidade=1):
+        with self._lock:
+            self._contadores[nome] = self._contadores.get(nome, 0) + quantidade
+
+    def definir(self, nome, valor):
+        self._medidores[nome] = valor
+
+    def limpar(self):
+        with self._lock:
+            self._amostras.clear()
+            self._totais.clear()
+            self._contadores.clear()
+            self._medidores.clear()
+
+    def resumo(self):
+        """{'etapas': {etapa: p50/p95/p99/contagem/soma}, 'contadores': {...}, 'medidores': {...}}"""
+        with self._lock:
+            amostras = {etapa: np.fromiter(valores, dtype=float) for etapa, valores in self._amostras.items()}
+            totais = {etapa: tuple(valores) for etapa, valores in self._totais.items()}
+            contadores = dict(self._contadores)
+            medidores = dict(self._medidores)
+        etapas = {}
+        for etapa, valores in sorted(amostras.items()):
+            quantis = np.quantile(valores, PERCENTIS)
+            etapas[etapa] = {
+                'p50': float(quantis[0]),
+                'p95': float(quantis[1]),
+                'p99': float(quantis[2]),
+                'contagem': totais[etapa][0],
+                'soma': totais[etapa][1],
+            }
+        return {'etapas': etapas, 'contadores': contadores, 'medidores': medidores}
+
+    def prometheus(self):
+        """Formato texto de exposição do Prometheus (summary por etapa, counters e gauges)"""
+        resumo = self.resumo()
+        linhas = [
+            f'# HELP {PREFIXO}_etapa_segundos Latência por etapa do ciclo (últimas {self.janela} medições)',
+            f'# TYPE {PREFIXO}_etapa_segundos summary',
+        ]
+        for etapa, medidas in resumo['etapas'].items():
+            for quantil, chave in zip(PERCENTIS, ('p50', 'p95', 'p99')):
+                linhas.append(f'{PREFIXO}_etapa_segundos{{etapa="{etapa}",quantile="{quantil}"}} {medidas[chave]:.9f}')
+            linhas.append(f'{PREFIXO}_etapa_segundos_sum{{etapa="{etapa}"}} {medidas["soma"]:.9f}')
+            linhas.append(f'{PREFIXO}_etapa_segundos_count{{etapa="{etapa}"}} {medidas["contagem"]}')
+        for nome, valor in sorted(resumo['contadores'].items()):
+            linhas += [f'# TYPE {PREFIXO}_{nome}_total counter', f'{PREFIXO}_{nome}_total {valor}']
+        for nome, valor in sorted(resumo['medidores'].items()):
+            linhas += [f'# TYPE {PREFIXO}_{nome} gauge', f'{PREFIXO}_{nome} {valor}']
+        return '\n'.join(linhas) + '\n'
+
+
+registro = RegistroMetricas(ativo=os.environ.get(VARIAVEL_ATIVAR, '') not in ('', '0'))
+
+
+def ativar(ativo=True):
+    registro.ativo = ativo
+
+
+def cronometro(etapa):
+    """`with cronometro('analise'):` mede o bloco quando as métricas estão ligadas"""
+    if not registro.ativo:
+        return _NULO
+    return _Cronometro(registro, etapa)
+
+
+def contar(nome, quantidade=1):
+    if registro.ativo:
+        registro.contar(nome, quantidade)
+
+
+def definir(nome, valor):
+    if registro.ativo:
+        registro.definir(nome, valor)
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        corpo = registro.prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def iniciar_servidor(porta=PORTA_PADRAO, host='127.0.0.1'):
+    """Servidor HTTP local em thread daemon; liga as métricas e devolve o servidor"""
+    ativar()
+    servidor = ThreadingHTTPServer((host, porta), _Manipulador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name='blaze-metricas', daemon=True).start()
+    return servidor
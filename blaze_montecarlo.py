@@ -0,0 +1,147 @@
+# BLAZE IA - SIMULAÇÃO DE MONTE CARLO DA POLÍTICA DE APOSTAS
+"""Roda a política de blaze_politica sobre milhares de bancas independentes.
+
+Cada rodada sorteia, para cada caminho, a confiança de uma previsão (distribuição
+empírica do backtest) e o resultado da aposta. Os caminhos são vetorizados com
+NumPy e divididos em lotes entre processos.
+
+Uso:
+    python blaze_montecarlo.py --caminhos 100000 --rodadas 10000
+    python blaze_montecarlo.py --db ia_data.db --chance metodo
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from blaze_politica import FATOR_CHANCE_REAL, PAGAMENTO, SALDO_INICIAL, SALDO_MINIMO, valores_aposta
+
+CAMINHOS_POR_LOTE = 5000
+PERCENTIS = (1, 5, 25, 50, 75, 95, 99)
+
+
+def distribuicao_do_backtest(cores, chance='app'):
+    """Confianças observadas no backtest e a chance de acerto de cada uma
+
+    chance='app': confiança * FATOR_CHANCE_REAL, como o motor simula hoje
+    chance='metodo': taxa de acerto real do backtest para aquela confiança
+    """
+    from blaze_backtest import backtest_vetorizado
+
+    resultado = backtest_vetorizado(cores)
+    confiancas, indices, contagens = np.unique(resultado['confianca'][:-1], return_inverse=True, return_counts=True)
+    probabilidades = contagens / contagens.sum()
+    if chance == 'metodo':
+        acertos = np.bincount(indices, weights=resultado['acertou'][:-1], minlength=len(confiancas))
+        chances = acertos / contagens
+    else:
+        chances = confiancas * FATOR_CHANCE_REAL
+    return confiancas, probabilidades, chances
+
+
+def simular_lote(confiancas, probabilidades, chances, caminhos, rodadas, semente):
+    """Simula `caminhos` bancas por `rodadas` rodadas; retorna arrays por caminho"""
+    rng = np.random.default_rng(semente)
+    saldo = np.full(caminhos, SALDO_INICIAL)
+    pico = saldo.copy()
+    drawdown = np.zeros(caminhos)
+    arruinado = np.zeros(caminhos, dtype=bool)
+    apostas = np.zeros(caminhos, dtype=np.int64)
+    acumulada = np.cumsum(probabilidades)
+
+    for _ in range(rodadas):
+        indice = np.minimum(np.searchsorted(acumulada, rng.random(caminhos), side='right'), len(confiancas) - 1)
+        # Mesma conta de deve_apostar/valor_aposta do motor, para todos os caminhos
+        valor = valores_aposta(saldo, confiancas[indice])
+        ativa = valor > 0
+
+        acertou = ativa & (rng.random(caminhos) < chances[indice])
+        saldo -= valor
+        saldo += np.where(acertou, valor * PAGAMENTO, 0.0)
+
+        apostas += ativa
+        np.maximum(pico, saldo, out=pico)
+        np.maximum(drawdown, (pico - saldo) / pico, out=drawdown)
+        arruinado |= saldo <= SALDO_MINIMO
+
+    return {'saldo': saldo, 'drawdown': drawdown, 'arruinado': arruinado, 'apostas': apostas}
+
+
+def _simular_lote(argumentos):
+    return simular_lote(*argumentos)
+
+
+def simular(confiancas, probabilidades, chances, caminhos=10000, rodadas=1000,
+            processos=None, semente=0, caminhos_por_lote=CAMINHOS_POR_LOTE):
+    """Divide os caminhos em lotes, simula em paralelo e junta os resultados"""
+    sementes = np.random.SeedSequence(semente).spawn((caminhos + caminhos_por_lote - 1) // caminhos_por_lote)
+    tarefas = []
+    restantes = caminhos
+    for semente_lote in sementes:
+        tamanho = min(caminhos_por_lote, restantes)
+        tarefas.append((confiancas, probabilidades, chances, tamanho, rodadas, semente_lote))
+        restantes -= tamanho
+
+    if processos == 1 or len(tarefas) == 1:
+        lotes = [simular_lote(*t) for t in tarefas]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            lotes = list(executor.map(_simular_lote, tarefas))
+
+    return {chave: np.concatenate([lote[chave] for lote in lotes]) for chave in lotes[0]}
+
+
+def resumir(resultado):
+    saldo = resultado['saldo']
+    return {
+        'caminhos': len(saldo),
+        'risco_de_ruina': float(resultado['arruinado'].mean()),
+        'prob_lucro': float((saldo > SALDO_INICIAL).mean()),
+        'saldo_medio': float(saldo.mean()),
+        'saldo_final': {f'p{p}': float(v) for p, v in zip(PERCENTIS, np.percentile(saldo, PERCENTIS))},
+        'drawdown_maximo': {f'p{p}': float(v) for p, v in
+                            zip(PERCENTIS, np.percentile(resultado['drawdown'], PERCENTIS))},
+        'apostas_medias': float(resultado['apostas'].mean()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo da política de apostas")
+    parser.add_argument('--caminhos', type=int, default=10000)
+    parser.add_argument('--rodadas', type=int, default=1000)
+    parser.add_argument('--processos', type=int, default=os.cpu_count())
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--db', help="histórico real para a distribuição de confianças (padrão: sintético)")
+    parser.add_argument('--chance', choices=['app', 'metodo'], default='app',
+                        help="app: confiança x 0.88 como no motor; metodo: acerto real do backtest")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    if args.db:
+        from blaze_armazenamento import ArmazenamentoBlaze
+        cores = ArmazenamentoBlaze(args.db).carregar_colunas().cores
+    else:
+        from blaze_sintetico import gerar_jogos
+        cores = np.array([j['color'] for j in gerar_jogos(200000, semente=args.semente)], dtype=np.int8)
+
+    distribuicao = distribuicao_do_backtest(cores, args.chance)
+    inicio = time.perf_counter()
+    resumo = resumir(simular(*distribuicao, caminhos=args.caminhos, rodadas=args.rodadas,
+                             processos=args.processos, semente=args.semente))
+    resumo['segundos'] = time.perf_counter() - inicio
+
+    if args.json:
+        print(json.dumps(resumo, indent=2))
+        return
+    print(f"🎲 {resumo['caminhos']} caminhos x {args.rodadas} rodadas em {resumo['segundos']:.1f}s")
+    print(f"Risco de ruína: {resumo['risco_de_ruina']:.2%} | Prob. de lucro: {resumo['prob_lucro']:.2%} | "
+          f"Apostas por caminho: {resumo['apostas_medias']:.0f}")
+    print("Saldo final:   " + "  ".join(f"{k}=R$ {v:.2f}" for k, v in resumo['saldo_final'].items()))
+    print("Drawdown máx.: " + "  ".join(f"{k}={v:.1%}" for k, v in resumo['drawdown_maximo'].items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,398 @@
+# BLAZE IA - MOTOR (busca, análise e persistência, sem interface)
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from blaze_api import ErroAPIBlaze, buscar_jogos
+from blaze_agregados import AgregadosTempo
+from blaze_analise import AnalisadorIncremental, analisar_padroes_avancada
+from blaze_armazenamento import ArmazenamentoBlaze, IA_DB_FILE
+from blaze_arquivo import RETENCAO_DIAS
+from blaze_colunar import HistoricoColunar
+from blaze_historico import HistoricoJogos, HISTORICO_MAXIMO
+from blaze_livro import LivroEstatisticas
+from blaze_metricas import contar, cronometro, definir
+from blaze_transicoes import IndiceTransicoes
+from blaze_politica import FATOR_CHANCE_REAL, PAGAMENTO, SALDO_INICIAL, deve_apostar, valor_aposta
+
+logger = logging.getLogger('blaze')
+
+NIVEIS_LOG = {
+    'sucesso': logging.INFO,
+    'info': logging.INFO,
+    'aviso': logging.WARNING,
+    'erro': logging.ERROR,
+}
+
+# Sistema de arquivos
+IA_DATA_FILE = "ia_data.pkl"
+IA_LEGADO_FILE = "ia_blaze_auto.pkl"
+
+# Recorte periódico da memória (~1h com rodadas de 30s); o arquivo em disco fica com
+# a ManutencaoPeriodica, fora do ciclo
+CICLOS_ENTRE_COMPACTACOES = 120
+
+# Previsões/apostas mantidas em memória; as anteriores são lidas por página (armazenamento.pagina)
+CAUDA_REGISTROS = 100
+
+def _notificar_log(nivel, mensagem):
+    logger.log(NIVEIS_LOG.get(nivel, logging.INFO), mensagem)
+
+def abrir_armazenamento(caminho_db=IA_DB_FILE):
+    """Banco de estado, migrando os pickles legados na primeira abertura"""
+    return ArmazenamentoBlaze(caminho_db, migrar_de=[IA_DATA_FILE, IA_LEGADO_FILE])
+
+
+class EstadoJogos:
+    """Histórico de jogos e o que deriva só dele: colunas, analisador, transições e agregados
+
+    Não guarda nada da sessão (saldo, previsões, apostas): o app mantém um por
+    processo (st.cache_resource) e cada sessão nova usa o mesmo, sem reler os
+    jogos do banco. `lock` serializa quem alimenta e quem lê para prever.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.limpar()
+        self.carregado = False
+
+    def limpar(self):
+        """Vazio (banco resetado): conta como carregado"""
+        with self.lock:
+            self.historico = HistoricoJogos()
+            self.colunas = HistoricoColunar()
+            self.reconstruir()
+            self.carregado = True
+
+    def carregar(self, armazenamento):
+        """Lê os jogos do banco uma vez; se falhar, continua sem carregar"""
+        historico = HistoricoJogos(armazenamento.carregar_historico(HISTORICO_MAXIMO))
+        colunas = armazenamento.carregar_colunas()
+        with self.lock:
+            self.historico, self.colunas = historico, colunas
+            self.reconstruir()
+            self.carregado = True
+
+    def reconstruir(self):
+        """Analisador, índice de transições e agregados refeitos a partir das colunas"""
+        analisador = AnalisadorIncremental()
+        if len(self.colunas):
+            analisador.alimentar_cores(self.colunas.cores[-analisador.janela_dados:],
+                                       ultimo_id=self.colunas.ids[-1].decode('ascii'))
+        self.analisador = analisador
+        self.transicoes = IndiceTransicoes.de_cores(self.colunas.cores)
+        self.agregados = AgregadosTempo.de_colunas(self.colunas)
+
+    def registrar(self, dados):
+        """Inclui apenas os jogos ainda não vistos (por qualquer sessão) e devolve os novos"""
+        with self.lock:
+            novos = self.historico.adicionar(dados)
+            if self.colunas.estender(novos) < len(self.colunas) - len(novos):
+                # Rodada atrasada: o que depende da ordem das rodadas é refeito (raro)
+                self.reconstruir()
+            else:
+                self.analisador.alimentar(novos)
+                self.transicoes.alimentar(novos)
+                self.agregados.alimentar(novos)
+            return novos
+
+
+class BlazeIA_Final:
+    """Busca, análise e persistência; avisos saem pelo callback `notificar(nivel, mensagem)`
+
+    `jogos` (EstadoJogos) e `armazenamento` podem ser compartilhados entre
+    sessões; sem eles cada motor tem os seus e `fechar()` fecha a conexão.
+    """
+    
+    def __init__(self, coletor=None, notificar=None, caminho_db=IA_DB_FILE,
+                 retencao_dias=RETENCAO_DIAS, jogos=None, armazenamento=None):
+        self.coletor = coletor
+        self.notificar = notificar or _notificar_log
+        self.jogos = jogos if jogos is not None else EstadoJogos()
+        self.previsoes = []
+        self.apostas = []
+        self.livro = LivroEstatisticas()
+        self.saldo = SALDO_INICIAL
+        self.contador_atualizacoes = 0
+        self.ultima_atualizacao = datetime.now()
+        self.modo_auto = False
+        # Registros ainda não gravados no banco
+        self._jogos_pendentes = []
+        self._previsoes_salvas = 0
+        self._apostas_salvas = 0
+        # Só grava depois de um carregamento bem-sucedido (senão os padrões sobrescrevem o banco)
+        self._carregado = False
+        # Previsões/apostas mais antigas que isso saem da memória (None = guarda tudo)
+        self.retencao_dias = retencao_dias
+        # Conexão compartilhada (uma por processo) fica aberta; a própria fecha em `fechar`
+        self._armazenamento_proprio = armazenamento is None
+        self.armazenamento = abrir_armazenamento(caminho_db) if armazenamento is None else armazenamento
+        self.carregar_dados()
+
+    def fechar(self):
+        if self._armazenamento_proprio:
+            self.armazenamento.fechar()
+    
+    # Jogos e derivados vêm do EstadoJogos (talvez compartilhado)
+    historico = property(lambda self: self.jogos.historico)
+    colunas = property(lambda self: self.jogos.colunas)
+    analisador = property(lambda self: self.jogos.analisador)
+    transicoes = property(lambda self: self.jogos.transicoes)
+    agregados = property(lambda self: self.jogos.agregados)
+
+    def carregar_dados(self):
+        try:
+            # Só a primeira sessão do processo lê os jogos; as demais partem do compartilhado
+            with self.jogos.lock:
+                if not self.jogos.carregado:
+                    self.jogos.carregar(self.armazenamento)
+            dados = self.armazenamento.carregar(limite_registros=CAUDA_REGISTROS)
+            self.previsoes = dados['previsoes']
+            self.apostas = dados['apostas']
+            self.livro = self._carregar_livro(dados['livro'])
+            self.saldo = dados['saldo']
+            self.contador_atualizacoes = dados['contador_atualizacoes']
+            self.modo_auto = dados['modo_auto']
+            self._jogos_pendentes = []
+            self._previsoes_salvas = len(self.previsoes)
+            self._apostas_salvas = len(self.apostas)
+            self._carregado = True
+        except Exception as e:
+            # Não apaga o banco: inicia vazio em memória e não grava nada até carregar
+            self.notificar('erro', f"❌ Erro ao carregar dados salvos (gravação suspensa): {e}")
+            self._limpar_memoria()
+            self._carregado = False
+    
+    def _carregar_livro(self, instantaneo):
+        """Totais gravados com o último ciclo; sem eles (banco antigo) recalcula uma vez de tudo"""
+        if instantaneo is None:
+            completo = LivroEstatisticas(self.armazenamento.consultar('previsoes'),
+                                         self.armazenamento.consultar('apostas'))
+            instantaneo = completo.instantaneo()
+        return LivroEstatisticas.de_instantaneo(instantaneo, self.apostas)
+
+    def salvar_dados(self):
+        """Grava apenas o que mudou desde o último salvamento"""
+        if not self._carregado:
+            return
+        try:
+            novas_previsoes = self.previsoes[self._previsoes_salvas:]
+            novas_apostas = self.apostas[self._apostas_salvas:]
+            with cronometro('persistencia'):
+                seqs = self.armazenamento.registrar(
+                    jogos=self._jogos_pendentes,
+                    previsoes=novas_previsoes,
+                    apostas=novas_apostas,
+                    estado={
+                        'saldo': self.saldo,
+                        'contador_atualizacoes': self.contador_atualizacoes,
+                        'modo_auto': self.modo_auto,
+                        'livro': self.livro.instantaneo(),
+                    }
+                )
+            # O seq marca até onde a memória vai (o histórico paginado continua dali)
+            for registro, seq in zip(novas_previsoes, seqs['previsoes']):
+                registro['seq'] = seq
+            for registro, seq in zip(novas_apostas, seqs['apostas']):
+                registro['seq'] = seq
+            self._jogos_pendentes = []
+            # Já gravado: só a cauda recente continua em memória
+            if len(self.previsoes) > 2 * CAUDA_REGISTROS:
+                self.previsoes = self.previsoes[-CAUDA_REGISTROS:]
+            if len(self.apostas) > 2 * CAUDA_REGISTROS:
+                self.apostas = self.apostas[-CAUDA_REGISTROS:]
+            self._previsoes_salvas = len(self.previsoes)
+            self._apostas_salvas = len(self.apostas)
+        except Exception as e:
+            self.notificar('erro', f"❌ Erro ao salvar dados: {e}")
+    
+    def _corte_retencao(self, agora=None):
+        if self.retencao_dias is None:
+            return None
+        return (agora or datetime.now()) - timedelta(days=self.retencao_dias)
+
+    def descartar_arquivados(self, agora=None):
+        """Tira da memória as previsões/apostas já salvas que passaram do horizonte
+
+        Só memória: o arquivamento em disco roda em segundo plano (blaze_manutencao).
+        """
+        corte = self._corte_retencao(agora)
+        if corte is None:
+            return
+        salvas = [p for p in self.previsoes[:self._previsoes_salvas] if p['timestamp'] >= corte]
+        self.previsoes = salvas + self.previsoes[self._previsoes_salvas:]
+        self._previsoes_salvas = len(salvas)
+        salvas = [a for a in self.apostas[:self._apostas_salvas] if a['timestamp'] >= corte]
+        self.apostas = salvas + self.apostas[self._apostas_salvas:]
+        self._apostas_salvas = len(salvas)
+        self.livro.descartar_antes(corte)
+
+    def _publicar_metricas(self):
+        """Contador de ciclos e tamanho do estado em memória (sem custo com as métricas desligadas)"""
+        contar('ciclos')
+        definir('jogos_armazenados', len(self.colunas))
+        definir('historico_bytes', self.colunas.nbytes)
+        definir('previsoes_em_memoria', len(self.previsoes))
+        definir('apostas_em_memoria', len(self.apostas))
+        definir('saldo', self.saldo)
+
+    def _limpar_memoria(self):
+        self.previsoes = []
+        self.apostas = []
+        self.livro = LivroEstatisticas()
+        self.saldo = SALDO_INICIAL
+        self.contador_atualizacoes = 0
+        self.modo_auto = False
+        self._jogos_pendentes = []
+        self._previsoes_salvas = 0
+        self._apostas_salvas = 0
+    
+    def resetar_sistema(self):
+        self._limpar_memoria()
+        self.armazenamento.resetar()
+        self.jogos.limpar()
+        # Banco e memória voltam ao mesmo ponto de partida
+        self._carregado = True
+    
+    def registrar_jogos(self, dados):
+        """Inclui no histórico (e nas colunas) apenas os jogos ainda não vistos"""
+        with cronometro('merge'):
+            novos = self.jogos.registrar(dados)
+            # Quem viu o jogo primeiro grava; as outras sessões o recebem já registrado
+            self._jogos_pendentes.extend(novos)
+        contar('jogos_duplicados', len(dados) - len(novos))
+        contar('jogos_novos', len(novos))
+        return novos
+
+    def alternar_modo_auto(self):
+        self.modo_auto = not self.modo_auto
+        self.salvar_dados()
+        return self.modo_auto
+
+    def buscar_dados_reais(self):
+        """Últimos jogos da API oficial - lidos do coletor compartilhado quando disponível"""
+        if self.coletor is None:
+            try:
+                dados = buscar_jogos()
+            except ErroAPIBlaze as e:
+                self.notificar('erro', f"❌ {e}")
+                return None
+            self.notificar('sucesso', f"✅ {len(dados)} jogos recebidos da Blaze")
+            return dados
+        
+        snapshot = self.coletor.snapshot()
+        if snapshot['dados'] is None and snapshot['erro'] is None:
+            # Primeira sessão do processo: espera a primeira resposta do coletor
+            snapshot = self.coletor.aguardar(timeout=15)
+        
+        dados = snapshot['dados']
+        if snapshot['erro']:
+            if not dados:
+                self.notificar('erro', f"❌ {snapshot['erro']}")
+                return None
+            idade = time.time() - snapshot['recebido_em']
+            self.notificar('aviso', f"⚠️ Usando dados de {idade:.0f}s atrás ({snapshot['erro']})")
+        elif dados:
+            self.notificar('sucesso', f"✅ {len(dados)} jogos recebidos da Blaze")
+        return dados
+
+    def analisar_padroes_avancada(self, dados):
+        """Análise avançada baseada nos dados reais da Blaze (ver blaze_analise)"""
+        return analisar_padroes_avancada(dados)
+    
+    def prever(self, dados):
+        """Cascata de padrões (O(1) pelo analisador incremental quando ele está na ponta de `dados`)
+
+        O índice de transições entra como mais uma estratégia: quando um padrão
+        das últimas k cores é significativo e a confiança dele (já encolhida para
+        a taxa base) supera a da cascata, a previsão passa a ser a do padrão histórico.
+        """
+        with cronometro('analise'), self.jogos.lock:
+            if (dados and self.analisador.ultimo_id == dados[0]['id']
+                    and len(dados) == self.analisador.janela_dados):
+                previsao = self.analisador.prever()
+            else:
+                previsao = self.analisar_padroes_avancada(self.colunas.recentes(len(dados)))
+            historico = self.transicoes.analisar()
+            if historico is not None and historico['confianca'] > previsao['confianca']:
+                return historico
+            return previsao
+    
+    def executar_ciclo_completo(self, dados=None):
+        """Executa um ciclo completo de análise (busca os dados se não forem passados)"""
+        try:
+            # Buscar dados reais
+            if dados is None:
+                dados = self.buscar_dados_reais()
+            
+            if not dados:
+                self.notificar('erro', "❌ Não foi possível obter dados")
+                return None, None
+            
+            # Atualizar histórico (apenas jogos novos, deduplicados por id)
+            self.registrar_jogos(dados)
+            
+            # Fazer previsão avançada
+            previsao = self.prever(dados)
+            
+            # Registrar previsão
+            registro = {
+                'timestamp': datetime.now(),
+                'previsao': previsao['previsao'],
+                'confianca': previsao['confianca'],
+                'metodo': previsao['metodo'],
+                'acertou': None
+            }
+            self.previsoes.append(registro)
+            
+            # SISTEMA DE APOSTAS INTELIGENTE
+            if deve_apostar(self.saldo, previsao['confianca']):
+                # Valor progressivo baseado na confiança (ver blaze_politica)
+                valor = valor_aposta(self.saldo, previsao['confianca'])
+                
+                self.saldo -= valor
+                
+                # Chance real ajustada (leva em conta a house edge)
+                chance_real = previsao['confianca'] * FATOR_CHANCE_REAL
+                acertou = random.random() < chance_real
+                
+                aposta = {
+                    'timestamp': datetime.now(),
+                    'valor': round(valor, 2),
+                    'previsao': previsao['previsao'],
+                    'resultado': 'ganhou' if acertou else 'perdeu',
+                    'lucro': round(valor * PAGAMENTO, 2) if acertou else round(-valor, 2),
+                    'confianca': previsao['confianca'],
+                    'metodo': previsao['metodo']
+                }
+                
+                if acertou:
+                    self.saldo += valor * PAGAMENTO
+                    registro['acertou'] = True
+                    registro['lucro_aposta'] = valor * (PAGAMENTO - 1)
+                else:
+                    registro['acertou'] = False
+                    registro['lucro_aposta'] = -valor
+                
+                self.apostas.append(aposta)
+                self.livro.registrar_aposta(aposta)
+                registro['aposta_id'] = self.livro.total_apostas()
+            
+            # Totais do painel (depois de saber se acertou)
+            self.livro.registrar_previsao(registro)
+            
+            # ATUALIZAR SISTEMA
+            self.contador_atualizacoes += 1
+            self.ultima_atualizacao = datetime.now()
+            
+            self.salvar_dados()
+            if self.contador_atualizacoes % CICLOS_ENTRE_COMPACTACOES == 0:
+                self.descartar_arquivados()
+            self._publicar_metricas()
+            return previsao, dados
+            
+        except Exception as e:
+            self.notificar('erro', f"❌ Erro no ciclo: {str(e)}")
+            return None, None
@@ -0,0 +1,50 @@
+# BLAZE IA - AGREGAÇÕES DO PAINEL (sem Streamlit)
+from datetime import timedelta
+
+import numpy as np
+
+
+def contar_cores(cores):
+    """Contagem [zero, vermelho, preto] de um array de cores"""
+    return np.bincount(cores, minlength=3)
+
+
+def resumo_apostas(apostas):
+    """Vitórias, total, lucro, valor perdido e ROI das apostas"""
+    vitorias = sum(1 for a in apostas if a['resultado'] == 'ganhou')
+    total = len(apostas)
+    lucro_total = sum(a['lucro'] for a in apostas)
+    investido = sum(a['valor'] for a in apostas if a['resultado'] == 'perdeu')
+    return {
+        'vitorias': vitorias,
+        'total': total,
+        'lucro_total': lucro_total,
+        'investido': investido,
+        'roi': (lucro_total / investido * 100) if investido > 0 else 0,
+    }
+
+
+def apostas_recentes(apostas, agora, minutos=2):
+    return [a for a in apostas if a['timestamp'] > agora - timedelta(minutes=minutos)]
+
+
+def precisao_previsoes(previsoes):
+    """(acertos, verificadas) das previsões com resultado conhecido"""
+    verificadas = [p for p in previsoes if p.get('acertou') is not None]
+    acertos = sum(1 for p in verificadas if p['acertou'])
+    return acertos, len(verificadas)
+
+
+def faixa_resultados_html(jogos):
+    """Faixa dos últimos resultados num único bloco HTML (em vez de uma coluna por jogo)"""
+    blocos = []
+    for jogo in jogos:
+        cor = jogo['color']
+        emoji = "🔴" if cor == 1 else "⚫" if cor == 2 else "🟢"
+        cor_hex = "#ff4444" if cor == 1 else "#000000" if cor == 2 else "#00aa00"
+        blocos.append(
+            f"<div style='flex: 1; text-align: center; padding: 8px; border-radius: 8px; "
+            f"background: {cor_hex}; color: white; font-weight: bold; font-size: 0.8em;'>"
+            f"{emoji}<br>{jogo['roll']}</div>"
+        )
+    return f"<div style='display: flex; gap: 6px;'>{''.join(blocos)}</div>"
@@ -0,0 +1,30 @@
+# BLAZE IA - POLÍTICA DE APOSTAS
+import numpy as np
+
+SALDO_INICIAL = 1000.0
+LIMIAR_CONFIANCA = 0.75      # só aposta acima desta confiança
+SALDO_MINIMO = 10            # só aposta com saldo acima disto
+FRACAO_BASE = 0.025          # 2.5% do saldo
+MULTIPLICADOR_MAXIMO = 2.0
+APOSTA_MAXIMA = 50           # Máximo R$ 50
+PAGAMENTO = 1.95             # retorno bruto de uma aposta vencedora
+FATOR_CHANCE_REAL = 0.88     # chance simulada = confiança * fator (house edge)
+
+
+def deve_apostar(saldo, confianca):
+    return confianca > LIMIAR_CONFIANCA and saldo > SALDO_MINIMO
+
+
+def valor_aposta(saldo, confianca):
+    """Valor progressivo baseado na confiança"""
+    base = saldo * FRACAO_BASE
+    multiplicador = min(MULTIPLICADOR_MAXIMO, (confianca - LIMIAR_CONFIANCA) * 4 + 1)
+    return min(base * multiplicador, APOSTA_MAXIMA)
+
+
+def valores_aposta(saldos, confiancas):
+    """deve_apostar + valor_aposta para arrays de caminhos (0 onde não aposta)"""
+    ativa = (confiancas > LIMIAR_CONFIANCA) & (saldos > SALDO_MINIMO)
+    base = saldos * FRACAO_BASE
+    multiplicador = np.minimum(MULTIPLICADOR_MAXIMO, (confiancas - LIMIAR_CONFIANCA) * 4 + 1)
+    return np.where(ativa, np.minimum(base * multiplicador, APOSTA_MAXIMA), 0.0)
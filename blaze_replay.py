@@ -0,0 +1,340 @@
+# BLAZE IA - GRAVAÇÃO E REPRODUÇÃO DO FEED (teste determinístico e de carga)
+"""Grava cada resposta da API com o instante de recebimento e reproduz a gravação
+pelo mesmo caminho busca -> análise -> persistência -> painel.
+
+A gravação é um JSONL comprimido (gzip), uma linha por resposta:
+    {"recebido_em": 1764178803.64, "dados": [... lista de jogos como veio da API ...]}
+
+A reprodução respeita os intervalos gravados divididos pela velocidade
+(1 = tempo real, 60 = um minuto por segundo, 0 = o mais rápido possível).
+
+Uso:
+    python blaze_replay.py --gerar gravacao.jsonl.gz 2000        # gravação sintética
+    python blaze_replay.py gravacao.jsonl.gz --db replay.db --velocidade 0
+    python blaze_replay.py gravacao.jsonl.gz --carga 1 4 16 64 --velocidade 120
+
+O painel usa a gravação com BLAZE_REPLAY=gravacao.jsonl.gz (e BLAZE_REPLAY_VELOCIDADE);
+BLAZE_GRAVAR=arquivo.jsonl.gz grava o feed real enquanto o painel roda. O worker
+tem as opções --gravar, --replay e --velocidade.
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from blaze_api import ErroAPIBlaze
+from blaze_colunar import iso_para_ms
+from blaze_painel import contar_cores, faixa_resultados_html
+from blaze_sintetico import gerar_jogos
+
+VARIAVEL_GRAVAR = 'BLAZE_GRAVAR'
+VARIAVEL_REPLAY = 'BLAZE_REPLAY'
+VARIAVEL_VELOCIDADE = 'BLAZE_REPLAY_VELOCIDADE'
+
+JANELA_API = 20            # jogos por resposta do endpoint recent/1
+INTERVALO_CONSULTA = 5.0   # segundos entre consultas na gravação sintética
+INTERVALO_SESSAO = 2.0     # mesmo ritmo dos fragmentos do painel no modo automático
+LIMITE_P95 = 2.0           # sem espera entre atualizações: p95 acima disso = sessão travada
+
+
+class FimDaGravacao(ErroAPIBlaze):
+    """Todas as respostas gravadas já foram entregues"""
+
+
+class GravadorFeed:
+    """Acrescenta cada resposta nova da API ao arquivo gzip (seguro entre threads)"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.gravadas = 0
+        self._lock = threading.Lock()
+        self._ultima = None
+
+    def envolver(self, buscar):
+        """Mesma interface de `buscar`, gravando o que ela devolve"""
+        def buscar_gravando():
+            dados = buscar()
+            self.gravar(dados)
+            return dados
+        return buscar_gravando
+
+    def gravar(self, dados, recebido_em=None):
+        with self._lock:
+            # O cliente devolve o mesmo objeto enquanto serve do cache: não é resposta nova
+            if dados is self._ultima:
+                return
+            self._ultima = dados
+            linha = json.dumps({'recebido_em': recebido_em or time.time(), 'dados': dados})
+            # Cada gravação é um membro gzip completo: o arquivo continua legível se o processo cair
+            with gzip.open(self.caminho, 'at', encoding='utf-8') as f:
+                f.write(linha + '\n')
+            self.gravadas += 1
+
+
+def ler_gravacao(caminho):
+    """(recebido_em, dados) de cada resposta gravada, em ordem"""
+    with gzip.open(caminho, 'rt', encoding='utf-8') as f:
+        for linha in f:
+            if linha.strip():
+                registro = json.loads(linha)
+                yield registro['recebido_em'], registro['dados']
+
+
+class FonteReplay:
+    """Substitui ClienteBlaze.buscar: cada chamada entrega a próxima resposta no seu horário
+
+    O horário de cada resposta é medido a partir da primeira chamada, com os
+    intervalos gravados divididos por `velocidade` (0 ou None = sem espera).
+    Depois da última resposta `buscar` levanta FimDaGravacao.
+    """
+
+    def __init__(self, caminho, velocidade=1.0, relogio=time.monotonic):
+        self.caminho = caminho
+        self.velocidade = velocidade or None
+        self.relogio = relogio
+        self.entregues = 0
+        self.terminou = False
+        self._respostas = ler_gravacao(caminho)
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._origem = None     # (instante gravado, relógio) da primeira resposta
+
+    def parar(self):
+        """Interrompe uma espera em andamento (a chamada levanta FimDaGravacao)"""
+        self._parar.set()
+
+    def buscar(self):
+        with self._lock:
+            recebido_em, dados = next(self._respostas, (None, None))
+            if dados is None or self._parar.is_set():
+                self.terminou = True
+                raise FimDaGravacao(f"Fim da gravação ({self.entregues} respostas)")
+            if self._origem is None:
+                self._origem = (recebido_em, self.relogio())
+            elif self.velocidade:
+                devido = self._origem[1] + (recebido_em - self._origem[0]) / self.velocidade
+                espera = devido - self.relogio()
+                if espera > 0 and self._parar.wait(espera):
+                    self.terminou = True
+                    raise FimDaGravacao("Reprodução interrompida")
+            self.entregues += 1
+            return dados
+
+
+def gerar_gravacao(caminho, rodadas, semente=0, intervalo=INTERVALO_CONSULTA):
+    """Gravação sintética: consultas a cada `intervalo` s sobre rodadas de ~30 s"""
+    jogos = list(gerar_jogos(rodadas + JANELA_API, semente))
+    instantes = [iso_para_ms(jogo['created_at']) / 1000 for jogo in jogos]
+    respostas = 0
+    with gzip.open(caminho, 'wt', encoding='utf-8') as f:
+        posicao = JANELA_API - 1
+        instante = instantes[posicao]
+        while instante <= instantes[-1]:
+            while posicao + 1 < len(jogos) and instantes[posicao + 1] <= instante:
+                posicao += 1
+            janela = list(reversed(jogos[posicao - JANELA_API + 1:posicao + 1]))
+            f.write(json.dumps({'recebido_em': instante, 'dados': janela}) + '\n')
+            respostas += 1
+            instante += intervalo
+    return respostas
+
+
+def _ignorar(nivel, mensagem):
+    pass
+
+
+def _percentis(valores):
+    if not valores:
+        return {'p50': None, 'p95': None, 'p99': None, 'maximo': None}
+    p50, p95, p99 = np.percentile(valores, [50, 95, 99])
+    return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99), 'maximo': float(max(valores))}
+
+
+def _ms(segundos):
+    return f"{segundos * 1000:.0f}ms" if segundos is not None else '-'
+
+
+def reproduzir(ia, fonte, ciclos=None, semente=None):
+    """Worker sem agendador: um ciclo do motor por rodada nova na gravação
+
+    Com `semente` o resultado simulado das apostas se repete entre execuções.
+    """
+    if semente is not None:
+        random.seed(semente)
+    inicio = time.perf_counter()
+    tempos = []
+    ultimo_id = None
+    while ciclos is None or len(tempos) < ciclos:
+        try:
+            dados = fonte.buscar()
+        except FimDaGravacao:
+            break
+        # Como o coletor: resposta sem rodada nova não gera ciclo
+        if dados[0].get('id') == ultimo_id:
+            continue
+        ultimo_id = dados[0].get('id')
+        antes = time.perf_counter()
+        ia.executar_ciclo_completo(dados)
+        tempos.append(time.perf_counter() - antes)
+    segundos = time.perf_counter() - inicio
+    return dict(_percentis(tempos), ciclos=len(tempos), segundos=segundos,
+                ciclos_por_segundo=len(tempos) / segundos if segundos else 0.0)
+
+
+def montar_painel(ia, dados):
+    """O que o painel calcula a cada atualização de uma sessão (sem o Streamlit)"""
+    faixa_resultados_html(dados)
+    contar_cores(ia.colunas.recentes(len(dados)))
+    ia.livro.resumo_apostas()
+    ia.livro.precisao_previsoes()
+    ia.livro.apostas_recentes(datetime.now())
+    ia.agregados.consultar('hora')
+    ia.transicoes.analisar()
+    for k in range(1, ia.transicoes.k_maximo + 1):
+        ia.transicoes.consultar_atual(k)
+
+
+def simular_sessao(ia, coletor, parar, intervalo, medidas):
+    """Uma sessão no modo automático: ciclo a cada versão nova, painel a cada `intervalo`"""
+    versao = 0
+    dados = None
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        snapshot = coletor.snapshot()
+        if snapshot['versao'] > versao:
+            medidas['perdidas'] += max(0, snapshot['versao'] - versao - 1) if versao else 0
+            previsao, novos = ia.executar_ciclo_completo()
+            if previsao:
+                dados = novos
+                medidas['ciclos'].append(time.perf_counter() - inicio)
+            versao = snapshot['versao']
+        if dados:
+            montar_painel(ia, dados)
+        duracao = time.perf_counter() - inicio
+        medidas['atualizacoes'].append(duracao)
+        parar.wait(max(0.0, intervalo - duracao))
+
+
+def teste_carga(caminho, sessoes, velocidade=60.0, duracao=None, diretorio=None):
+    """N sessões simultâneas (threads, cada uma com seu motor) sobre uma gravação, num banco novo
+
+    Como no app, os motores dividem um coletor, um EstadoJogos e a conexão com o banco.
+    """
+    from blaze_coletor import ColetorCompartilhado
+    from blaze_motor import BlazeIA_Final, EstadoJogos, abrir_armazenamento
+
+    diretorio = diretorio or tempfile.mkdtemp(prefix='blaze_carga_')
+    caminho_db = os.path.join(diretorio, f'carga_{sessoes}.db')
+    fonte = FonteReplay(caminho, velocidade)
+    coletor = ColetorCompartilhado(fonte.buscar, intervalo=0.01, alinhar_rodadas=False)
+    erros = []
+
+    def notificar(nivel, mensagem):
+        if nivel == 'erro':
+            erros.append(mensagem)
+
+    jogos = EstadoJogos()
+    armazenamento = abrir_armazenamento(caminho_db)
+    motores = []
+    for _ in range(sessoes):
+        ia = BlazeIA_Final(coletor=coletor, notificar=notificar, jogos=jogos, armazenamento=armazenamento)
+        ia.modo_auto = True
+        motores.append(ia)
+
+    parar = threading.Event()
+    intervalo = INTERVALO_SESSAO / velocidade if velocidade else 0.0
+    medidas = [{'ciclos': [], 'atualizacoes': [], 'perdidas': 0} for _ in motores]
+    threads = [threading.Thread(target=simular_sessao, args=(ia, coletor, parar, intervalo, m), daemon=True)
+               for ia, m in zip(motores, medidas)]
+
+    inicio = time.perf_counter()
+    coletor.iniciar()
+    for thread in threads:
+        thread.start()
+    while not fonte.terminou and (duracao is None or time.perf_counter() - inicio < duracao):
+        time.sleep(0.05)
+    fonte.parar()
+    coletor.parar(timeout=5)
+    # Deixa as sessões alcançarem a última versão publicada
+    time.sleep(min(1.0, intervalo * 2 + 0.1))
+    parar.set()
+    for thread in threads:
+        thread.join()
+    segundos = time.perf_counter() - inicio
+    armazenamento.fechar()
+
+    ciclos = [t for m in medidas for t in m['ciclos']]
+    atualizacoes = [t for m in medidas for t in m['atualizacoes']]
+    atualizacao = _percentis(atualizacoes)
+    return {
+        'sessoes': sessoes,
+        'segundos': segundos,
+        'respostas': fonte.entregues,
+        'ciclos': len(ciclos),
+        'ciclos_por_segundo': len(ciclos) / segundos,
+        'atualizacoes_por_segundo': len(atualizacoes) / segundos,
+        'rodadas_perdidas': sum(m['perdidas'] for m in medidas),
+        'erros': len(erros),
+        'ciclo': _percentis(ciclos),
+        'atualizacao': atualizacao,
+        # Atualização mais lenta que o ritmo do painel, rodada pulada ou erro de gravação
+        'caiu': (bool(erros) or any(m['perdidas'] for m in medidas)
+                 or (atualizacao['p95'] or 0.0) > (intervalo or LIMITE_P95)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gravação/reprodução do feed e teste de carga")
+    parser.add_argument('gravacao', nargs='?', help="arquivo .jsonl.gz gravado")
+    parser.add_argument('--db', default='replay.db', help="banco usado na reprodução")
+    parser.add_argument('--velocidade', type=float, default=1.0, help="1 = tempo real, 0 = sem espera")
+    parser.add_argument('--ciclos', type=int, help="para depois de N ciclos")
+    parser.add_argument('--semente', type=int, default=0, help="semente do resultado simulado das apostas")
+    parser.add_argument('--carga', type=int, nargs='+', metavar='SESSOES',
+                        help="teste de carga com essas quantidades de sessões simultâneas")
+    parser.add_argument('--duracao', type=float, help="(carga) segundos por nível")
+    parser.add_argument('--gerar', nargs=2, metavar=('ARQUIVO', 'RODADAS'), help="gera uma gravação sintética")
+    args = parser.parse_args()
+
+    if args.gerar:
+        caminho, rodadas = args.gerar
+        respostas = gerar_gravacao(caminho, int(rodadas))
+        print(f"📝 {respostas} respostas ({int(rodadas)} rodadas) gravadas em {caminho}")
+        return
+    if not args.gravacao:
+        parser.error("informe a gravação")
+
+    if args.carga:
+        print(f"{'sessões':>7} {'ciclos/s':>9} {'atual./s':>9} {'ciclo p95':>10} "
+              f"{'atual. p50':>10} {'p95':>8} {'p99':>8} {'perdidas':>8} {'erros':>6}")
+        for sessoes in args.carga:
+            r = teste_carga(args.gravacao, sessoes, args.velocidade, args.duracao)
+            a = r['atualizacao']
+            print(f"{sessoes:>7} {r['ciclos_por_segundo']:>9.1f} {r['atualizacoes_por_segundo']:>9.1f} "
+                  f"{_ms(r['ciclo']['p95']):>10} {_ms(a['p50']):>10} {_ms(a['p95']):>8} {_ms(a['p99']):>8} "
+                  f"{r['rodadas_perdidas']:>8} {r['erros']:>6}", flush=True)
+            if r['caiu']:
+                print(f"💥 Limite atingido com {sessoes} sessões "
+                      f"(atualizações atrasadas, rodadas puladas ou erros)")
+                break
+        return
+
+    from blaze_motor import BlazeIA_Final
+    ia = BlazeIA_Final(caminho_db=args.db, notificar=_ignorar)
+    r = reproduzir(ia, FonteReplay(args.gravacao, args.velocidade), args.ciclos, args.semente)
+    print(f"▶️ {r['ciclos']} ciclos em {r['segundos']:.1f}s ({r['ciclos_por_segundo']:.1f}/s) | "
+          f"ciclo p50 {r['p50'] * 1000 if r['p50'] is not None else 0:.1f}ms "
+          f"p95 {r['p95'] * 1000 if r['p95'] is not None else 0:.1f}ms | "
+          f"{len(ia.colunas)} jogos | saldo R$ {ia.saldo:.2f}")
+    ia.fechar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# BLAZE IA - GERADOR DE RODADAS SINTÉTICAS
+import random
+import string
+from datetime import datetime, timedelta, timezone
+
+ALFABETO_ID = string.ascii_letters + string.digits
+
+
+def cor_do_roll(roll):
+    """0 -> branco (0), 1-7 -> vermelho (1), 8-14 -> preto (2)"""
+    if roll == 0:
+        return 0
+    return 1 if roll <= 7 else 2
+
+
+def gerar_jogos(quantidade, semente=0, inicio=None, intervalo=30.0):
+    """Jogos no formato da API, em ordem de created_at, reproduzíveis pela semente
+
+    `created_at` avança `intervalo` segundos (com ~0,5s de variação) a cada rodada.
+    """
+    rng = random.Random(semente)
+    instante = inicio or datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for _ in range(quantidade):
+        roll = rng.randint(0, 14)
+        yield {
+            'id': ''.join(rng.choices(ALFABETO_ID, k=10)),
+            'created_at': instante.strftime('%Y-%m-%dT%H:%M:%S.') + f'{instante.microsecond // 1000:03d}Z',
+            'color': cor_do_roll(roll),
+            'roll': roll,
+            'server_seed': '%064x' % rng.getrandbits(256),
+        }
+        instante += timedelta(seconds=intervalo + rng.uniform(-0.5, 0.5))
+
+
+def gerar_previsoes_e_apostas(quantidade, semente=0, inicio=None):
+    """Registros de previsões e apostas com o mesmo formato do motor"""
+    rng = random.Random(semente)
+    instante = inicio or datetime(2025, 1, 1)
+    previsoes, apostas = [], []
+    for _ in range(quantidade):
+        confianca = rng.choice([0.92, 0.85, 0.78, 0.72, 0.65, 0.62, 0.58])
+        previsao = rng.choice([1, 2])
+        registro = {'timestamp': instante, 'previsao': previsao, 'confianca': confianca,
+                    'metodo': 'SINTÉTICO', 'acertou': None}
+        if confianca > 0.75:
+            valor = round(rng.uniform(5, 50), 2)
+            acertou = rng.random() < 0.5
+            apostas.append({
+                'timestamp': instante, 'valor': valor, 'previsao': previsao,
+                'resultado': 'ganhou' if acertou else 'perdeu',
+                'lucro': round(valor * 1.95, 2) if acertou else -valor,
+                'confianca': confianca, 'metodo': 'SINTÉTICO',
+            })
+            registro['acertou'] = acertou
+            registro['aposta_id'] = len(apostas)
+        previsoes.append(registro)
+        instante += timedelta(seconds=30)
+    return previsoes, apostas
@@ -0,0 +1,140 @@
+# BLAZE IA - ÍNDICE DE TRANSIÇÕES (k-gramas de cores)
+"""Para cada padrão das últimas k cores (k = 1..k_maximo) guarda quantas vezes a
+rodada seguinte foi branco, vermelho ou preto em todo o histórico.
+
+O padrão é codificado em base 3 (cor mais antiga no dígito mais significativo),
+então cada k é uma tabela densa de 3**k linhas x 3 cores. Uma rodada nova
+atualiza k contadores; a consulta do padrão atual é um acesso direto.
+
+A previsão (`analisar`) só sai de um padrão cuja frequência se afasta da taxa
+base com significância e tem a confiança encolhida para essa taxa: 24 de 30
+num padrão de 8 cores é ruído, não motivo para apostar.
+"""
+import math
+from collections import deque
+
+import numpy as np
+
+K_MAXIMO = 8
+MINIMO_AMOSTRAS = 30
+# Desvio mínimo da taxa base em erros padrão: Bonferroni (5%) sobre os ~10 mil padrões de até 8 cores
+Z_MINIMO = 4.4
+# A confiança soma esse número de rodadas "na taxa base" às amostras do padrão
+FORCA_PRIORI = 100
+
+METODO_TRANSICAO = '🔢 PADRÃO HISTÓRICO'
+
+EMOJIS = {0: "🟢", 1: "🔴", 2: "⚫"}
+
+
+def codificar(padrao):
+    """Cores em ordem cronológica -> código base 3"""
+    codigo = 0
+    for cor in padrao:
+        codigo = codigo * 3 + int(cor)
+    return codigo
+
+
+class IndiceTransicoes:
+    """Contagens da próxima cor para todos os padrões de tamanho 1..k_maximo"""
+
+    def __init__(self, k_maximo=K_MAXIMO):
+        self.k_maximo = k_maximo
+        self.contagens = [None] + [np.zeros((3 ** k, 3), dtype=np.int64) for k in range(1, k_maximo + 1)]
+        self.ultimas = deque(maxlen=k_maximo)   # últimas cores, mais antiga primeiro
+        self._codigos = [0] * (k_maximo + 1)    # código das últimas k cores, para cada k
+        self.total = 0
+
+    @classmethod
+    def de_cores(cls, cores, k_maximo=K_MAXIMO):
+        """Monta o índice de uma vez a partir de um array de cores em ordem cronológica"""
+        indice = cls(k_maximo)
+        cores = np.asarray(cores, dtype=np.int64)
+        n = len(cores)
+        for k in range(1, k_maximo + 1):
+            if n <= k:
+                continue
+            codigos = np.zeros(n - k, dtype=np.int64)
+            for j in range(k):
+                codigos = codigos * 3 + cores[j:n - k + j]
+            indice.contagens[k] += np.bincount(
+                codigos * 3 + cores[k:], minlength=3 ** k * 3).reshape(3 ** k, 3)
+        indice.total = n
+        for cor in cores[-k_maximo:]:
+            indice._avancar(int(cor))
+        return indice
+
+    def alimentar(self, jogos):
+        """Jogos novos em ordem cronológica (como devolve HistoricoJogos.adicionar)"""
+        for jogo in jogos:
+            self.alimentar_cor(jogo['color'])
+
+    def alimentar_cor(self, cor):
+        """O(k_maximo): conta a cor como sucessora de cada padrão atual e avança"""
+        cor = int(cor)
+        for k in range(1, min(len(self.ultimas), self.k_maximo) + 1):
+            self.contagens[k][self._codigos[k], cor] += 1
+        self.total += 1
+        self._avancar(cor)
+
+    def _avancar(self, cor):
+        self.ultimas.append(cor)
+        for k in range(1, self.k_maximo + 1):
+            self._codigos[k] = (self._codigos[k] * 3 + cor) % (3 ** k)
+
+    def consultar(self, padrao):
+        """O que veio depois de `padrao` (cores em ordem cronológica)"""
+        k = len(padrao)
+        if not 1 <= k <= self.k_maximo:
+            raise ValueError(f"padrão deve ter de 1 a {self.k_maximo} cores")
+        return self._resultado(padrao, self.contagens[k][codificar(padrao)])
+
+    def consultar_atual(self, k):
+        """O que veio depois das últimas k cores do histórico"""
+        if k > len(self.ultimas):
+            return None
+        padrao = list(self.ultimas)[-k:]
+        return self._resultado(padrao, self.contagens[k][self._codigos[k]])
+
+    @staticmethod
+    def _resultado(padrao, contagem):
+        amostras = int(contagem.sum())
+        return {
+            'padrao': [int(c) for c in padrao],
+            'amostras': amostras,
+            'contagens': {cor: int(contagem[cor]) for cor in (0, 1, 2)},
+            'probabilidades': {cor: (float(contagem[cor] / amostras) if amostras else 0.0) for cor in (0, 1, 2)},
+        }
+
+    def taxas_base(self):
+        """Frequência de cada cor como sucessora em todo o histórico"""
+        contagem = self.contagens[1].sum(axis=0)
+        total = int(contagem.sum())
+        return {cor: (float(contagem[cor] / total) if total else 0.0) for cor in (0, 1, 2)}
+
+    def analisar(self, minimo_amostras=MINIMO_AMOSTRAS, z_minimo=Z_MINIMO, forca_priori=FORCA_PRIORI):
+        """Previsão pelo maior padrão atual que se afasta da taxa base (formato de analisar_padroes_avancada)
+
+        A confiança é a frequência encolhida para a taxa base; 'frequencia' é a bruta.
+        """
+        base = self.taxas_base()
+        for k in range(min(self.k_maximo, len(self.ultimas)), 0, -1):
+            resultado = self.consultar_atual(k)
+            amostras = resultado['amostras']
+            if amostras < minimo_amostras:
+                continue
+            contagens = resultado['contagens']
+            previsao = 1 if contagens[1] >= contagens[2] else 2
+            frequencia = resultado['probabilidades'][previsao]
+            taxa = base[previsao]
+            if not 0 < taxa < 1 or (frequencia - taxa) / math.sqrt(taxa * (1 - taxa) / amostras) < z_minimo:
+                continue
+            return {
+                'previsao': previsao,
+                'confianca': (contagens[previsao] + forca_priori * taxa) / (amostras + forca_priori),
+                'metodo': METODO_TRANSICAO,
+                'k': k,
+                'amostras': amostras,
+                'frequencia': frequencia,
+            }
+        return None
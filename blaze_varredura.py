@@ -0,0 +1,247 @@
+# BLAZE IA - VARREDURA DE PARÂMETROS DA CASCATA
+"""Avalia milhares de combinações de parâmetros da análise sobre o histórico salvo.
+
+O histórico de cores fica num bloco de memória compartilhada: cada processo
+trabalhador se conecta a ele uma vez e prepara as partes do backtest que não
+dependem dos parâmetros. As combinações que só mudam as confianças reaproveitam
+a mesma decisão. O resultado é uma tabela ordenada pela calibração
+(confiança declarada x acerto observado).
+
+Uso:
+    python blaze_varredura.py --db ia_data.db --saida varredura.csv
+    python blaze_varredura.py --modo aleatorio --amostras 5000
+"""
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from blaze_analise import METODOS, METODO_INICIAL, METODO_TENDENCIA_BLACK, METODO_TENDENCIA_RED, PARAMETROS_PADRAO
+from blaze_backtest import JANELA_DADOS, decidir, preparar_historico, tabela_confianca
+from blaze_politica import LIMIAR_CONFIANCA
+
+# Parâmetros que mudam a decisão; os demais só mudam a confiança declarada
+PARAMETROS_DECISAO = ('pesos', 'razao_tendencia', 'janela', 'corte_estatistica')
+PARAMETROS_CONFIANCA = ('confianca_longa', 'confianca_forte', 'confianca_media',
+                        'confianca_zebra', 'confianca_estatistica')
+
+GRADE = {
+    'passo_pesos': (0.1, 0.2, 0.3),
+    'razao_tendencia': (1.2, 1.4, 1.6, 1.8),
+    'janela': (10, 15, 20),
+    'corte_estatistica': (10, 15),
+    'confianca_longa': (0.92, 0.60),
+    'confianca_forte': (0.85, 0.58),
+    'confianca_media': (0.78, 0.55),
+    'confianca_zebra': (0.72, 0.52),
+    'confianca_estatistica': (0.65, 0.52),
+}
+
+FAIXAS_ALEATORIAS = {
+    'passo_pesos': (0.0, 0.3),
+    'razao_tendencia': (1.05, 2.5),
+    'janela': (5, JANELA_DADOS),
+    'corte_estatistica': (5, JANELA_DADOS),
+    'confianca_longa': (0.5, 0.95),
+    'confianca_forte': (0.5, 0.95),
+    'confianca_media': (0.5, 0.95),
+    'confianca_zebra': (0.5, 0.95),
+    'confianca_estatistica': (0.5, 0.95),
+}
+
+FAIXAS_CALIBRACAO = 10
+# critério: (campo, maior primeiro)
+ORDENACOES = {
+    'ece': ('ece', False),
+    'brier': ('brier', False),
+    'taxa': ('taxa', True),
+    'acima_limiar': ('taxa_acima_limiar', True),
+}
+
+
+def pesos_lineares(passo, inicio=2.0, quantidade=10):
+    """Decaimento linear como PESOS (2.0, 1.8, ...); passo 0 dá pesos iguais"""
+    return [round(max(0.0, inicio - passo * i), 4) for i in range(quantidade)]
+
+
+def gerar_grade(grade=GRADE):
+    combinacoes = itertools.product(*grade.values())
+    for valores in combinacoes:
+        p = dict(zip(grade, valores))
+        p['pesos'] = pesos_lineares(p.pop('passo_pesos'))
+        yield p
+
+
+def gerar_aleatorias(amostras, semente=0, faixas=FAIXAS_ALEATORIAS):
+    rng = np.random.default_rng(semente)
+    for _ in range(amostras):
+        p = {}
+        for nome, (minimo, maximo) in faixas.items():
+            if isinstance(minimo, int):
+                p[nome] = int(rng.integers(minimo, maximo + 1))
+            else:
+                p[nome] = round(float(rng.uniform(minimo, maximo)), 3)
+        p['pesos'] = pesos_lineares(p.pop('passo_pesos'))
+        yield p
+
+
+def agrupar_por_decisao(configuracoes):
+    """Junta as configurações com a mesma decisão; cada grupo é uma tarefa"""
+    grupos = {}
+    for p in configuracoes:
+        chave = tuple(tuple(p[k]) if k == 'pesos' else p[k] for k in PARAMETROS_DECISAO)
+        grupos.setdefault(chave, []).append(p)
+    return list(grupos.values())
+
+
+def calibracao(confianca, acertou, faixas=FAIXAS_CALIBRACAO):
+    """ECE (erro médio entre confiança e acerto por faixa), Brier e acerto acima do limiar"""
+    total = len(confianca)
+    if not total:
+        return {'previsoes': 0, 'ece': None, 'brier': None, 'taxa': None,
+                'confianca_declarada': None, 'apostas_acima_limiar': 0, 'taxa_acima_limiar': None}
+
+    faixa = np.minimum((confianca * faixas).astype(np.int64), faixas - 1)
+    soma_confianca = np.bincount(faixa, weights=confianca, minlength=faixas)
+    soma_acertos = np.bincount(faixa, weights=acertou, minlength=faixas)
+    ece = float(np.abs(soma_confianca - soma_acertos).sum() / total)
+
+    acima = confianca > LIMIAR_CONFIANCA
+    return {
+        'previsoes': total,
+        'ece': ece,
+        'brier': float(np.mean((confianca - acertou) ** 2)),
+        'taxa': float(acertou.mean()),
+        'confianca_declarada': float(confianca.mean()),
+        'apostas_acima_limiar': int(acima.sum()),
+        'taxa_acima_limiar': float(acertou[acima].mean()) if acima.any() else None,
+    }
+
+
+# ===== PROCESSO TRABALHADOR =====
+_memoria = None
+_preparado = None
+
+
+def _iniciar_trabalhador(nome_memoria, total, janela_dados):
+    """Conecta ao histórico compartilhado e prepara o backtest uma vez por processo"""
+    global _memoria, _preparado
+    _memoria = shared_memory.SharedMemory(name=nome_memoria)
+    cores = np.ndarray((total,), dtype=np.int8, buffer=_memoria.buf)
+    _preparado = preparar_historico(cores, janela_dados)
+
+
+def avaliar_grupo(grupo):
+    """Uma decisão da cascata, várias tabelas de confiança"""
+    resultado = decidir(_preparado, grupo[0], semente=0)
+    metodo = resultado['metodo'][:-1]
+    acertou = resultado['acertou'][:-1].astype(np.float64)
+
+    # A previsão inicial é sorteada; não entra na calibração
+    avaliadas = metodo != METODOS.index(METODO_INICIAL)
+    metodo, acertou = metodo[avaliadas], acertou[avaliadas]
+    tendencia = (metodo == METODOS.index(METODO_TENDENCIA_RED)) | (metodo == METODOS.index(METODO_TENDENCIA_BLACK))
+    confianca_tendencia = resultado['confianca'][:-1][avaliadas]
+
+    linhas = []
+    for p in grupo:
+        confianca = np.where(tendencia, confianca_tendencia, tabela_confianca(p)[metodo])
+        linhas.append(dict(p, **calibracao(confianca, acertou)))
+    return linhas
+
+
+def varrer(cores, configuracoes, processos=None, janela_dados=JANELA_DADOS):
+    """Avalia as configurações em paralelo sobre o histórico em memória compartilhada"""
+    cores = np.ascontiguousarray(cores, dtype=np.int8)
+    grupos = agrupar_por_decisao(configuracoes)
+    memoria = shared_memory.SharedMemory(create=True, size=max(1, cores.nbytes))
+    try:
+        np.ndarray(cores.shape, dtype=np.int8, buffer=memoria.buf)[:] = cores
+        argumentos = (memoria.name, len(cores), janela_dados)
+        if processos == 1:
+            _iniciar_trabalhador(*argumentos)
+            lotes = [avaliar_grupo(g) for g in grupos]
+        else:
+            with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_trabalhador,
+                                     initargs=argumentos) as executor:
+                lotes = list(executor.map(avaliar_grupo, grupos))
+    finally:
+        memoria.close()
+        memoria.unlink()
+    return [linha for lote in lotes for linha in lote]
+
+
+def ordenar(linhas, criterio='ece'):
+    """Ordena pelo critério de ORDENACOES; configurações sem valor vão para o fim"""
+    campo, decrescente = ORDENACOES[criterio]
+
+    def chave(linha):
+        valor = linha[campo]
+        if valor is None:
+            return (1, 0.0)
+        return (0, -valor if decrescente else valor)
+    return sorted(linhas, key=chave)
+
+
+def salvar_csv(linhas, caminho):
+    campos = ['posicao', 'ece', 'brier', 'taxa', 'confianca_declarada', 'previsoes',
+              'taxa_acima_limiar', 'apostas_acima_limiar'] + list(PARAMETROS_DECISAO + PARAMETROS_CONFIANCA)
+    with open(caminho, 'w', newline='') as f:
+        escritor = csv.DictWriter(f, fieldnames=campos, extrasaction='ignore')
+        escritor.writeheader()
+        for posicao, linha in enumerate(linhas, 1):
+            escritor.writerow(dict(linha, posicao=posicao, pesos=' '.join(f'{p:g}' for p in linha['pesos'])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros da análise de padrões")
+    parser.add_argument('--db', help="banco SQLite com o histórico real (padrão: sintético)")
+    parser.add_argument('--rodadas', type=int, default=200000, help="rodadas sintéticas quando não há --db")
+    parser.add_argument('--modo', choices=['grade', 'aleatorio'], default='grade')
+    parser.add_argument('--amostras', type=int, default=2000, help="configurações no modo aleatório")
+    parser.add_argument('--processos', type=int, default=os.cpu_count())
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--ordenar', choices=ORDENACOES, default='ece')
+    parser.add_argument('--saida', default='varredura.csv', help="tabela completa em CSV")
+    parser.add_argument('--top', type=int, default=10, help="linhas exibidas no terminal")
+    args = parser.parse_args()
+
+    if args.db:
+        from blaze_armazenamento import ArmazenamentoBlaze
+        cores = ArmazenamentoBlaze(args.db).carregar_colunas().cores
+    else:
+        from blaze_sintetico import gerar_jogos
+        cores = np.array([j['color'] for j in gerar_jogos(args.rodadas, semente=args.semente)], dtype=np.int8)
+
+    if args.modo == 'grade':
+        configuracoes = list(gerar_grade())
+    else:
+        configuracoes = list(gerar_aleatorias(args.amostras, args.semente))
+    configuracoes.append(dict(PARAMETROS_PADRAO))
+
+    inicio = time.perf_counter()
+    linhas = ordenar(varrer(cores, configuracoes, args.processos), args.ordenar)
+    duracao = time.perf_counter() - inicio
+    salvar_csv(linhas, args.saida)
+
+    print(f"🔍 {len(linhas)} configurações x {len(cores)} rodadas em {duracao:.1f}s")
+    padrao = next(i for i, linha in enumerate(linhas, 1) if linha['pesos'] == PARAMETROS_PADRAO['pesos']
+                  and all(linha[k] == v for k, v in PARAMETROS_PADRAO.items()))
+    for posicao, linha in enumerate(linhas[:args.top], 1):
+        acima = linha['taxa_acima_limiar']
+        print(f"{posicao:>4}. ECE {linha['ece']:.4f}  Brier {linha['brier']:.4f}  acerto {linha['taxa']:.1%}  "
+              f">{LIMIAR_CONFIANCA:.0%}: {linha['apostas_acima_limiar']} "
+              f"({'-' if acima is None else f'{acima:.1%}'})  "
+              f"razão {linha['razao_tendencia']}  janela {linha['janela']}  corte {linha['corte_estatistica']}  "
+              f"pesos {linha['pesos'][0]:g}..{linha['pesos'][-1]:g}")
+    print(f"⚙️ Parâmetros atuais na posição {padrao} de {len(linhas)}")
+    print(f"💾 Tabela completa em {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+# BLAZE IA - VERIFICAÇÃO PROVABLY FAIR (cadeia de server_seed)
+"""Confere em lote a cadeia de hashes das server_seed e o roll de cada rodada.
+
+A Blaze gera uma cadeia sha256 e a usa de trás para frente: a seed de uma
+rodada é o sha256 (do texto hex) da seed da rodada seguinte. Isso foi conferido
+no histórico real (ia_blaze_auto.pkl): 45 de 46 pares consecutivos batem e o
+restante é uma rodada que faltou na coleta.
+
+- Elo: sha256(seed[t+1]) == seed[t]. Se não bate mas bate depois de 2..SALTOS_MAXIMOS
+  hashes, é lacuna de coleta (rodadas faltando), não quebra.
+- Roll: HMAC-SHA256(server_seed, semente_cliente) -> 52 bits -> 0..14. Depende
+  da semente do cliente publicada pela Blaze; sem ela o roll não é conferido.
+- Cor: consistente com o roll (0 branco, 1-7 vermelho, 8-14 preto).
+
+Os trechos pendentes são conferidos em paralelo e os intervalos já verificados
+ficam no banco, então cada seed é verificada uma única vez. Só as rodadas fora
+desses intervalos saem do banco (ArmazenamentoBlaze.carregar_pendentes), e uma
+rodada inserida depois dentro de um intervalo (ex.: importada) o reabre.
+
+Uso:
+    python blaze_verificacao.py --db ia_data.db
+    python blaze_verificacao.py --db ia_data.db --semente-cliente <hex publicada>
+    python blaze_verificacao.py --sintetico 200000 --quebrar 5
+"""
+import argparse
+import hashlib
+import hmac
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from blaze_colunar import TAMANHO_SEED, HistoricoColunar
+from blaze_sintetico import ALFABETO_ID, cor_do_roll
+
+# Sem a semente do cliente só a cadeia e a cor x roll são conferidas
+SEMENTE_CLIENTE = None
+
+TAMANHO_TRECHO = 20000
+SALTOS_MAXIMOS = 10
+
+# Situação do elo de cada rodada com a seguinte
+ELO_PENDENTE = -1     # sem sucessor (rodada mais recente) ou sem seed
+ELO_OK = 0
+ELO_LACUNA = 1
+ELO_QUEBRA = 2
+
+
+def hash_anterior(seed):
+    """Seed da rodada anterior a partir da seed (hex) da rodada seguinte"""
+    return hashlib.sha256(seed.encode('ascii')).hexdigest()
+
+
+def roll_da_seed(seed, semente_cliente):
+    """Roll 0..14 a partir dos 52 primeiros bits do HMAC"""
+    digest = hmac.new(seed.encode('ascii'), semente_cliente.encode('ascii'), hashlib.sha256).hexdigest()
+    return (int(digest[:13], 16) * 15) >> 52
+
+
+def _seed_hex(seed):
+    # A coluna S32 do NumPy corta bytes nulos no final
+    return seed.ljust(TAMANHO_SEED, b'\0').hex() if seed else None
+
+
+def verificar_trecho(seeds, rolls, cores, semente_cliente=None, saltos_maximos=SALTOS_MAXIMOS):
+    """Confere as posições 0..n-2 de um trecho; a última só serve de sucessora
+
+    seeds: bytes (32) de cada rodada em ordem cronológica.
+    Retorna (elos, saltos, rolls_ok, cores_ok) para as n-1 primeiras posições.
+    """
+    n = len(seeds) - 1
+    elos = np.full(n, ELO_PENDENTE, dtype=np.int8)
+    saltos = np.zeros(n, dtype=np.int16)
+    rolls_ok = np.full(n, -1, dtype=np.int8)
+    cores_ok = np.zeros(n, dtype=bool)
+
+    seguinte = _seed_hex(seeds[0]) if n >= 0 else None
+    for i in range(n):
+        atual, seguinte = seguinte, _seed_hex(seeds[i + 1])
+        roll = int(rolls[i])
+        cores_ok[i] = cor_do_roll(roll) == int(cores[i])
+        if atual is None:
+            continue
+        if semente_cliente is not None:
+            rolls_ok[i] = roll_da_seed(atual, semente_cliente) == roll
+        if seguinte is None:
+            continue
+
+        candidato = hash_anterior(seguinte)
+        if candidato == atual:
+            elos[i] = ELO_OK
+            saltos[i] = 1
+            continue
+        elos[i] = ELO_QUEBRA
+        for salto in range(2, saltos_maximos + 1):
+            candidato = hash_anterior(candidato)
+            if candidato == atual:
+                elos[i] = ELO_LACUNA
+                saltos[i] = salto
+                break
+    return elos, saltos, rolls_ok, cores_ok
+
+
+def _verificar_trecho(argumentos):
+    return verificar_trecho(*argumentos)
+
+
+def _trechos(pendentes, tamanho):
+    """Divide as posições pendentes (ordenadas) em trechos contíguos de até `tamanho`"""
+    if not len(pendentes):
+        return []
+    quebras = np.flatnonzero(np.diff(pendentes) != 1) + 1
+    trechos = []
+    for bloco in np.split(pendentes, quebras):
+        for inicio in range(0, len(bloco), tamanho):
+            parte = bloco[inicio:inicio + tamanho]
+            trechos.append((int(parte[0]), int(parte[-1]) + 1))
+    return trechos
+
+
+def intervalos_cobertos(timestamps, intervalos):
+    """Máscara das posições dentro de algum intervalo [inicio_ms, fim_ms] já verificado"""
+    cobertas = np.zeros(len(timestamps), dtype=bool)
+    for inicio, fim in intervalos:
+        a = np.searchsorted(timestamps, inicio, side='left')
+        b = np.searchsorted(timestamps, fim, side='right')
+        cobertas[a:b] = True
+    return cobertas
+
+
+def _intervalos_da_mascara(timestamps, mascara):
+    posicoes = np.flatnonzero(mascara)
+    return [(int(timestamps[a]), int(timestamps[b - 1])) for a, b in _trechos(posicoes, len(timestamps) or 1)]
+
+
+def unir_intervalos(intervalos):
+    """Une intervalos [inicio_ms, fim_ms] que se sobrepõem ou encostam (ms inteiros)"""
+    unidos = []
+    for inicio, fim in sorted(intervalos):
+        if unidos and inicio <= unidos[-1][1] + 1:
+            unidos[-1][1] = max(unidos[-1][1], fim)
+        else:
+            unidos.append([inicio, fim])
+    return [tuple(intervalo) for intervalo in unidos]
+
+
+def recortar_intervalos(intervalos, inicio, fim):
+    """Tira [inicio, fim] dos intervalos (rodada nova: ela e a anterior voltam a pendentes)"""
+    restantes = []
+    for a, b in intervalos:
+        if b < inicio or a > fim:
+            restantes.append((a, b))
+            continue
+        if a < inicio:
+            restantes.append((a, inicio - 1))
+        if b > fim:
+            restantes.append((fim + 1, b))
+    return restantes
+
+
+def verificar_historico(colunas, semente_cliente=None, intervalos=(), processos=None,
+                        tamanho_trecho=TAMANHO_TRECHO):
+    """Confere tudo que ainda não está em `intervalos`; devolve intervalos novos e falhas
+
+    `colunas` pode ser o histórico inteiro ou só as rodadas pendentes com as
+    vizinhas cobertas (carregar_pendentes). A rodada mais recente fica pendente
+    até chegar a seguinte. Além da união com `intervalos`, devolve os trechos
+    cobertos entre as rodadas lidas (para o banco unir aos que já tem) e os
+    trechos conferidos nesta passada (onde as falhas antigas deixam de valer).
+    """
+    inicio_relogio = time.perf_counter()
+    n = len(colunas)
+    timestamps = colunas.timestamps
+    cobertas = intervalos_cobertos(timestamps, intervalos)
+    pendentes = np.flatnonzero(~cobertas[:max(0, n - 1)])
+    trechos = _trechos(pendentes, tamanho_trecho)
+
+    seeds, rolls, cores = colunas.seeds, colunas.rolls, colunas.cores
+    tarefas = [([bytes(s) for s in seeds[a:b + 1]], rolls[a:b].copy(), cores[a:b].copy(), semente_cliente)
+               for a, b in trechos]
+    if processos == 1 or len(tarefas) <= 1:
+        resultados = [verificar_trecho(*t) for t in tarefas]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            resultados = list(executor.map(_verificar_trecho, tarefas))
+
+    falhas = []
+    verificadas = np.zeros(n, dtype=bool)
+    contagem = {'elos_ok': 0, 'lacunas': 0, 'quebras': 0, 'rolls_errados': 0, 'cores_erradas': 0}
+    for (a, b), (elos, saltos, rolls_ok, cores_ok) in zip(trechos, resultados):
+        verificadas[a:b] = True
+        contagem['elos_ok'] += int((elos == ELO_OK).sum())
+        contagem['lacunas'] += int((elos == ELO_LACUNA).sum())
+        contagem['quebras'] += int((elos == ELO_QUEBRA).sum())
+        contagem['rolls_errados'] += int((rolls_ok == 0).sum())
+        contagem['cores_erradas'] += int((~cores_ok).sum())
+        for tipo, posicoes in (('quebra', np.flatnonzero(elos == ELO_QUEBRA)),
+                               ('lacuna', np.flatnonzero(elos == ELO_LACUNA)),
+                               ('roll', np.flatnonzero(rolls_ok == 0)),
+                               ('cor', np.flatnonzero(~cores_ok))):
+            for p in posicoes:
+                falhas.append({
+                    'id': colunas.ids[a + p].decode('ascii'),
+                    'timestamp_ms': int(timestamps[a + p]),
+                    'tipo': tipo,
+                    'detalhe': f"{int(saltos[p]) - 1} rodadas faltando" if tipo == 'lacuna' else '',
+                })
+
+    return dict(
+        contagem,
+        verificadas=int(verificadas.sum()),
+        intervalos=unir_intervalos(list(intervalos) + _intervalos_da_mascara(timestamps, cobertas | verificadas)),
+        trechos_cobertos=_intervalos_da_mascara(timestamps, cobertas | verificadas),
+        trechos_verificados=_intervalos_da_mascara(timestamps, verificadas),
+        falhas=falhas,
+        segundos=time.perf_counter() - inicio_relogio,
+    )
+
+
+def gerar_cadeia(quantidade, semente=0, semente_cliente='semente-cliente-sintetica',
+                 inicio=None, intervalo=30.0):
+    """Jogos sintéticos com cadeia sha256 válida e rolls derivados da seed (mais antigo primeiro)"""
+    rng = random.Random(semente)
+    cadeia = ['%064x' % rng.getrandbits(256)]
+    for _ in range(quantidade - 1):
+        cadeia.append(hash_anterior(cadeia[-1]))
+    # A última seed gerada é a da rodada mais antiga
+    instante = inicio or datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for seed in reversed(cadeia):
+        roll = roll_da_seed(seed, semente_cliente)
+        yield {
+            'id': ''.join(rng.choices(ALFABETO_ID, k=10)),
+            'created_at': instante.strftime('%Y-%m-%dT%H:%M:%S.') + f'{instante.microsecond // 1000:03d}Z',
+            'color': cor_do_roll(roll),
+            'roll': roll,
+            'server_seed': seed,
+        }
+        instante += timedelta(seconds=intervalo + rng.uniform(-0.5, 0.5))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verificação provably fair da cadeia de server_seed")
+    parser.add_argument('--db', default='ia_data.db')
+    parser.add_argument('--semente-cliente', default=SEMENTE_CLIENTE,
+                        help="semente do cliente publicada pela Blaze (sem ela o roll não é conferido)")
+    parser.add_argument('--processos', type=int, default=os.cpu_count())
+    parser.add_argument('--refazer', action='store_true', help="ignora os intervalos já verificados")
+    parser.add_argument('--sintetico', type=int, metavar='N', help="verifica uma cadeia sintética de N rodadas")
+    parser.add_argument('--quebrar', type=int, default=0, help="(sintético) seeds adulteradas e rodadas removidas")
+    args = parser.parse_args()
+
+    if args.sintetico:
+        semente_cliente = args.semente_cliente or 'semente-cliente-sintetica'
+        jogos = list(gerar_cadeia(args.sintetico, semente_cliente=semente_cliente))
+        rng = random.Random(1)
+        for _ in range(args.quebrar):
+            jogos[rng.randrange(len(jogos))]['server_seed'] = '%064x' % rng.getrandbits(256)
+            del jogos[rng.randrange(1, len(jogos) - 1)]
+        resultado = verificar_historico(HistoricoColunar.de_jogos(jogos), semente_cliente,
+                                        processos=args.processos)
+    else:
+        from blaze_armazenamento import ArmazenamentoBlaze
+        armazenamento = ArmazenamentoBlaze(args.db)
+        intervalos = () if args.refazer else armazenamento.intervalos_verificados(args.semente_cliente)
+        colunas, ultima_linha = armazenamento.carregar_pendentes(intervalos)
+        resultado = verificar_historico(colunas, args.semente_cliente, intervalos, processos=args.processos)
+        armazenamento.registrar_verificacao(resultado['trechos_cobertos'], resultado['falhas'], args.semente_cliente,
+                                            resultado['trechos_verificados'], ultima_linha)
+
+    print(f"🔐 {resultado['verificadas']} rodadas conferidas em {resultado['segundos']:.2f}s | "
+          f"elos ok {resultado['elos_ok']} | lacunas {resultado['lacunas']} | quebras {resultado['quebras']} | "
+          f"rolls errados {resultado['rolls_errados']} | cores erradas {resultado['cores_erradas']}")
+    for falha in resultado['falhas'][:20]:
+        quando = datetime.fromtimestamp(falha['timestamp_ms'] / 1000, tz=timezone.utc)
+        print(f"  ⚠️ {falha['tipo']:<7} {falha['id']} {quando:%Y-%m-%d %H:%M:%S} {falha['detalhe']}")
+    if resultado['quebras'] or resultado['rolls_errados'] or resultado['cores_erradas']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
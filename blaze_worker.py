@@ -0,0 +1,110 @@
+# BLAZE IA - WORKER DE LINHA DE COMANDO (sem Streamlit)
+"""Executa o ciclo busca -> análise -> persistência alinhado às rodadas, sem interface.
+
+Uso:
+    python blaze_worker.py                  # roda até Ctrl+C
+    python blaze_worker.py --ciclos 10
+    python blaze_worker.py --ciclos 0       # só mede a inicialização
+    python blaze_worker.py --gravar feed.jsonl.gz
+    python blaze_worker.py --replay feed.jsonl.gz --velocidade 0 --db replay.db
+    python blaze_worker.py --metricas-porta 9464     # Prometheus em /metrics
+"""
+import time
+
+_INICIO = time.perf_counter()
+
+import argparse
+import asyncio
+import logging
+
+from blaze_agendador import AgendadorRodadas
+from blaze_api import ClienteBlaze, URL_RECENTES
+from blaze_armazenamento import IA_DB_FILE
+from blaze_arquivo import RETENCAO_DIAS
+from blaze_manutencao import ManutencaoPeriodica
+from blaze_metricas import PORTA_PADRAO, iniciar_servidor
+from blaze_motor import BlazeIA_Final
+from blaze_replay import FonteReplay, GravadorFeed, reproduzir
+
+logger = logging.getLogger('blaze.worker')
+
+
+def criar_worker(caminho_db=IA_DB_FILE, url=URL_RECENTES, retencao_dias=RETENCAO_DIAS, gravar=None):
+    """Motor + cliente + agendador prontos para rodar (com `gravar`, cada resposta vai para o arquivo)"""
+    cliente = ClienteBlaze(url=url)
+    ia = BlazeIA_Final(caminho_db=caminho_db, retencao_dias=retencao_dias)
+    buscar = GravadorFeed(gravar).envolver(cliente.buscar) if gravar else cliente.buscar
+
+    def publicar(resultado):
+        previsao, dados = resultado
+        if previsao:
+            cor = 'VERMELHO' if previsao['previsao'] == 1 else 'PRETO'
+            logger.info("Ciclo #%d | rodada %s | previsão %s (%.0f%%) | %s | saldo R$ %.2f",
+                        ia.contador_atualizacoes, dados[0]['id'], cor,
+                        previsao['confianca'] * 100, previsao['metodo'], ia.saldo)
+
+    agendador = AgendadorRodadas(buscar, processar=ia.executar_ciclo_completo, publicar=publicar)
+    if len(ia.colunas):
+        # Retoma o alinhamento a partir do histórico salvo
+        agendador.registrar_jogos(ia.historico.recentes(agendador.instantes.maxlen))
+        agendador.ultimo_id = ia.historico.ultimo['id']
+    return ia, cliente, agendador
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker headless da Blaze IA")
+    parser.add_argument('--db', default=IA_DB_FILE, help="banco SQLite de estado")
+    parser.add_argument('--url', default=URL_RECENTES, help="endpoint de jogos recentes")
+    parser.add_argument('--ciclos', type=int, default=None, help="quantidade de ciclos (padrão: infinito)")
+    parser.add_argument('--retencao-dias', type=int, default=RETENCAO_DIAS,
+                        help="previsões/apostas mais antigas vão para o arquivo comprimido")
+    parser.add_argument('--gravar', metavar='ARQUIVO', help="grava cada resposta da API (.jsonl.gz)")
+    parser.add_argument('--replay', metavar='ARQUIVO', help="reproduz uma gravação em vez de consultar a API")
+    parser.add_argument('--velocidade', type=float, default=1.0,
+                        help="(replay) 1 = tempo real, 0 = o mais rápido possível")
+    parser.add_argument('--metricas-porta', type=int, nargs='?', const=PORTA_PADRAO, metavar='PORTA',
+                        help=f"liga as métricas e serve /metrics (padrão {PORTA_PADRAO})")
+    parser.add_argument('--log', default='INFO', help="nível de log")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log.upper(), format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    if args.metricas_porta:
+        iniciar_servidor(args.metricas_porta)
+        logger.info("Métricas em http://127.0.0.1:%d/metrics", args.metricas_porta)
+
+    # Arquivamento e verificação das seeds numa thread própria, fora do ciclo
+    manutencao = ManutencaoPeriodica(args.db, args.retencao_dias)
+
+    if args.replay:
+        ia = BlazeIA_Final(caminho_db=args.db, retencao_dias=args.retencao_dias)
+        manutencao.iniciar()
+        r = reproduzir(ia, FonteReplay(args.replay, args.velocidade), args.ciclos)
+        logger.info("Replay: %d ciclos em %.1fs (%.1f/s) | saldo R$ %.2f",
+                    r['ciclos'], r['segundos'], r['ciclos_por_segundo'], ia.saldo)
+        manutencao.parar(timeout=5)
+        ia.fechar()
+        return
+
+    ia, cliente, agendador = criar_worker(args.db, args.url, args.retencao_dias, args.gravar)
+    logger.info("Worker pronto em %.0f ms (%d jogos, %d previsões carregados)",
+                (time.perf_counter() - _INICIO) * 1000, len(ia.colunas), len(ia.previsoes))
+
+    if args.ciclos == 0:
+        ia.fechar()
+        return
+    manutencao.iniciar()
+    try:
+        asyncio.run(agendador.executar(ciclos=args.ciclos))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manutencao.parar(timeout=5)
+        api = cliente.estatisticas()
+        logger.info("Encerrado: %d ciclos, %d requisições, atraso médio %s",
+                    ia.contador_atualizacoes, api['requisicoes'],
+                    f"{agendador.atraso_medio():.1f}s" if agendador.atraso_medio() is not None else "n/d")
+        ia.fechar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from blaze_agendador import AgendadorRodadas, estimar_intervalo, proxima_rodada
+from blaze_colunar import ms_para_iso
+from blaze_sintetico import gerar_jogos
+
+INICIO = 1_750_000_000.0
+
+
+class RelogioFalso:
+    def __init__(self, agora=INICIO):
+        self.agora = agora
+
+    def __call__(self):
+        return self.agora
+
+    async def dormir(self, segundos):
+        self.agora += segundos
+
+
+class FeedFalso:
+    """Rodadas que aparecem na API no próprio created_at; registra o instante de cada busca"""
+
+    def __init__(self, relogio, instantes):
+        self.relogio = relogio
+        self.jogos = [dict(jogo, created_at=ms_para_iso(int(instante * 1000)))
+                      for jogo, instante in zip(gerar_jogos(len(instantes)), instantes)]
+        self.instantes = instantes
+        self.buscas = []
+
+    def __call__(self):
+        agora = self.relogio()
+        self.buscas.append(agora)
+        visiveis = [j for j, instante in zip(self.jogos, self.instantes) if instante <= agora]
+        return visiveis[::-1][:20]
+
+
+def agendar(instantes, ciclos):
+    relogio = RelogioFalso()
+    feed = FeedFalso(relogio, instantes)
+    publicados = []
+    agendador = AgendadorRodadas(feed, publicar=publicados.append, relogio=relogio, dormir=relogio.dormir)
+    asyncio.run(agendador.executar(ciclos=ciclos))
+    return agendador, feed, publicados
+
+
+def test_estimativa_pela_mediana():
+    assert estimar_intervalo([0, 30, 60, 100, 130]) == 30
+    assert estimar_intervalo([]) == 30.0
+    assert proxima_rodada([0, 30, 60], agora=75) == 90
+    assert proxima_rodada([0, 30, 60], agora=151) == 180
+
+
+def test_buscas_alinhadas_ao_intervalo_das_rodadas():
+    instantes = [INICIO - 300 + 30 * i for i in range(30)]
+    agendador, feed, publicados = agendar(instantes, ciclos=15)
+
+    # Depois do primeiro ciclo: uma busca por rodada, folga segundos após o created_at
+    rodadas = [c for c in list(agendador.ciclos)[1:] if c['novo']]
+    assert len(rodadas) == 14
+    for ciclo in rodadas:
+        assert ciclo['inicio'] - ciclo['rodada_prevista'] == pytest.approx(agendador.folga)
+    intervalos = [b - a for a, b in zip(feed.buscas[1:], feed.buscas[2:])]
+    assert intervalos == pytest.approx([30.0] * len(intervalos))
+
+    # Atraso ponta a ponta registrado em cada ciclo
+    assert all(c['atraso'] == pytest.approx(agendador.folga) for c in rodadas)
+    assert agendador.atraso_medio() is not None
+    assert len(publicados) == 15
+
+
+def test_rodada_atrasada_ressincroniza_o_agendamento():
+    instantes = [INICIO - 300 + 30 * i for i in range(15)]
+    atraso = 6.0
+    instantes += [instantes[-1] + 30 * i + atraso for i in range(1, 15)]
+    agendador, feed, _ = agendar(instantes, ciclos=12)
+
+    ciclos = list(agendador.ciclos)
+    atrasada = next(c for c in ciclos if c['rodada_prevista'] == instantes[14] + 30)
+    # Rodada prevista não apareceu: repete a busca a cada segundo até ela chegar
+    assert atrasada['novo']
+    assert 0 <= atrasada['atraso'] <= agendador.repetir_a_cada
+    assert atraso - agendador.folga <= atrasada['duracao'] <= atraso - agendador.folga + agendador.repetir_a_cada
+
+    # Ciclos seguintes acordam pela rodada atrasada, não pelo horário antigo
+    seguintes = ciclos[ciclos.index(atrasada) + 1:]
+    assert seguintes
+    for ciclo in seguintes:
+        assert ciclo['novo']
+        assert ciclo['duracao'] == 0
+        assert (ciclo['inicio'] - instantes[0] - atraso) % 30 == pytest.approx(agendador.folga)
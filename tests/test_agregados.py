@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from blaze_agregados import LACUNA_MAXIMA, AgregadosTempo
+from blaze_colunar import HistoricoColunar
+from blaze_sintetico import gerar_jogos
+
+INICIO = datetime(2025, 1, 1, tzinfo=timezone.utc)
+ROLL_DA_COR = {0: 0, 1: 3, 2: 11}
+
+
+def rodadas(segundos_e_cores):
+    """Jogos mínimos a partir de (segundos desde INICIO, cor)"""
+    jogos = []
+    for i, (segundos, cor) in enumerate(segundos_e_cores):
+        instante = INICIO + timedelta(seconds=segundos)
+        jogos.append({'id': f'r{i:05d}', 'created_at': instante.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                      'color': cor, 'roll': ROLL_DA_COR[cor], 'server_seed': '0' * 64})
+    return jogos
+
+
+def alimentado(jogos, limite_minutos):
+    agregados = AgregadosTempo(limite_minutos)
+    for jogo in jogos:
+        agregados.alimentar([jogo])
+    return agregados
+
+
+def assert_series_iguais(incremental, lote, ultimos=None):
+    for nome, serie in lote.series.items():
+        esperado = serie.intervalo()
+        obtido = incremental.series[nome].intervalo()
+        if ultimos and nome == 'minuto':
+            # O incremental descarta em blocos: guarda entre o limite e o dobro dele
+            assert ultimos <= len(obtido['inicios']) <= 2 * ultimos
+            obtido = {chave: valores[-ultimos:] for chave, valores in obtido.items()}
+        for chave in esperado:
+            assert np.array_equal(obtido[chave], esperado[chave]), (nome, chave)
+
+
+def test_de_colunas_igual_a_alimentar_rodada_a_rodada_depois_do_corte():
+    # 3000 rodadas a cada 30s = 25 h: o limite de 60 baldes de minuto corta várias vezes
+    jogos = list(gerar_jogos(3000, semente=4))
+    incremental = alimentado(jogos, limite_minutos=60)
+    lote = AgregadosTempo.de_colunas(HistoricoColunar.de_jogos(jogos), limite_minutos=60)
+    assert len(lote.series['minuto']) == 60
+    assert len(lote.series['hora']) == 25
+    assert_series_iguais(incremental, lote, ultimos=60)
+    assert incremental._desde_branco == lote._desde_branco
+
+    # E continuam iguais recebendo o resto (o lote segue sendo alimentado)
+    mais = list(gerar_jogos(200, semente=5, inicio=INICIO + timedelta(days=2)))
+    incremental.alimentar(mais)
+    lote.alimentar(mais)
+    completo = AgregadosTempo.de_colunas(HistoricoColunar.de_jogos(jogos + mais), limite_minutos=60)
+    assert_series_iguais(incremental, completo, ultimos=60)
+    assert_series_iguais(lote, completo, ultimos=60)
+
+
+def test_rodada_atrasada_abre_balde_no_meio():
+    # Minutos 0 e 2 primeiro; a rodada do minuto 1 chega depois
+    jogos = rodadas([(0, 0), (10, 1), (125, 2), (130, 1), (70, 2), (140, 2)])
+    agregados = alimentado(jogos, limite_minutos=None)
+    minutos = agregados.consultar('minuto')
+    assert list(minutos['inicios'] - minutos['inicios'][0]) == [0, 60, 120]
+    assert minutos['cores'].tolist() == [[1, 1, 0], [0, 0, 1], [0, 1, 2]]
+
+    ordenados = sorted(jogos, key=lambda j: j['created_at'])
+    lote = AgregadosTempo.de_colunas(HistoricoColunar.de_jogos(ordenados), limite_minutos=None)
+    assert_series_iguais(agregados, lote)
+    assert agregados.series['minuto'].balde(INICIO.timestamp() + 65) == 1
+
+
+def test_lacunas_entre_brancos_atravessam_baldes():
+    # Branco no minuto 0, 5 rodadas, branco no minuto 1; 50 rodadas e um branco no minuto 30
+    sequencia = [(0, 0)] + [(10 + 5 * i, 1) for i in range(5)] + [(61, 0)]
+    sequencia += [(90 + 30 * i, 2) for i in range(50)] + [(1800 + 90, 0)]
+    jogos = rodadas(sequencia)
+    agregados = alimentado(jogos, limite_minutos=None)
+
+    for nome in ('minuto', 'hora'):
+        serie = agregados.consultar(nome)
+        lacunas = serie['lacunas'].sum(axis=0)
+        assert lacunas[5] == 1 and lacunas[LACUNA_MAXIMA] == 1 and lacunas.sum() == 2
+    minutos = agregados.consultar('minuto')
+    # Cada lacuna conta no balde do branco que a fecha
+    assert minutos['lacunas'][1, 5] == 1
+    assert minutos['lacunas'][-1, LACUNA_MAXIMA] == 1
+    assert minutos['lacunas'][0].sum() == 0
+
+    lote = AgregadosTempo.de_colunas(HistoricoColunar.de_jogos(jogos), limite_minutos=None)
+    assert_series_iguais(agregados, lote)
+    assert agregados._desde_branco == lote._desde_branco == 0
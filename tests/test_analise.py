@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from blaze_analise import (
+    METODO_INICIAL, PARAMETROS_PADRAO, AnalisadorIncremental, analisar_padroes_avancada,
+)
+from blaze_backtest import verificar_equivalencia
+from blaze_sintetico import gerar_jogos
+from blaze_varredura import gerar_aleatorias
+
+PARAMETROS = [None] + list(gerar_aleatorias(4, semente=11))
+
+
+def comparar_incremental(jogos, parametros, janela_dados=20):
+    analisador = AnalisadorIncremental(janela_dados, parametros)
+    for t, jogo in enumerate(jogos):
+        analisador.alimentar([jogo])
+        dados = jogos[max(0, t - janela_dados + 1):t + 1][::-1]
+        esperado = analisar_padroes_avancada(dados, parametros)
+        obtido = analisador.prever()
+        if esperado['metodo'] == METODO_INICIAL:
+            assert obtido['metodo'] == METODO_INICIAL
+        else:
+            assert obtido == esperado, t
+
+
+@pytest.mark.parametrize('parametros', PARAMETROS)
+def test_incremental_igual_a_analise_escalar(parametros):
+    comparar_incremental(list(gerar_jogos(1500, semente=5)), parametros)
+
+
+@pytest.mark.parametrize('parametros', PARAMETROS)
+def test_backtest_segue_os_parametros(parametros):
+    cores = np.array([j['color'] for j in gerar_jogos(1500, semente=6)], dtype=np.int8)
+    assert verificar_equivalencia(cores, amostras=len(cores), parametros=parametros) == []
+
+
+def test_analise_le_parametros_padrao(monkeypatch):
+    # Cinco vermelhos seguidos: a confiança declarada vem de PARAMETROS_PADRAO
+    dados = [{'id': str(i), 'color': 1} for i in range(8)]
+    monkeypatch.setitem(PARAMETROS_PADRAO, 'confianca_longa', 0.61)
+    assert analisar_padroes_avancada(dados)['confianca'] == 0.61
+    analisador = AnalisadorIncremental()
+    analisador.alimentar(dados)
+    assert analisador.prever()['confianca'] == 0.61
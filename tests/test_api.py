@@ -0,0 +1,172 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from blaze_api import ClienteBlaze, ErroAPIBlaze
+from blaze_metricas import registro
+from blaze_sintetico import gerar_jogos
+
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self):
+        return self.agora
+
+
+class ServidorFalso:
+    """API local: cada GET consome a próxima resposta (status, corpo, cabeçalhos)"""
+
+    def __init__(self):
+        self.respostas = []
+        self.requisicoes = 0
+        servidor = self
+
+        class Manipulador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                servidor.requisicoes += 1
+                status, corpo, cabecalhos = servidor.respostas.pop(0)
+                dados = json.dumps(corpo).encode('utf-8')
+                self.send_response(status)
+                for nome, valor in cabecalhos.items():
+                    self.send_header(nome, valor)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def log_message(self, formato, *args):
+                pass
+
+        self.http = ThreadingHTTPServer(('127.0.0.1', 0), Manipulador)
+        self.url = f'http://127.0.0.1:{self.http.server_port}/recent/1'
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+
+    def responder(self, corpo, status=200, **cabecalhos):
+        self.respostas.append((status, corpo, cabecalhos))
+
+    def fechar(self):
+        self.http.shutdown()
+        self.http.server_close()
+
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorFalso()
+    yield servidor
+    servidor.fechar()
+
+
+@pytest.fixture
+def relogio():
+    return RelogioFalso()
+
+
+def rodadas(semente):
+    return list(reversed(list(gerar_jogos(20, semente))))
+
+
+def test_acerto_de_cache_dentro_do_ttl(servidor, relogio):
+    cliente = ClienteBlaze(url=servidor.url, ttl=5.0, relogio=relogio)
+    servidor.responder(rodadas(1))
+    primeira = cliente.buscar()
+    relogio.agora += 4.9
+    assert cliente.buscar() is primeira
+    assert servidor.requisicoes == 1
+    assert cliente.estatisticas()['acertos_cache'] == 1
+
+    servidor.responder(rodadas(2))
+    relogio.agora += 0.2
+    assert cliente.buscar()[0]['id'] != primeira[0]['id']
+    assert servidor.requisicoes == 2
+    cliente.fechar()
+
+
+def test_rodada_repetida_reaproveita_a_lista(servidor, relogio):
+    cliente = ClienteBlaze(url=servidor.url, ttl=5.0, relogio=relogio)
+    jogos = rodadas(1)
+    servidor.responder(jogos)
+    servidor.responder(jogos)
+    primeira = cliente.buscar()
+    relogio.agora += 6
+    assert cliente.buscar() is primeira
+    estatisticas = cliente.estatisticas()
+    assert estatisticas['repetidos'] == 1
+    assert estatisticas['requisicoes'] == 2
+
+    # A repetida não renova o TTL: a nova tentativa logo depois vai à rede e pega a rodada nova
+    novas = rodadas(2)
+    servidor.responder(novas)
+    relogio.agora += 1
+    assert cliente.buscar() == novas
+    assert servidor.requisicoes == 3
+    assert cliente.estatisticas()['acertos_cache'] == 0
+    cliente.fechar()
+
+
+def test_429_com_retry_after_serve_o_cache(servidor, relogio, monkeypatch):
+    monkeypatch.setattr(registro, 'ativo', True)
+    registro.limpar()
+    cliente = ClienteBlaze(url=servidor.url, ttl=5.0, backoff_inicial=1.0, relogio=relogio)
+    servidor.responder(rodadas(1))
+    primeira = cliente.buscar()
+
+    relogio.agora += 6
+    servidor.responder({'erro': 'limite'}, status=429, **{'Retry-After': '30'})
+    with pytest.raises(ErroAPIBlaze, match='429'):
+        cliente.buscar()
+
+    # Dentro do Retry-After (maior que o backoff de 1s) não vai à rede e serve o cache
+    relogio.agora += 20
+    assert cliente.buscar() is primeira
+    assert servidor.requisicoes == 2
+    estatisticas = cliente.estatisticas()
+    assert estatisticas['limitados'] == 1
+    assert estatisticas['falhas_seguidas'] == 1
+    assert registro.resumo()['contadores']['acertos_cache_api'] == 1
+
+    relogio.agora += 11
+    servidor.responder(rodadas(2))
+    assert cliente.buscar()[0]['id'] != primeira[0]['id']
+    assert cliente.estatisticas()['falhas_seguidas'] == 0
+    cliente.fechar()
+
+
+def test_backoff_sem_cache_levanta_erro(servidor, relogio):
+    cliente = ClienteBlaze(url=servidor.url, relogio=relogio)
+    servidor.responder({}, status=500)
+    with pytest.raises(ErroAPIBlaze, match='500'):
+        cliente.buscar()
+    with pytest.raises(ErroAPIBlaze, match='backoff'):
+        cliente.buscar()
+    assert servidor.requisicoes == 1
+    cliente.fechar()
+
+
+def test_lock_livre_durante_a_requisicao(servidor, relogio):
+    cliente = ClienteBlaze(url=servidor.url, relogio=relogio)
+    servidor.responder(rodadas(1))
+    primeira = cliente.buscar()
+    relogio.agora += 6
+
+    liberado = threading.Event()
+    durante = {}
+    get_original = cliente.sessao.get
+
+    def get_lento(*args, **kwargs):
+        # Outra sessão consulta no meio da requisição: recebe o cache sem esperar
+        durante['lock_livre'] = not cliente._lock.locked()
+        durante['dados'] = cliente.buscar()
+        liberado.set()
+        return get_original(*args, **kwargs)
+
+    cliente.sessao.get = get_lento
+    servidor.responder(rodadas(2))
+    nova = cliente.buscar()
+    assert liberado.is_set()
+    assert durante == {'lock_livre': True, 'dados': primeira}
+    assert nova[0]['id'] != primeira[0]['id']
+    cliente.fechar()
@@ -0,0 +1,146 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+import blaze_armazenamento
+from blaze_armazenamento import ArmazenamentoBlaze
+from blaze_arquivo import ler_segmento
+
+INICIO = datetime(2025, 1, 1)
+CORTE = INICIO + timedelta(days=30)
+
+
+def apostas(quantidade, inicio, passo=timedelta(hours=1)):
+    return [{'timestamp': inicio + passo * i, 'valor': 10.0, 'previsao': 1, 'resultado': 'ganhou',
+             'lucro': 9.0, 'confianca': 0.7, 'metodo': 'teste', 'n': i} for i in range(quantidade)]
+
+
+def todas_as_paginas(armazenamento, tabela, tamanho=50):
+    registros, cursor = armazenamento.pagina(tabela, tamanho=tamanho)
+    while cursor is not None:
+        pagina, cursor = armazenamento.pagina(tabela, cursor, tamanho=tamanho)
+        registros += pagina
+    return registros
+
+
+@pytest.fixture
+def armazenamento(tmp_path):
+    armazenamento = ArmazenamentoBlaze(str(tmp_path / 'ia_data.db'))
+    yield armazenamento
+    armazenamento.fechar()
+
+
+def test_seq_nao_reaproveitado_depois_de_arquivar_tudo(armazenamento, tmp_path):
+    antigas = apostas(157, INICIO)
+    armazenamento.registrar(apostas=antigas)
+    assert armazenamento.compactar(CORTE, str(tmp_path / 'arquivo'))['apostas'] == 157
+
+    novas = apostas(22, CORTE + timedelta(days=1))
+    armazenamento.registrar(apostas=novas)
+    registros = todas_as_paginas(armazenamento, 'apostas')
+    assert len(registros) == 179
+    assert len({r['seq'] for r in registros}) == 179
+    assert [r['n'] for r in registros] == [a['n'] for a in reversed(antigas + novas)]
+
+
+def test_migra_tabelas_sem_autoincremento(tmp_path):
+    caminho = str(tmp_path / 'antigo.db')
+    conexao = sqlite3.connect(caminho)
+    for tabela in ('previsoes', 'apostas'):
+        conexao.execute(f"CREATE TABLE {tabela} (seq INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, dados TEXT NOT NULL)")
+        conexao.execute(f"CREATE INDEX idx_{tabela}_timestamp ON {tabela} (timestamp)")
+    conexao.commit()
+    conexao.close()
+
+    armazenamento = ArmazenamentoBlaze(caminho)
+    armazenamento.registrar(apostas=apostas(30, INICIO))
+    armazenamento.compactar(CORTE, str(tmp_path / 'arquivo'))
+    # Banco antigo com a tabela já vazia: o contador tem que vir dos segmentos
+    armazenamento._conexao.execute("DELETE FROM sqlite_sequence")
+    armazenamento._conexao.execute("DROP TABLE apostas")
+    armazenamento._conexao.execute(
+        "CREATE TABLE apostas (seq INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, dados TEXT NOT NULL)")
+    armazenamento._conexao.commit()
+    armazenamento.fechar()
+
+    armazenamento = ArmazenamentoBlaze(caminho)
+    sql = armazenamento._conexao.execute("SELECT sql FROM sqlite_master WHERE name = 'apostas'").fetchone()[0]
+    assert 'AUTOINCREMENT' in sql
+    indices = [n for (n,) in armazenamento._conexao.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'apostas'")]
+    assert indices == ['idx_apostas_timestamp']
+
+    armazenamento.registrar(apostas=apostas(5, CORTE + timedelta(days=1)))
+    registros = todas_as_paginas(armazenamento, 'apostas', tamanho=7)
+    assert len(registros) == 35
+    assert min(r['seq'] for r in registros[:5]) == 31
+    armazenamento.fechar()
+
+
+def test_recompactar_nao_duplica_nem_sobrescreve(armazenamento, tmp_path):
+    diretorio = str(tmp_path / 'arquivo')
+    armazenamento.registrar(apostas=apostas(10, INICIO))
+    linhas = armazenamento._conexao.execute("SELECT seq, dados FROM apostas").fetchall()
+    armazenamento.compactar(CORTE, diretorio)
+    # Compactação interrompida: as mesmas linhas de volta ao banco e arquivadas de novo
+    armazenamento._conexao.executemany(
+        "INSERT INTO apostas (seq, timestamp, dados) VALUES (?, '2025-01-01', ?)", linhas)
+    armazenamento._conexao.commit()
+    armazenamento.compactar(CORTE, diretorio)
+    segmento = armazenamento.segmentos('apostas')[0]
+    assert list(ler_segmento(segmento['caminho'])) == linhas
+    assert segmento['registros'] == 10
+
+
+def test_registrar_devolve_seq_e_carregar_traz_seq(armazenamento):
+    seqs = armazenamento.registrar(apostas=apostas(3, INICIO))
+    assert seqs == {'previsoes': [], 'apostas': [1, 2, 3]}
+    assert armazenamento.registrar(apostas=apostas(2, INICIO))['apostas'] == [4, 5]
+    dados = armazenamento.carregar(limite_registros=2)
+    assert [a['seq'] for a in dados['apostas']] == [4, 5]
+
+
+def test_paginas_profundas_abrem_so_os_segmentos_necessarios(armazenamento, tmp_path, monkeypatch):
+    # 60 dias, 24 apostas por dia: 60 segmentos diários arquivados
+    armazenamento.registrar(apostas=apostas(24 * 60, INICIO))
+    armazenamento.compactar(INICIO + timedelta(days=60), str(tmp_path / 'arquivo'))
+    segmentos = armazenamento.segmentos('apostas')
+    assert len(segmentos) == 60
+    faixas = armazenamento._conexao.execute(
+        "SELECT seq_min, seq_max FROM segmentos WHERE tabela = 'apostas' ORDER BY periodo").fetchall()
+    assert faixas[0] == (1, 24) and faixas[-1] == (24 * 59 + 1, 24 * 60)
+
+    abertos = []
+
+    def ler_contando(caminho):
+        abertos.append(caminho)
+        return ler_segmento(caminho)
+
+    monkeypatch.setattr(blaze_armazenamento, 'ler_segmento', ler_contando)
+    registros, cursor = armazenamento.pagina('apostas', antes_de=24 * 10 + 5, tamanho=10)
+    assert [r['seq'] for r in registros] == list(range(24 * 10 + 4, 24 * 10 - 6, -1))
+    assert cursor == 24 * 10 - 5
+    # Só os dois dias que a página cruza (dias 10 e 11), nada dos 49 mais novos
+    assert abertos == [segmentos[10]['caminho'], segmentos[9]['caminho']]
+
+    abertos.clear()
+    assert [r['seq'] for r in todas_as_paginas(armazenamento, 'apostas', tamanho=50)] == list(range(24 * 60, 0, -1))
+    assert len(abertos) < 2 * 60
+
+
+def test_migra_segmentos_sem_faixa_de_seq(armazenamento, tmp_path):
+    armazenamento.registrar(apostas=apostas(48, INICIO))
+    armazenamento.compactar(CORTE, str(tmp_path / 'arquivo'))
+    # Banco de antes das colunas seq_min/seq_max
+    armazenamento._conexao.execute("ALTER TABLE segmentos DROP COLUMN seq_min")
+    armazenamento._conexao.execute("ALTER TABLE segmentos DROP COLUMN seq_max")
+    armazenamento._conexao.commit()
+    armazenamento.fechar()
+
+    armazenamento = ArmazenamentoBlaze(armazenamento.caminho)
+    faixas = armazenamento._conexao.execute(
+        "SELECT seq_min, seq_max FROM segmentos ORDER BY periodo").fetchall()
+    assert faixas == [(1, 24), (25, 48)]
+    assert len(todas_as_paginas(armazenamento, 'apostas', tamanho=7)) == 48
+    armazenamento.fechar()
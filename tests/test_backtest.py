@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from blaze_backtest import verificar_equivalencia
+from blaze_sintetico import gerar_jogos
+
+
+def cores_sinteticas(quantidade, semente):
+    return np.array([j['color'] for j in gerar_jogos(quantidade, semente)], dtype=np.int8)
+
+
+@pytest.mark.parametrize('semente', [0, 1, 2])
+def test_backtest_igual_a_analise_escalar(semente):
+    cores = cores_sinteticas(3000, semente)
+    assert verificar_equivalencia(cores, amostras=len(cores), semente=semente) == []
+
+
+def test_backtest_igual_a_analise_escalar_com_muito_branco():
+    # ~40% de brancos: exercita os ramos de sequência e zebra que ignoram o branco
+    cores = cores_sinteticas(3000, 7)
+    rng = np.random.default_rng(7)
+    cores[rng.random(len(cores)) < 0.4] = 0
+    assert verificar_equivalencia(cores, amostras=len(cores)) == []
+
+
+def test_backtest_igual_a_analise_escalar_em_janelas_curtas():
+    cores = cores_sinteticas(500, 3)
+    assert verificar_equivalencia(cores, janela_dados=6, amostras=len(cores)) == []
@@ -0,0 +1,106 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from blaze_api import ErroAPIBlaze
+from blaze_coletor import ColetorCompartilhado
+from blaze_sintetico import gerar_jogos
+
+
+class ClienteFalso:
+    """Responde as listas na ordem (a última se repete); exceções na lista são levantadas"""
+
+    def __init__(self, *respostas):
+        self.respostas = list(respostas)
+        self.chamadas = 0
+
+    def buscar(self):
+        self.chamadas += 1
+        resposta = self.respostas.pop(0) if len(self.respostas) > 1 else self.respostas[0]
+        if isinstance(resposta, Exception):
+            raise resposta
+        return resposta
+
+
+def rodadas(semente, inicio=None):
+    return list(reversed(list(gerar_jogos(20, semente, inicio=inicio))))
+
+
+def test_versao_sobe_so_com_jogo_novo():
+    primeira, segunda = rodadas(1), rodadas(2)
+    cliente = ClienteFalso(primeira, list(primeira), ErroAPIBlaze("HTTP 503"), segunda)
+    coletor = ColetorCompartilhado(cliente.buscar, alinhar_rodadas=False)
+    assert coletor.snapshot()['versao'] == 0
+
+    coletor.atualizar()
+    snapshot = coletor.snapshot()
+    assert snapshot['versao'] == 1 and snapshot['dados'] is primeira
+
+    coletor.atualizar()   # mesma rodada mais recente: não é versão nova
+    assert coletor.snapshot()['versao'] == 1
+
+    coletor.atualizar()   # erro: mantém os dados e avisa
+    snapshot = coletor.snapshot()
+    assert snapshot['versao'] == 1 and snapshot['erro'] == "HTTP 503"
+    assert snapshot['dados'][0]['id'] == primeira[0]['id']
+
+    coletor.atualizar()
+    snapshot = coletor.snapshot()
+    assert snapshot['versao'] == 2 and snapshot['dados'] is segunda and snapshot['erro'] is None
+    assert cliente.chamadas == 4
+
+
+def test_varios_leitores_uma_busca():
+    cliente = ClienteFalso(rodadas(3))
+    coletor = ColetorCompartilhado(cliente.buscar, intervalo=60, alinhar_rodadas=False)
+    lidos = []
+
+    def sessao():
+        lidos.append(coletor.aguardar(timeout=5))
+        # Leituras seguintes são do snapshot, sem ir à API
+        for _ in range(10):
+            lidos.append(coletor.snapshot())
+
+    sessoes = [threading.Thread(target=sessao) for _ in range(8)]
+    for thread in sessoes:
+        thread.start()
+    coletor.iniciar()
+    for thread in sessoes:
+        thread.join(5)
+    coletor.parar(timeout=5)
+
+    assert len(lidos) == 88
+    assert all(snapshot['versao'] == 1 and snapshot['dados'] is lidos[0]['dados'] for snapshot in lidos)
+    assert cliente.chamadas == 1
+
+
+def test_parar_encerra_a_thread_logo():
+    cliente = ClienteFalso(rodadas(4))
+    coletor = ColetorCompartilhado(cliente.buscar, intervalo=60, alinhar_rodadas=False).iniciar()
+    coletor.aguardar(timeout=5)
+    inicio = time.perf_counter()
+    coletor.parar(timeout=5)
+    assert not coletor._thread.is_alive()
+    assert time.perf_counter() - inicio < 1
+
+    # Pode ser reiniciado depois de parado
+    coletor.iniciar()
+    assert coletor.aguardar(timeout=5, versao_minima=1)['versao'] == 1
+    coletor.parar(timeout=5)
+    assert not coletor._thread.is_alive()
+
+
+def test_parar_interrompe_a_espera_pela_proxima_rodada():
+    # Rodada mais recente agora: o agendador dorme ~30s até a próxima
+    recentes = rodadas(5, inicio=datetime.now(timezone.utc) - timedelta(seconds=19 * 30))
+    cliente = ClienteFalso(recentes)
+    coletor = ColetorCompartilhado(cliente.buscar).iniciar()
+    assert coletor.aguardar(timeout=5)['versao'] == 1
+    assert coletor.segundos_ate_proxima() > 5
+    time.sleep(0.3)   # já dormindo até a próxima rodada
+
+    inicio = time.perf_counter()
+    coletor.parar(timeout=5)
+    assert not coletor._thread.is_alive()
+    assert time.perf_counter() - inicio < 1
+    assert cliente.chamadas == 1
@@ -0,0 +1,45 @@
+import pytest
+
+from blaze_colunar import HistoricoColunar
+from blaze_sintetico import gerar_jogos
+
+
+def test_estender_fatia_vazia():
+    jogos = list(gerar_jogos(5, semente=1))
+    colunas = HistoricoColunar.de_jogos(jogos)
+    vazia = colunas.fatia(2, 2)
+    vazia.adicionar(jogos[0])
+    vazia.estender(jogos[1:])
+    assert vazia.para_jogos() == jogos
+    assert colunas.para_jogos() == jogos
+
+
+def test_estender_historico_vazio():
+    jogos = list(gerar_jogos(3, semente=2))
+    colunas = HistoricoColunar.de_jogos([])
+    colunas.estender(jogos)
+    assert len(colunas) == 3
+    assert colunas.para_jogos() == jogos
+
+
+def test_jogo_fora_do_historico():
+    colunas = HistoricoColunar.de_jogos(gerar_jogos(3, semente=3))
+    assert colunas.jogo(-1) == colunas.jogo(2)
+    with pytest.raises(IndexError):
+        colunas.jogo(3)
+    with pytest.raises(IndexError):
+        colunas.jogo(-4)
+    with pytest.raises(IndexError):
+        HistoricoColunar().jogo(0)
+
+
+def test_rodadas_atrasadas_entram_em_ordem():
+    jogos = list(gerar_jogos(40, semente=4))
+    colunas = HistoricoColunar.de_jogos(jogos[:20] + jogos[25:30])
+    # Lote fora de ordem com rodadas mais antigas que as últimas gravadas
+    posicao = colunas.estender([jogos[30], jogos[22], jogos[31], jogos[20], jogos[21], jogos[23], jogos[24]])
+    assert posicao == 20
+    assert colunas.para_jogos() == jogos[:32]
+    # Lote em ordem depois do fim: caminho comum
+    assert colunas.estender(jogos[32:]) == 32
+    assert colunas.para_jogos() == jogos
@@ -0,0 +1,77 @@
+import pytest
+
+from blaze_historico import HISTORICO_MAXIMO, HistoricoJogos
+from blaze_sintetico import gerar_jogos
+
+
+def test_deduplica_pelo_id_dentro_e_entre_lotes():
+    jogos = list(gerar_jogos(30, semente=1))
+    historico = HistoricoJogos(jogos[:20])
+    # A API manda do mais recente para o mais antigo, repetindo boa parte do lote anterior
+    lote = list(reversed(jogos[10:30])) + [jogos[25], dict(jogos[5])]
+    novos = historico.adicionar(lote)
+    assert novos == jogos[20:30]
+    assert len(historico) == 30
+    assert historico.adicionar(reversed(jogos)) == []
+    assert list(historico) == jogos
+    assert jogos[3]['id'] in historico and jogos[3] in historico
+    assert historico[jogos[3]['id']] is jogos[3]
+
+
+def test_lote_repetido_ou_em_ordem_nao_percorre_o_historico(monkeypatch):
+    jogos = list(gerar_jogos(5001, semente=2))
+    historico = HistoricoJogos(jogos[:5000])
+
+    def reordenar():
+        raise AssertionError("jogo repetido ou em ordem não deveria reordenar o histórico")
+
+    monkeypatch.setattr(historico, '_reordenar', reordenar)
+    assert historico.adicionar(historico.recentes(20)) == []
+    assert historico.adicionar([jogos[5000]] + historico.recentes(19)) == [jogos[5000]]
+    assert historico.desde(jogos[4999]['id']) == [jogos[5000]]
+
+
+def test_jogo_atrasado_entra_na_ordem_de_created_at():
+    jogos = list(gerar_jogos(12, semente=4))
+    historico = HistoricoJogos(jogos[:5] + jogos[7:])
+    assert historico.adicionar([jogos[6], jogos[5]]) == [jogos[5], jogos[6]]
+    assert list(historico) == jogos
+    assert historico.ultimo is jogos[-1]
+    assert historico.recentes(3) == [jogos[11], jogos[10], jogos[9]]
+    # Posições refeitas: desde() continua certo depois da reordenação
+    assert historico.desde(jogos[4]['id']) == jogos[5:]
+    assert historico.desde(jogos[6]['id']) == jogos[7:]
+
+
+def test_desde():
+    jogos = list(gerar_jogos(10, semente=5))
+    historico = HistoricoJogos(jogos)
+    assert historico.desde(jogos[6]['id']) == jogos[7:]
+    assert historico.desde(jogos[-1]['id']) == []
+    assert historico.desde('desconhecido') == jogos
+    assert HistoricoJogos().desde('x') == []
+
+
+def test_limite_descarta_os_mais_antigos_e_desde_segue_certo():
+    jogos = list(gerar_jogos(1000, semente=6))
+    historico = HistoricoJogos(limite=100)
+    for inicio in range(0, len(jogos), 7):
+        historico.adicionar(jogos[inicio:inicio + 7])
+        assert len(historico) == min(100, inicio + 7, len(jogos))
+    assert list(historico) == jogos[-100:]
+    assert jogos[899]['id'] not in historico
+    # Depois de compactar a lista de ids, as posições continuam valendo
+    assert historico.desde(jogos[950]['id']) == jogos[951:]
+    assert historico.desde(jogos[899]['id']) == jogos[-100:]
+
+
+@pytest.mark.parametrize('excesso', [1, 250])
+def test_limite_padrao_de_50_mil(excesso):
+    jogos = list(gerar_jogos(HISTORICO_MAXIMO + excesso, semente=7))
+    historico = HistoricoJogos(jogos[:HISTORICO_MAXIMO])
+    assert len(historico) == HISTORICO_MAXIMO
+    assert historico.adicionar(jogos[HISTORICO_MAXIMO:]) == jogos[HISTORICO_MAXIMO:]
+    assert len(historico) == HISTORICO_MAXIMO
+    assert next(iter(historico)) is jogos[excesso]
+    assert jogos[excesso - 1]['id'] not in historico
+    assert historico.ultimo is jogos[-1]
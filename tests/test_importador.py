@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from blaze_armazenamento import ArmazenamentoBlaze
+from blaze_importador import RodadaInvalida, gerar_dump, importar, validar
+from blaze_sintetico import gerar_jogos
+
+
+@pytest.fixture
+def armazenamento(tmp_path):
+    armazenamento = ArmazenamentoBlaze(str(tmp_path / 'ia_data.db'))
+    yield armazenamento
+    armazenamento.fechar()
+
+
+def test_validar_rejeita_id_fora_do_ascii():
+    jogo = next(gerar_jogos(1))
+    with pytest.raises(RodadaInvalida, match='id'):
+        validar(dict(jogo, id='rodadaçã'))
+    with pytest.raises(RodadaInvalida, match='id'):
+        validar(dict(jogo, id='x' * 17))
+    assert validar(dict(jogo, id='x' * 16))[0] == 'x' * 16
+
+
+@pytest.mark.parametrize('seed', [12345, ['ab'] * 32, 'ab' * 31, 'zz' * 32])
+def test_validar_rejeita_server_seed_invalida(seed):
+    with pytest.raises(RodadaInvalida, match='server_seed'):
+        validar(dict(next(gerar_jogos(1)), server_seed=seed))
+
+
+def test_importa_jsonl_com_linhas_invalidas(tmp_path, armazenamento):
+    jogos = list(gerar_jogos(20))
+    linhas = [json.dumps(j).encode('utf-8') for j in jogos]
+    linhas[3] = b'{"id": "\xff\xfe", "created_at": "2025-01-01T00:00:00.000Z"}'
+    linhas[5] = json.dumps(dict(jogos[5], id='jogoção')).encode('utf-8')
+    linhas[7] = json.dumps(dict(jogos[7], server_seed=42)).encode('utf-8')
+    caminho = tmp_path / 'dump.jsonl'
+    caminho.write_bytes(b'\n'.join(linhas) + b'\n')
+
+    resultado = importar(str(caminho), armazenamento)
+    assert resultado['lidas'] == 20
+    assert resultado['importadas'] == 17
+    assert resultado['invalidas'] == {'formato': 1, 'id': 1, 'server_seed': 1}
+    # Tudo que entrou no banco cabe nas colunas
+    assert len(armazenamento.carregar_colunas()) == 17
+
+
+def test_importa_csv_com_linha_fora_do_utf8(tmp_path, armazenamento):
+    caminho = tmp_path / 'dump.csv'
+    gerar_dump(str(caminho), 10)
+    linhas = caminho.read_bytes().splitlines(keepends=True)
+    linhas[4] = linhas[4].replace(b',', b'\xe9,', 1)
+    caminho.write_bytes(b''.join(linhas))
+
+    resultado = importar(str(caminho), armazenamento)
+    assert resultado['lidas'] == 10
+    assert resultado['importadas'] == 9
+    assert resultado['invalidas'] == {'formato': 1}
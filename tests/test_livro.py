@@ -0,0 +1,87 @@
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import blaze_painel
+from blaze_livro import TOTAL, LivroEstatisticas
+
+INICIO = datetime(2024, 3, 1, 12, 0)
+METODOS = ['Sequência Longa (4+)', 'Probabilístico Ajustado', 'Transições k=3']
+
+
+def fluxo(n, semente):
+    """Previsões e apostas aleatórias, na ordem em que são registradas; algumas chegam fora de ordem"""
+    aleatorio = random.Random(semente)
+    eventos = []
+    for i in range(n):
+        instante = INICIO + timedelta(seconds=30 * i - aleatorio.choice([0, 0, 0, 90]))
+        metodo = aleatorio.choice(METODOS)
+        eventos.append(('previsao', {'timestamp': instante, 'metodo': metodo,
+                                     'acertou': aleatorio.choice([True, False, None])}))
+        if aleatorio.random() < 0.6:
+            valor = round(aleatorio.uniform(1, 50), 2)
+            resultado = aleatorio.choice(['ganhou', 'perdeu'])
+            eventos.append(('aposta', {'timestamp': instante, 'metodo': metodo, 'valor': valor,
+                                       'resultado': resultado,
+                                       'lucro': valor if resultado == 'ganhou' else -valor}))
+    return eventos
+
+
+def registrar(livros, eventos, previsoes, apostas):
+    for tipo, registro in eventos:
+        for livro in livros:
+            if tipo == 'previsao':
+                livro.registrar_previsao(registro)
+            else:
+                livro.registrar_aposta(registro)
+        (previsoes if tipo == 'previsao' else apostas).append(registro)
+
+
+def conferir(livro, previsoes, apostas, agora):
+    for metodo in [TOTAL] + METODOS:
+        do_metodo = lambda registros: [r for r in registros if metodo == TOTAL or r['metodo'] == metodo]
+        esperado = blaze_painel.resumo_apostas(do_metodo(apostas))
+        obtido = livro.resumo_apostas(metodo)
+        assert obtido == pytest.approx(esperado)
+        assert livro.precisao_previsoes(metodo) == blaze_painel.precisao_previsoes(do_metodo(previsoes))
+    assert livro.total_apostas() == len(apostas)
+    assert livro.total_previsoes() == len(previsoes)
+    for minutos in (2, 10):
+        recentes = livro.apostas_recentes(agora, minutos)
+        esperadas = blaze_painel.apostas_recentes(apostas, agora, minutos)
+        assert sorted(map(id, recentes)) == sorted(map(id, esperadas))
+        assert [a['timestamp'] for a in recentes] == sorted(a['timestamp'] for a in esperadas)
+
+
+def test_livro_equivale_as_funcoes_do_painel():
+    eventos = fluxo(600, semente=3)
+    livro = LivroEstatisticas()
+    previsoes, apostas = [], []
+    for inicio in range(0, len(eventos), 97):
+        registrar([livro], eventos[inicio:inicio + 97], previsoes, apostas)
+        conferir(livro, previsoes, apostas, previsoes[-1]['timestamp'])
+    agora = previsoes[-1]['timestamp']
+    conferir(LivroEstatisticas(previsoes, apostas), previsoes, apostas, agora)
+    assert livro.metodos() == sorted(METODOS, key=lambda m: -sum(a['metodo'] == m for a in apostas))
+
+
+def test_instantaneo_ida_e_volta():
+    eventos = fluxo(400, semente=8)
+    livro = LivroEstatisticas()
+    previsoes, apostas = [], []
+    registrar([livro], eventos[:500], previsoes, apostas)
+    corte = previsoes[-1]['timestamp'] - timedelta(minutes=10)
+
+    # Como o motor grava e relê: totais em JSON, recentes pela cauda do banco
+    gravado = json.loads(json.dumps(livro.instantaneo()))
+    restaurado = LivroEstatisticas.de_instantaneo(gravado, [a for a in apostas if a['timestamp'] >= corte])
+    livro.descartar_antes(corte)
+    assert restaurado.instantaneo() == livro.instantaneo()
+    assert restaurado.apostas_recentes(corte, 0) == livro.apostas_recentes(corte, 0)
+
+    # Os dois seguem iguais recebendo o resto do fluxo
+    registrar([livro, restaurado], eventos[500:], previsoes, apostas)
+    conferir(restaurado, previsoes, apostas, previsoes[-1]['timestamp'])
+    assert restaurado.instantaneo() == livro.instantaneo()
@@ -0,0 +1,44 @@
+import time
+from datetime import datetime, timedelta
+
+from blaze_armazenamento import ArmazenamentoBlaze
+from blaze_manutencao import ManutencaoPeriodica
+from blaze_motor import CICLOS_ENTRE_COMPACTACOES, BlazeIA_Final
+from blaze_sintetico import gerar_jogos, gerar_previsoes_e_apostas
+
+
+def test_arquiva_fora_do_ciclo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    caminho_db = str(tmp_path / 'ia_data.db')
+    previsoes, apostas = gerar_previsoes_e_apostas(50, inicio=datetime.now() - timedelta(days=30))
+    ArmazenamentoBlaze(caminho_db).registrar(previsoes=previsoes, apostas=apostas)
+
+    def proibido(*args, **kwargs):
+        raise AssertionError("compactar no ciclo")
+
+    ia = BlazeIA_Final(caminho_db=caminho_db, notificar=lambda *_: None)
+    with monkeypatch.context() as m:
+        m.setattr(ia.armazenamento, 'compactar', proibido)
+        jogos = list(gerar_jogos(CICLOS_ENTRE_COMPACTACOES + 20, inicio=datetime.now()))
+        for i in range(CICLOS_ENTRE_COMPACTACOES):
+            assert ia.executar_ciclo_completo(jogos[i:i + 20][::-1])[0] is not None
+    # O recorte da memória continua no ciclo: nada além do horizonte
+    corte = datetime.now() - timedelta(days=ia.retencao_dias)
+    assert all(p['timestamp'] >= corte for p in ia.previsoes)
+
+    manutencao = ManutencaoPeriodica(caminho_db, diretorio_arquivo=str(tmp_path / 'arquivo'))
+    resultado = manutencao.executar_agora()
+    assert resultado['erro'] is None
+    assert resultado['arquivados']['previsoes'] == 50
+    assert manutencao.ultima()['arquivados'] == resultado['arquivados']
+    assert len(manutencao.armazenamento.segmentos('previsoes')) >= 1
+
+
+def test_thread_roda_e_para(tmp_path):
+    manutencao = ManutencaoPeriodica(str(tmp_path / 'ia_data.db'), intervalo=60).iniciar()
+    limite = time.time() + 10
+    while manutencao.ultima()['concluida_em'] is None and time.time() < limite:
+        time.sleep(0.01)
+    manutencao.parar(timeout=5)
+    assert manutencao.ultima()['concluida_em'] is not None
+    assert not manutencao._thread.is_alive()
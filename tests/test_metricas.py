@@ -0,0 +1,106 @@
+import re
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+import blaze_metricas
+from blaze_metricas import RegistroMetricas, contar, cronometro, definir
+
+LINHA_AMOSTRA = re.compile(r'^[a-z_]+(\{[a-z]+="[^"]*"(,[a-z]+="[^"]*")*\})? -?[0-9.e+-]+$')
+
+
+@pytest.fixture
+def global_limpo():
+    """O registro global volta como estava (desligado por padrão nos testes)"""
+    ativo = blaze_metricas.registro.ativo
+    blaze_metricas.registro.limpar()
+    yield blaze_metricas.registro
+    blaze_metricas.registro.ativo = ativo
+    blaze_metricas.registro.limpar()
+
+
+def test_contadores_medidores_e_percentis_da_janela():
+    registro = RegistroMetricas(ativo=True, janela=10)
+    valores = [0.001 * i for i in range(1, 26)]
+    for valor in valores:
+        registro.observar('analise', valor)
+    registro.observar('busca', 0.2)
+    registro.contar('jogos_novos')
+    registro.contar('jogos_novos', 4)
+    registro.definir('jogos_em_memoria', 100)
+    registro.definir('jogos_em_memoria', 120)
+
+    resumo = registro.resumo()
+    analise = resumo['etapas']['analise']
+    # Percentis só das últimas 10; contagem e soma de todas
+    esperados = np.quantile(valores[-10:], [0.5, 0.95, 0.99])
+    assert [analise['p50'], analise['p95'], analise['p99']] == pytest.approx(esperados)
+    assert analise['contagem'] == 25
+    assert analise['soma'] == pytest.approx(sum(valores))
+    assert list(resumo['etapas']) == ['analise', 'busca']
+    assert resumo['contadores'] == {'jogos_novos': 5}
+    assert resumo['medidores'] == {'jogos_em_memoria': 120}
+
+    registro.limpar()
+    assert registro.resumo() == {'etapas': {}, 'contadores': {}, 'medidores': {}}
+
+
+def test_desligado_usa_o_cronometro_nulo(global_limpo):
+    blaze_metricas.ativar(False)
+    assert cronometro('analise') is cronometro('busca')
+    with cronometro('analise'):
+        pass
+    contar('jogos_novos', 3)
+    definir('jogos_em_memoria', 7)
+    assert global_limpo.resumo() == {'etapas': {}, 'contadores': {}, 'medidores': {}}
+
+    blaze_metricas.ativar()
+    with cronometro('analise'):
+        pass
+    contar('jogos_novos', 3)
+    definir('jogos_em_memoria', 7)
+    resumo = global_limpo.resumo()
+    assert resumo['etapas']['analise']['contagem'] == 1
+    assert resumo['contadores'] == {'jogos_novos': 3}
+    assert resumo['medidores'] == {'jogos_em_memoria': 7}
+
+
+def test_formato_texto_do_prometheus():
+    registro = RegistroMetricas(ativo=True, janela=4)
+    for valor in (0.5, 0.25, 0.125, 1.0):
+        registro.observar('merge', valor)
+    registro.contar('acertos_cache_api', 2)
+    registro.definir('colunas_bytes', 4096)
+
+    texto = registro.prometheus()
+    assert texto.endswith('\n')
+    linhas = texto.splitlines()
+    assert linhas[:2] == ['# HELP blaze_etapa_segundos Latência por etapa do ciclo (últimas 4 medições)',
+                          '# TYPE blaze_etapa_segundos summary']
+    assert 'blaze_etapa_segundos{etapa="merge",quantile="0.5"} 0.375000000' in linhas
+    assert 'blaze_etapa_segundos_sum{etapa="merge"} 1.875000000' in linhas
+    assert 'blaze_etapa_segundos_count{etapa="merge"} 4' in linhas
+    assert linhas[-4:] == ['# TYPE blaze_acertos_cache_api_total counter', 'blaze_acertos_cache_api_total 2',
+                           '# TYPE blaze_colunas_bytes gauge', 'blaze_colunas_bytes 4096']
+    for linha in linhas:
+        assert linha.startswith('#') or LINHA_AMOSTRA.match(linha), linha
+
+
+def test_endpoint_metrics(global_limpo):
+    blaze_metricas.ativar(False)
+    servidor = blaze_metricas.iniciar_servidor(0)
+    try:
+        assert global_limpo.ativo
+        contar('respostas_repetidas')
+        url = f'http://127.0.0.1:{servidor.server_address[1]}'
+        with urllib.request.urlopen(url + '/metrics', timeout=5) as resposta:
+            assert resposta.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            assert 'blaze_respostas_repetidas_total 1' in resposta.read().decode('utf-8').splitlines()
+        with pytest.raises(urllib.error.HTTPError) as erro:
+            urllib.request.urlopen(url + '/outro', timeout=5)
+        assert erro.value.code == 404
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
@@ -0,0 +1,123 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from blaze_armazenamento import ArmazenamentoBlaze
+from blaze_motor import BlazeIA_Final, EstadoJogos, abrir_armazenamento
+from blaze_sintetico import gerar_jogos
+
+
+@pytest.fixture
+def caminho_db(tmp_path, monkeypatch):
+    # Sem pickles legados no diretório atual
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / 'ia_data.db')
+
+
+def test_falha_ao_carregar_nao_sobrescreve_o_estado(caminho_db, monkeypatch):
+    ia = BlazeIA_Final(caminho_db=caminho_db, notificar=lambda *_: None)
+    ia.saldo = 1234.5
+    ia.contador_atualizacoes = 77
+    ia.salvar_dados()
+    ia.armazenamento.fechar()
+
+    def falhar(*args, **kwargs):
+        raise RuntimeError("banco indisponível")
+
+    avisos = []
+    with monkeypatch.context() as m:
+        m.setattr(ArmazenamentoBlaze, 'carregar', falhar)
+        ia = BlazeIA_Final(caminho_db=caminho_db, notificar=lambda nivel, msg: avisos.append(nivel))
+    assert 'erro' in avisos
+    ia.contador_atualizacoes += 1
+    ia.alternar_modo_auto()
+    ia.salvar_dados()
+    ia.armazenamento.fechar()
+
+    ia = BlazeIA_Final(caminho_db=caminho_db, notificar=lambda *_: None)
+    assert ia.saldo == 1234.5
+    assert ia.contador_atualizacoes == 77
+    assert ia.modo_auto is False
+
+
+def test_registros_salvos_ganham_seq_e_a_pagina_continua_abaixo(caminho_db):
+    ia = BlazeIA_Final(caminho_db=caminho_db, notificar=lambda *_: None)
+    agora = datetime.now()
+    for i in range(250):
+        ia.apostas.append({'timestamp': agora - timedelta(minutes=250 - i), 'valor': 1.0, 'n': i})
+    ia.salvar_dados()
+    # Passou de 2x a cauda: ficam as últimas em memória, já com seq
+    assert [a['n'] for a in ia.apostas] == list(range(150, 250))
+    assert [a['seq'] for a in ia.apostas] == list(range(151, 251))
+
+    registros, _ = ia.armazenamento.pagina('apostas', ia.apostas[0]['seq'])
+    assert registros[0]['n'] == 149
+    ia.armazenamento.fechar()
+
+
+def test_rodada_atrasada_reconstroi_o_que_depende_da_ordem(caminho_db):
+    jogos = list(gerar_jogos(300, semente=5))
+    ia = BlazeIA_Final(caminho_db=caminho_db, notificar=lambda *_: None)
+    ia.registrar_jogos(jogos[:150] + jogos[160:])
+    ia.registrar_jogos(jogos[150:160])
+    ia.salvar_dados()
+    ia.armazenamento.fechar()
+
+    recarregada = BlazeIA_Final(caminho_db=caminho_db, notificar=lambda *_: None)
+    assert ia.colunas.para_jogos() == recarregada.colunas.para_jogos() == jogos
+    for k in range(1, ia.transicoes.k_maximo + 1):
+        assert (ia.transicoes.contagens[k] == recarregada.transicoes.contagens[k]).all()
+    for nome, serie in ia.agregados.series.items():
+        esperado = recarregada.agregados.consultar(nome)
+        for chave, valores in serie.intervalo().items():
+            assert (valores == esperado[chave]).all()
+    assert list(ia.analisador._janela) == list(recarregada.analisador._janela)
+    assert ia.analisador.ultimo_id == recarregada.analisador.ultimo_id == jogos[-1]['id']
+    recarregada.armazenamento.fechar()
+
+
+def test_sessoes_dividem_os_jogos_sem_reler_o_banco(caminho_db, monkeypatch):
+    jogos = list(gerar_jogos(300, semente=9))
+    ia = BlazeIA_Final(caminho_db=caminho_db, notificar=lambda *_: None)
+    ia.registrar_jogos(jogos[:200])
+    ia.salvar_dados()
+    ia.armazenamento.fechar()
+
+    compartilhado = EstadoJogos()
+    primeira = BlazeIA_Final(caminho_db=caminho_db, notificar=lambda *_: None, jogos=compartilhado)
+    assert len(primeira.colunas) == 200
+
+    def falhar(*args, **kwargs):
+        raise AssertionError("sessão nova releu os jogos")
+
+    monkeypatch.setattr(ArmazenamentoBlaze, 'carregar_colunas', falhar)
+    monkeypatch.setattr(ArmazenamentoBlaze, 'carregar_historico', falhar)
+    segunda = BlazeIA_Final(caminho_db=caminho_db, notificar=lambda *_: None, jogos=compartilhado)
+    assert segunda.colunas is primeira.colunas
+    assert segunda.transicoes is primeira.transicoes
+
+    # O jogo novo entra uma vez: quem o viu primeiro grava, a outra sessão já o enxerga
+    assert len(primeira.registrar_jogos(jogos[200:])) == 100
+    assert segunda.registrar_jogos(jogos[200:]) == []
+    assert segunda.historico.ultimo['id'] == jogos[-1]['id']
+    primeira.salvar_dados()
+    segunda.salvar_dados()
+    assert primeira.armazenamento.contar_jogos() == 300
+    primeira.armazenamento.fechar()
+    segunda.armazenamento.fechar()
+
+
+def test_conexao_compartilhada_fica_aberta_e_a_propria_fecha(caminho_db):
+    armazenamento = abrir_armazenamento(caminho_db)
+    sessoes = [BlazeIA_Final(notificar=lambda *_: None, armazenamento=armazenamento) for _ in range(3)]
+    assert all(ia.armazenamento is armazenamento for ia in sessoes)
+    for ia in sessoes:
+        ia.fechar()
+    assert armazenamento.contar_jogos() == 0
+    armazenamento.fechar()
+
+    ia = BlazeIA_Final(caminho_db=caminho_db, notificar=lambda *_: None)
+    ia.fechar()
+    with pytest.raises(sqlite3.ProgrammingError):
+        ia.armazenamento.contar_jogos()
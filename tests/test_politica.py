@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+import blaze_motor
+from blaze_montecarlo import resumir, simular, simular_lote
+from blaze_motor import BlazeIA_Final
+from blaze_politica import (
+    FATOR_CHANCE_REAL, LIMIAR_CONFIANCA, SALDO_MINIMO, deve_apostar, valor_aposta, valores_aposta,
+)
+from blaze_sintetico import gerar_jogos
+
+CONFIANCAS = np.array([0.58, 0.65, 0.75, 0.78, 0.85, 0.92, 1.0])
+
+
+@pytest.mark.parametrize('semente', [0, 1, 2])
+def test_valores_aposta_igual_a_politica_escalar(semente):
+    rng = np.random.default_rng(semente)
+    saldos = np.concatenate([rng.uniform(0, 5000, 2000), [SALDO_MINIMO, SALDO_MINIMO + 0.01, 0.0, 2000.0]])
+    confiancas = np.concatenate([rng.uniform(0.5, 1.0, 2000), [LIMIAR_CONFIANCA, 0.9, 0.99, LIMIAR_CONFIANCA + 1e-9]])
+    valores = valores_aposta(saldos, confiancas)
+    for saldo, confianca, valor in zip(saldos.tolist(), confiancas.tolist(), valores.tolist()):
+        esperado = valor_aposta(saldo, confianca) if deve_apostar(saldo, confianca) else 0.0
+        assert valor == esperado
+
+
+def test_caminho_do_monte_carlo_igual_ao_motor(tmp_path, monkeypatch):
+    """Os sorteios de um caminho, passados ao motor, levam ao mesmo saldo"""
+    monkeypatch.chdir(tmp_path)
+    probabilidades = np.full(len(CONFIANCAS), 1 / len(CONFIANCAS))
+    chances = CONFIANCAS * FATOR_CHANCE_REAL
+    rodadas = 150
+    simulado = simular_lote(CONFIANCAS, probabilidades, chances, 1, rodadas, semente=7)
+
+    # Mesma sequência de sorteios de simular_lote: índice da confiança e depois o resultado
+    rng = np.random.default_rng(7)
+    acumulada = np.cumsum(probabilidades)
+    sorteios = []
+    for _ in range(rodadas):
+        indice = min(int(np.searchsorted(acumulada, rng.random(1), side='right')[0]), len(CONFIANCAS) - 1)
+        sorteios.append((float(CONFIANCAS[indice]), float(rng.random(1)[0])))
+
+    ia = BlazeIA_Final(caminho_db=str(tmp_path / 'ia.db'), notificar=lambda *_: None)
+    jogos = list(reversed(list(gerar_jogos(rodadas + 20, semente=3))))
+    # O motor só sorteia o resultado quando aposta; o Monte Carlo sorteia em toda rodada
+    rodada = {}
+    monkeypatch.setattr(ia, 'prever', lambda dados: {'previsao': 1, 'confianca': rodada['confianca'],
+                                                     'metodo': 'MC'})
+    monkeypatch.setattr(blaze_motor.random, 'random', lambda: rodada['resultado'])
+    for i, (confianca, resultado) in enumerate(sorteios):
+        rodada.update(confianca=confianca, resultado=resultado)
+        previsao, _ = ia.executar_ciclo_completo(jogos[rodadas - i:rodadas - i + 20])
+        assert previsao is not None
+    ia.fechar()
+
+    assert ia.saldo == pytest.approx(simulado['saldo'][0], rel=1e-12)
+    assert ia.livro.total_apostas() == simulado['apostas'][0]
+
+
+def test_monte_carlo_pequeno_reproduzivel():
+    probabilidades = np.array([0.3, 0.2, 0.1, 0.15, 0.1, 0.1, 0.05])
+    chances = CONFIANCAS * FATOR_CHANCE_REAL
+    resultado = simular(CONFIANCAS, probabilidades, chances, caminhos=250, rodadas=200,
+                        processos=1, semente=11, caminhos_por_lote=100)
+    assert all(len(valores) == 250 for valores in resultado.values())
+    assert np.all(resultado['saldo'] >= 0)
+    assert np.all((resultado['drawdown'] >= 0) & (resultado['drawdown'] <= 1))
+    assert np.all(resultado['apostas'] <= 200)
+
+    de_novo = simular(CONFIANCAS, probabilidades, chances, caminhos=250, rodadas=200,
+                      processos=1, semente=11, caminhos_por_lote=100)
+    assert np.array_equal(resultado['saldo'], de_novo['saldo'])
+
+    resumo = resumir(resultado)
+    assert resumo['caminhos'] == 250
+    assert 0 <= resumo['risco_de_ruina'] <= 1 and 0 <= resumo['prob_lucro'] <= 1
+    assert list(resumo['saldo_final']) == ['p1', 'p5', 'p25', 'p50', 'p75', 'p95', 'p99']
+    assert resumo['saldo_final']['p1'] <= resumo['saldo_final']['p99']
@@ -0,0 +1,80 @@
+import gzip
+import time
+
+import pytest
+
+from blaze_motor import BlazeIA_Final
+from blaze_replay import FimDaGravacao, FonteReplay, GravadorFeed, gerar_gravacao, ler_gravacao, reproduzir
+from blaze_sintetico import gerar_jogos
+
+
+def test_gravar_e_reproduzir_na_mesma_ordem_e_ritmo(tmp_path):
+    caminho = str(tmp_path / 'feed.jsonl.gz')
+    jogos = list(gerar_jogos(25, semente=1))
+    respostas = [list(reversed(jogos[i:i + 20])) for i in range(4)]
+    # O cliente devolve o mesmo objeto enquanto serve do cache
+    entregas = [respostas[0], respostas[0], respostas[1], respostas[2], respostas[2], respostas[3]]
+    gravador = GravadorFeed(caminho)
+    buscar = gravador.envolver(iter(entregas).__next__)
+    assert [buscar() for _ in entregas] == entregas
+    assert gravador.gravadas == 4
+
+    gravadas = list(ler_gravacao(caminho))
+    assert [dados for _, dados in gravadas] == respostas
+    # Regrava com instantes conhecidos (0,1 s entre respostas) para medir o ritmo
+    caminho_ritmo = str(tmp_path / 'ritmo.jsonl.gz')
+    for i, dados in enumerate(respostas):
+        GravadorFeed(caminho_ritmo).gravar(dados, recebido_em=1000.0 + 0.1 * i)
+
+    fonte = FonteReplay(caminho_ritmo, velocidade=1.0)
+    inicio = time.monotonic()
+    assert [fonte.buscar() for _ in respostas] == respostas
+    assert time.monotonic() - inicio >= 0.28
+    with pytest.raises(FimDaGravacao):
+        fonte.buscar()
+    assert fonte.terminou and fonte.entregues == 4
+
+    # Velocidade 0: sem espera
+    rapida = FonteReplay(caminho_ritmo, velocidade=0)
+    inicio = time.monotonic()
+    assert [rapida.buscar() for _ in respostas] == respostas
+    assert time.monotonic() - inicio < 0.1
+
+
+def test_arquivo_legivel_com_gravacao_interrompida(tmp_path):
+    caminho = str(tmp_path / 'feed.jsonl.gz')
+    gravador = GravadorFeed(caminho)
+    gravador.gravar([{'id': 'a'}], recebido_em=1.0)
+    gravador.gravar([{'id': 'b'}], recebido_em=2.0)
+    # Cada resposta é um membro gzip completo: cortar o último membro não perde os anteriores
+    with open(caminho, 'rb') as f:
+        conteudo = f.read()
+    corte = conteudo.rfind(gzip.compress(b'')[:3])   # início do último membro
+    with open(caminho, 'wb') as f:
+        f.write(conteudo[:corte])
+    assert list(ler_gravacao(caminho)) == [(1.0, [{'id': 'a'}])]
+
+
+def test_reproduzir_gravacao_sintetica(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    caminho = str(tmp_path / 'sintetica.jsonl.gz')
+    respostas = gerar_gravacao(caminho, 60, semente=2)
+    rodadas_novas = len({dados[0]['id'] for _, dados in ler_gravacao(caminho)})
+    todos = {jogo['id'] for _, dados in ler_gravacao(caminho) for jogo in dados}
+    assert respostas > rodadas_novas   # consultas a cada 5 s, rodadas a cada ~30 s
+
+    saldos = []
+    for execucao in range(2):
+        ia = BlazeIA_Final(caminho_db=str(tmp_path / f'replay{execucao}.db'), notificar=lambda *_: None)
+        r = reproduzir(ia, FonteReplay(caminho, velocidade=0), semente=7)
+        assert r['ciclos'] == rodadas_novas == ia.contador_atualizacoes
+        assert len(ia.colunas) == len(todos) >= 60
+        assert r['p50'] is not None and r['ciclos_por_segundo'] > 0
+        saldos.append(ia.saldo)
+        ia.fechar()
+    # Mesma semente: mesmas apostas simuladas
+    assert saldos[0] == saldos[1]
+
+    ia = BlazeIA_Final(caminho_db=str(tmp_path / 'parcial.db'), notificar=lambda *_: None)
+    assert reproduzir(ia, FonteReplay(caminho, velocidade=0), ciclos=5)['ciclos'] == 5
+    ia.fechar()
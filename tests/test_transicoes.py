@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from blaze_motor import BlazeIA_Final
+from blaze_sintetico import gerar_jogos
+from blaze_analise import METODO_INICIAL
+from blaze_politica import LIMIAR_CONFIANCA
+from blaze_transicoes import FORCA_PRIORI, METODO_TRANSICAO, IndiceTransicoes
+
+ROLL_DA_COR = {0: 0, 1: 3, 2: 10}
+
+
+def jogos_com_cores(cores, semente=0):
+    return [dict(jogo, color=cor, roll=ROLL_DA_COR[cor]) for jogo, cor in zip(gerar_jogos(len(cores), semente), cores)]
+
+
+def test_indice_incremental_igual_ao_montado_de_uma_vez():
+    cores = np.array([j['color'] for j in gerar_jogos(3000, semente=4)])
+    incremental = IndiceTransicoes(k_maximo=5)
+    for cor in cores:
+        incremental.alimentar_cor(cor)
+    de_uma_vez = IndiceTransicoes.de_cores(cores, k_maximo=5)
+    for k in range(1, 6):
+        assert (incremental.contagens[k] == de_uma_vez.contagens[k]).all()
+        assert incremental.consultar_atual(k) == de_uma_vez.consultar_atual(k)
+    assert incremental.analisar() == de_uma_vez.analisar()
+
+
+def test_motor_usa_o_padrao_historico_quando_mais_confiante(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ia = BlazeIA_Final(caminho_db=str(tmp_path / 'ia_data.db'), notificar=lambda *_: None)
+    # Vermelho, preto, branco em ciclo: depois de qualquer padrão a próxima cor é certa
+    jogos = jogos_com_cores([1, 2, 0] * 200 + [1])
+    ia.registrar_jogos(jogos)
+    dados = jogos[::-1][:20]
+    previsao = ia.prever(dados)
+    assert previsao['metodo'] == METODO_TRANSICAO
+    assert previsao['previsao'] == 2
+    assert previsao['frequencia'] == 1.0
+    # Mesmo um padrão perfeito tem a confiança puxada para a taxa base (1/3 de preto)
+    amostras = previsao['amostras']
+    assert previsao['confianca'] == pytest.approx((amostras + FORCA_PRIORI / 3) / (amostras + FORCA_PRIORI), abs=1e-3)
+    assert previsao['k'] == ia.transicoes.k_maximo
+
+
+def test_motor_mantem_a_cascata_sem_amostras_suficientes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ia = BlazeIA_Final(caminho_db=str(tmp_path / 'ia_data.db'), notificar=lambda *_: None)
+    jogos = jogos_com_cores([1, 2, 0] * 5 + [1])
+    ia.registrar_jogos(jogos)
+    assert ia.transicoes.analisar() is None
+    assert ia.prever(jogos[::-1][:20])['metodo'] != METODO_TRANSICAO
+
+
+def test_padrao_com_poucas_amostras_nao_passa_por_cima_da_cascata(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ia = BlazeIA_Final(caminho_db=str(tmp_path / 'ia_data.db'), notificar=lambda *_: None)
+    jogos = list(gerar_jogos(2000, semente=6))
+    ia.registrar_jogos(jogos)
+    # 24 vermelhos em 30 depois do padrão atual, em todos os k: 80% bruto, mas é ruído
+    for k in range(1, ia.transicoes.k_maximo + 1):
+        ia.transicoes.contagens[k][ia.transicoes._codigos[k]] = [0, 24, 6]
+    assert ia.transicoes.analisar() is None
+
+    dados = jogos[::-1][:20]
+    monkeypatch.setattr(ia, 'analisar_padroes_avancada',
+                        lambda dados: {'previsao': 2, 'confianca': 0.5, 'metodo': METODO_INICIAL})
+    ia.analisador.ultimo_id = None
+    assert ia.prever(dados)['metodo'] == METODO_INICIAL
+
+    # Com mais amostras passa no teste, mas a confiança encolhida não chega a apostar
+    for k in range(1, ia.transicoes.k_maximo + 1):
+        ia.transicoes.contagens[k][ia.transicoes._codigos[k]] = [0, 240, 60]
+    historico = ia.transicoes.analisar()
+    assert historico['frequencia'] == 0.8
+    assert 0.5 < historico['confianca'] < LIMIAR_CONFIANCA
@@ -0,0 +1,123 @@
+from blaze_armazenamento import ArmazenamentoBlaze
+from blaze_colunar import HistoricoColunar
+from blaze_manutencao import ManutencaoPeriodica
+from blaze_verificacao import gerar_cadeia, verificar_historico
+
+SEMENTE_CLIENTE = 'semente-cliente-sintetica'
+SEED_FALSA = 'ab' * 32
+
+
+def verificar(jogos, intervalos=()):
+    return verificar_historico(HistoricoColunar.de_jogos(jogos), SEMENTE_CLIENTE, intervalos,
+                               processos=1, tamanho_trecho=300)
+
+
+def test_cadeia_integra():
+    resultado = verificar(list(gerar_cadeia(1000)))
+    assert resultado['verificadas'] == 999
+    assert resultado['elos_ok'] == 999
+    assert resultado['falhas'] == []
+
+
+def test_seed_adulterada_quebra_a_cadeia():
+    jogos = list(gerar_cadeia(1000))
+    adulterado = jogos[500]
+    adulterado['server_seed'] = SEED_FALSA
+    resultado = verificar(jogos)
+    # O elo com a anterior e com a seguinte deixam de bater e o roll não confere
+    assert resultado['quebras'] == 2
+    assert resultado['rolls_errados'] == 1
+    quebras = {f['id'] for f in resultado['falhas'] if f['tipo'] == 'quebra'}
+    assert quebras == {jogos[499]['id'], adulterado['id']}
+    assert [f['id'] for f in resultado['falhas'] if f['tipo'] == 'roll'] == [adulterado['id']]
+
+
+def test_rodadas_faltando_viram_lacuna():
+    jogos = list(gerar_cadeia(1000))
+    del jogos[300:303]
+    resultado = verificar(jogos)
+    assert resultado['quebras'] == 0
+    assert resultado['lacunas'] == 1
+    lacuna, = resultado['falhas']
+    assert lacuna['id'] == jogos[299]['id']
+    assert lacuna['detalhe'] == '3 rodadas faltando'
+
+
+def test_retoma_dos_intervalos_verificados():
+    jogos = list(gerar_cadeia(2000))
+    primeiro = verificar(jogos[:1200])
+    assert primeiro['verificadas'] == 1199
+
+    segundo = verificar(jogos, primeiro['intervalos'])
+    # Só a última rodada da primeira passada (agora com sucessora) e as novas
+    assert segundo['verificadas'] == 800
+    assert segundo['elos_ok'] == 800
+    assert len(segundo['intervalos']) == 1
+
+
+def test_manutencao_verifica_e_retoma_pelo_banco(tmp_path):
+    caminho_db = str(tmp_path / 'ia_data.db')
+    jogos = list(gerar_cadeia(1500))
+    jogos[700]['server_seed'] = SEED_FALSA
+    armazenamento = ArmazenamentoBlaze(caminho_db)
+    armazenamento.registrar(jogos=jogos[:1000])
+
+    manutencao = ManutencaoPeriodica(caminho_db, semente_cliente=SEMENTE_CLIENTE)
+    primeira = manutencao.executar_agora()['verificacao']
+    assert primeira['verificadas'] == 999
+    assert primeira['quebras'] == 2
+
+    armazenamento.registrar(jogos=jogos[1000:])
+    segunda = manutencao.executar_agora()['verificacao']
+    assert segunda['verificadas'] == 500
+    assert segunda['quebras'] == 0
+
+    situacao = armazenamento.situacao_verificacao(SEMENTE_CLIENTE)
+    assert situacao['verificadas'] == 1499
+    assert situacao['falhas'] == {'quebra': 2, 'roll': 1}
+
+
+def test_importar_dentro_de_intervalo_verificado_reabre_o_trecho(tmp_path):
+    caminho_db = str(tmp_path / 'ia_data.db')
+    jogos = list(gerar_cadeia(100))
+    faltando = jogos[40:45]
+    armazenamento = ArmazenamentoBlaze(caminho_db)
+    armazenamento.registrar(jogos=jogos[:40] + jogos[45:])
+
+    manutencao = ManutencaoPeriodica(caminho_db, semente_cliente=SEMENTE_CLIENTE)
+    primeira = manutencao.executar_agora()['verificacao']
+    assert (primeira['verificadas'], primeira['lacunas']) == (94, 1)
+
+    faltando[2]['server_seed'] = SEED_FALSA
+    assert armazenamento.importar_jogos(
+        [(j['id'], j['created_at'], j['color'], j['roll'], j['server_seed']) for j in faltando]) == 5
+    # Só o trecho reaberto (39..44) com as vizinhas e a rodada mais recente saem do banco
+    colunas, _ = armazenamento.carregar_pendentes(armazenamento.intervalos_verificados(SEMENTE_CLIENTE))
+    assert colunas.para_jogos() == jogos[38:46] + jogos[98:]
+
+    segunda = manutencao.executar_agora()['verificacao']
+    assert segunda['verificadas'] == 6
+    assert (segunda['quebras'], segunda['rolls_errados'], segunda['lacunas']) == (2, 1, 0)
+    situacao = armazenamento.situacao_verificacao(SEMENTE_CLIENTE)
+    assert situacao['verificadas'] == 99
+    # A lacuna antiga foi preenchida: só ficam as falhas da seed adulterada
+    assert situacao['falhas'] == {'quebra': 2, 'roll': 1}
+    assert {f['id'] for f in situacao['recentes']} == {jogos[41]['id'], jogos[42]['id']}
+
+
+def test_rodada_inserida_durante_a_passada_fica_pendente(tmp_path):
+    armazenamento = ArmazenamentoBlaze(str(tmp_path / 'ia_data.db'))
+    jogos = list(gerar_cadeia(60))
+    armazenamento.registrar(jogos=jogos[:30] + jogos[31:])
+    colunas, ultima_linha = armazenamento.carregar_pendentes()
+    resultado = verificar_historico(colunas, SEMENTE_CLIENTE, processos=1)
+    # Entra antes da gravação do resultado, que foi calculado sem ela
+    armazenamento.registrar(jogos=[jogos[30]])
+    armazenamento.registrar_verificacao(resultado['trechos_cobertos'], resultado['falhas'], SEMENTE_CLIENTE,
+                                        resultado['trechos_verificados'], ultima_linha)
+
+    colunas, _ = armazenamento.carregar_pendentes(armazenamento.intervalos_verificados(SEMENTE_CLIENTE))
+    assert colunas.para_jogos() == jogos[28:32] + jogos[58:]
+    segunda = verificar_historico(colunas, SEMENTE_CLIENTE, armazenamento.intervalos_verificados(SEMENTE_CLIENTE),
+                                  processos=1)
+    assert (segunda['verificadas'], segunda['elos_ok']) == (2, 2)
@@ -0,0 +1,80 @@
+import asyncio
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+import blaze_worker
+from blaze_armazenamento import ArmazenamentoBlaze
+from blaze_sintetico import gerar_jogos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ClienteFalso:
+    """Mesma interface do ClienteBlaze usada pelo worker, sem rede"""
+
+    def __init__(self, url=None):
+        inicio = datetime.now(timezone.utc) - timedelta(seconds=19 * 30)
+        self.dados = list(reversed(list(gerar_jogos(20, semente=3, inicio=inicio))))
+        self.requisicoes = 0
+
+    def buscar(self):
+        self.requisicoes += 1
+        return self.dados
+
+    def estatisticas(self):
+        return {'requisicoes': self.requisicoes}
+
+    def fechar(self):
+        pass
+
+
+def test_importa_sem_dependencias_do_painel():
+    # None em sys.modules faz o import falhar: o worker não pode depender deles
+    codigo = ("import sys\n"
+              "for nome in ('streamlit', 'pandas', 'plotly'):\n"
+              "    sys.modules[nome] = None\n"
+              "import blaze_worker\n"
+              "print('ok')\n")
+    resultado = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True,
+                               timeout=60)
+    assert resultado.returncode == 0, resultado.stderr
+    assert resultado.stdout.strip() == 'ok'
+
+
+def test_um_ciclo_com_cliente_falso(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(blaze_worker, 'ClienteBlaze', ClienteFalso)
+    caminho_db = str(tmp_path / 'worker.db')
+
+    ia, cliente, agendador = blaze_worker.criar_worker(caminho_db)
+    asyncio.run(agendador.executar(ciclos=1))
+    assert ia.contador_atualizacoes == 1
+    assert len(ia.previsoes) == 1
+    assert cliente.requisicoes == 1
+    registro = agendador.ciclos[-1]
+    assert registro['novo'] and registro['erro'] is None
+    ia.fechar()
+
+    armazenamento = ArmazenamentoBlaze(caminho_db)
+    assert armazenamento.contar_jogos() == 20
+    armazenamento.fechar()
+
+    # Ao recomeçar, retoma o alinhamento pelo histórico salvo
+    ia, _, agendador = blaze_worker.criar_worker(caminho_db)
+    assert agendador.ultimo_id == cliente.dados[0]['id']
+    assert agendador.segundos_ate_proxima() > 0
+    ia.fechar()
+
+
+def test_main_com_ciclos(tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(blaze_worker, 'ClienteBlaze', ClienteFalso)
+    monkeypatch.setattr(sys, 'argv', ['blaze_worker.py', '--db', str(tmp_path / 'main.db'), '--ciclos', '1'])
+    caplog.set_level('INFO', logger='blaze.worker')
+    blaze_worker.main()
+    mensagens = [registro.getMessage() for registro in caplog.records]
+    assert any(m.startswith('Worker pronto') for m in mensagens)
+    assert any(m.startswith('Ciclo #1') for m in mensagens)
+    assert any(m.startswith('Encerrado: 1 ciclos, 1 requisições') for m in mensagens)